@@ -1,18 +1,153 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, File, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import HTMLResponse, RedirectResponse
 import uvicorn
+import asyncio
 import json
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from pydantic import BaseModel
 from src.core.config import settings
-from src.pipeline.prediction_pipeline import VehicleData, VehicleDataClassifier
-from src.pipeline.training_pipeline import TrainPipeline
+from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.model_cache import model_cache
+from src.pipeline.csv_scoring_pipeline import CsvScoringPipeline
+from src.pipeline.inference_executor import InferenceExecutor
+from src.pipeline.micro_batcher import PredictionMicroBatcher
+from src.pipeline.model_refresher import ModelRefresher
+from src.pipeline.model_warmup import initialize_inference_worker, warm_up_model
+from src.pipeline.prediction_cache import prediction_cache
+from src.pipeline.prefork_server import PreforkServer
+from src.pipeline.prediction_pipeline import VehicleData, VehicleDataClassifier, build_vehicle_data_frame
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Last line of a /predict/csv body whose scoring failed part way through
+CSV_STREAM_ERROR_MARKER = "#ERROR"
+
+# Prediction cache statistics that only ever grow, exported as <name>_total counters
+PREDICTION_CACHE_COUNTERS = ("hits", "misses", "evictions", "expirations", "invalidations")
+for _name in PREDICTION_CACHE_COUNTERS:
+    metrics.describe(f"vehicle_prediction_cache_{_name}_total", f"Prediction cache {_name}", metric_type="counter")
+metrics.describe("vehicle_micro_batch_batches_total", "Batches scored by the micro-batcher", metric_type="counter")
+metrics.describe("vehicle_micro_batch_rows_total", "Rows scored by the micro-batcher", metric_type="counter")
+metrics.describe("vehicle_micro_batch_errors_total", "Micro-batches whose scoring failed", metric_type="counter")
+metrics.describe("vehicle_micro_batch_queue_depth", "Rows waiting to join a micro-batch")
+metrics.describe("vehicle_micro_batch_in_flight", "Micro-batches being scored")
+
+
+def collect_serving_metrics(app: FastAPI):
+    """
+    Scrape-time samples: the serving model's version and load time, and the prediction
+    cache and micro-batcher statistics. Running totals are described as counters above;
+    current values (sizes, queue depth) are gauges.
+    """
+    predictor_config = VehiclePredictorConfig()
+    cached_model = model_cache.peek(predictor_config.model_bucket_name, predictor_config.model_file_path)
+    if cached_model is not None:
+        yield "vehicle_model_info", {"version": cached_model.version or ""}, 1
+        yield "vehicle_model_load_seconds", {}, cached_model.load_seconds
+        yield "vehicle_model_loaded_timestamp_seconds", {}, cached_model.loaded_at
+
+    if settings.PREDICTION_CACHE_ENABLED:
+        for name, value in prediction_cache.stats().items():
+            if name in PREDICTION_CACHE_COUNTERS:
+                yield f"vehicle_prediction_cache_{name}_total", {}, value
+            elif name != "model_version":
+                yield f"vehicle_prediction_cache_{name}", {}, value
+
+    micro_batcher = getattr(app.state, "micro_batcher", None)
+    if micro_batcher is not None:
+        # Batch sizes are a real histogram, vehicle_micro_batch_size, recorded as batches are scored
+        for name, value in micro_batcher.stats.as_dict().items():
+            if name != "batch_size_buckets":
+                yield f"vehicle_micro_batch_{name}", {}, value
+        yield "vehicle_micro_batch_queue_depth", {}, micro_batcher.queue_depth
+        yield "vehicle_micro_batch_in_flight", {}, micro_batcher.batches_in_flight
+
+    yield "vehicle_ready", {}, int(getattr(app.state, "ready", False))
+
+
+async def preload_model(app: FastAPI) -> None:
+    """
+    Loads and warms the production model in the inference pool, retrying until it
+    succeeds, then marks the app ready. Process workers also warm their own copy in the
+    pool initializer; one warm-up is submitted per worker so readiness waits for the pool.
+    """
+    executor = app.state.inference_executor
+    warmups = executor.max_workers if executor.kind == "process" else 1
+    while True:
+        try:
+            versions = await asyncio.gather(*(executor.run(warm_up_model) for _ in range(warmups)))
+            # Compile the page template so the first form submission does not pay for it
+            templates.get_template("vehicledata.html")
+            app.state.warmed_model_version = versions[0]
+            app.state.ready = True
+            app.state.warmup_error = None
+            logger.info("Model preloaded and warmed up; the app is ready")
+            return
+        except Exception as e:
+            app.state.warmup_error = f"{e}"
+            logger.error(f"Model warm-up failed, retrying in {settings.MODEL_WARMUP_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(settings.MODEL_WARMUP_RETRY_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the inference executor, the model preload/warm-up, and the background model
+    refresher and prediction micro-batcher (if enabled), for the lifetime of the server.
+    """
+    predictor_config = VehiclePredictorConfig()
+    refresher_args = (predictor_config.model_bucket_name, predictor_config.model_file_path,
+                      settings.MODEL_REFRESH_INTERVAL_SECONDS)
+    use_processes = settings.INFERENCE_EXECUTOR.lower() == "process"
+
+    # Process workers hold their own model cache, so each one warms and refreshes its own copy
+    app.state.inference_executor = InferenceExecutor(
+        kind=settings.INFERENCE_EXECUTOR,
+        max_workers=settings.INFERENCE_MAX_WORKERS,
+        initializer=initialize_inference_worker if use_processes else None,
+        initargs=refresher_args)
+
+    # Readiness stays false until the model is loaded and warm; liveness does not wait for it
+    app.state.ready = not settings.MODEL_PRELOAD_ENABLED
+    app.state.warmup_error = None
+    app.state.warmed_model_version = None
+    warmup_task = asyncio.create_task(preload_model(app)) if settings.MODEL_PRELOAD_ENABLED else None
+
+    app.state.micro_batcher = None
+    if settings.PREDICTION_MICRO_BATCH_ENABLED:
+        app.state.micro_batcher = PredictionMicroBatcher(
+            max_batch_size=settings.PREDICTION_MICRO_BATCH_MAX_SIZE,
+            max_wait_ms=settings.PREDICTION_MICRO_BATCH_MAX_WAIT_MS,
+            executor=app.state.inference_executor)
+        await app.state.micro_batcher.start()
+
+    metrics.register_collector("serving", lambda: collect_serving_metrics(app))
+
+    refresher = None
+    if settings.MODEL_REFRESH_ENABLED and not use_processes:
+        refresher = ModelRefresher(*refresher_args)
+        refresher.start()
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if refresher is not None:
+        refresher.stop()
+    if app.state.micro_batcher is not None:
+        await app.state.micro_batcher.stop()
+    app.state.inference_executor.shutdown()
+    metrics.unregister_collector("serving")
 
 # Initialize FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Mount the 'static' directory for serving static files (like CSS)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -32,6 +167,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Counts every request and records its latency, labelled by route template and status.
+    For streamed responses the latency covers the time to the first byte.
+    """
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    endpoint = getattr(route, "path", "unmatched")
+    metrics.observe("vehicle_request_duration_seconds", time.perf_counter() - start, endpoint=endpoint)
+    metrics.inc("vehicle_requests_total", endpoint=endpoint, method=request.method, status=str(response.status_code))
+    return response
+
 class DataForm:
     """
     DataForm class to handle and process incoming form data.
@@ -70,6 +219,30 @@ class DataForm:
         self.Vehicle_Age_gt_2_Years = form.get("Vehicle_Age_gt_2_Years")
         self.Vehicle_Damage_Yes = form.get("Vehicle_Damage_Yes")
 
+class VehicleRecord(BaseModel):
+    """
+    One vehicle to score, with the same fields as VehicleData.
+    """
+    Gender: int
+    Age: int
+    Driving_License: int
+    Region_Code: float
+    Previously_Insured: int
+    Annual_Premium: float
+    Policy_Sales_Channel: float
+    Vintage: int
+    Vehicle_Age_lt_1_Year: int
+    Vehicle_Age_gt_2_Years: int
+    Vehicle_Damage_Yes: int
+
+
+class BatchPredictionRequest(BaseModel):
+    """
+    Request body of /predict/batch.
+    """
+    records: List[VehicleRecord]
+    return_probabilities: bool = False
+
 # Route to render the main page with the form
 @app.get("/", tags=["authentication"])
 async def index(request: Request):
@@ -86,6 +259,9 @@ async def trainRouteClient():
     Endpoint to initiate the model training pipeline.
     """
     try:
+        # Imported on first use so serving-only processes never load the training stack
+        from src.pipeline.training_pipeline import TrainPipeline
+
         train_pipeline = TrainPipeline()
         train_pipeline.run_pipeline()
         return Response("Training successful!!!")
@@ -101,43 +277,172 @@ async def predictRouteClient(request: Request):
     """
     try:
         form = DataForm(request)
-        await form.get_vehicle_data()
-        
-        vehicle_data = VehicleData(
-                                Gender= form.Gender,
-                                Age = form.Age,
-                                Driving_License = form.Driving_License,
-                                Region_Code = form.Region_Code,
-                                Previously_Insured = form.Previously_Insured,
-                                Annual_Premium = form.Annual_Premium,
-                                Policy_Sales_Channel = form.Policy_Sales_Channel,
-                                Vintage = form.Vintage,
-                                Vehicle_Age_lt_1_Year = form.Vehicle_Age_lt_1_Year,
-                                Vehicle_Age_gt_2_Years = form.Vehicle_Age_gt_2_Years,
-                                Vehicle_Damage_Yes = form.Vehicle_Damage_Yes
-                                )
-
-        # Convert form data into a DataFrame for the model
-        vehicle_df = vehicle_data.get_vehicle_input_data_frame()
-
-        # Initialize the prediction pipeline
-        model_predictor = VehicleDataClassifier()
+        with metrics.stage("form_parse"):
+            await form.get_vehicle_data()
+
+        with metrics.stage("vehicle_data"):
+            vehicle_data = VehicleData(
+                                    Gender= form.Gender,
+                                    Age = form.Age,
+                                    Driving_License = form.Driving_License,
+                                    Region_Code = form.Region_Code,
+                                    Previously_Insured = form.Previously_Insured,
+                                    Annual_Premium = form.Annual_Premium,
+                                    Policy_Sales_Channel = form.Policy_Sales_Channel,
+                                    Vintage = form.Vintage,
+                                    Vehicle_Age_lt_1_Year = form.Vehicle_Age_lt_1_Year,
+                                    Vehicle_Age_gt_2_Years = form.Vehicle_Age_gt_2_Years,
+                                    Vehicle_Damage_Yes = form.Vehicle_Damage_Yes
+                                    )
 
-        # Make a prediction and retrieve the result
-        value = model_predictor.predict(dataframe=vehicle_df)[0]
+        if request.app.state.micro_batcher is not None:
+            # Score together with other concurrent requests in one model call; the micro-batcher
+            # records the cache lookup, feature building and model stages of each batch
+            with metrics.stage("micro_batch"):
+                value = await request.app.state.micro_batcher.predict(vehicle_data)
+        else:
+            # Initialize the prediction pipeline
+            model_predictor = VehicleDataClassifier()
+
+            # Build the feature vector straight from the form fields and predict in the inference pool.
+            # The pool returns how long the cache lookup, feature building and model call took; the
+            # rest of the wait is time spent queueing for a pool worker
+            start = time.perf_counter()
+            predictions, timings = await request.app.state.inference_executor.run(
+                model_predictor.predict_records_timed, [vehicle_data.get_vehicle_data_as_record()])
+            timings["inference_queue"] = max(time.perf_counter() - start - sum(timings.values()), 0.0)
+            metrics.observe_stages(timings)
+            value = predictions[0]
 
         # Interpret the prediction result as 'Response-Yes' or 'Response-No'
         status = "Response-Yes" if value == 1 else "Response-No"
 
         # Render the same HTML page with the prediction result
-        return templates.TemplateResponse(
-            "vehicledata.html",
-            {"request": request, "context": status},
-        )
+        with metrics.stage("template_render"):
+            return templates.TemplateResponse(
+                "vehicledata.html",
+                {"request": request, "context": status},
+            )
         
     except Exception as e:
+        metrics.inc("vehicle_prediction_errors_total", endpoint="/")
+        return {"status": False, "error": f"{e}"}
+
+# Route to score many vehicles in a single request
+@app.post("/predict/batch")
+async def predictBatchRouteClient(batch: BatchPredictionRequest, request: Request):
+    """
+    Endpoint to score an array of vehicle records with one vectorized model call.
+    Predictions (and optionally the probability of Response=1) are returned in input order.
+    """
+    try:
+        if len(batch.records) > settings.PREDICTION_BATCH_MAX_RECORDS:
+            return JSONResponse(
+                status_code=413,
+                content={"status": False,
+                         "error": f"Batch of {len(batch.records)} records exceeds the limit of "
+                                  f"{settings.PREDICTION_BATCH_MAX_RECORDS}"})
+        if not batch.records:
+            return {"status": True, "predictions": []}
+
+        # Build one columnar frame for the whole batch
+        vehicle_df = build_vehicle_data_frame([record.model_dump() for record in batch.records])
+
+        model_predictor = VehicleDataClassifier()
+        executor = request.app.state.inference_executor
+        if batch.return_probabilities:
+            predictions, probabilities = await executor.run(model_predictor.predict_with_proba, vehicle_df)
+            return {"status": True,
+                    "predictions": predictions.tolist(),
+                    "probabilities": probabilities[:, -1].tolist()}
+
+        predictions = await executor.run(model_predictor.predict, vehicle_df)
+        return {"status": True, "predictions": predictions.tolist()}
+
+    except Exception as e:
+        metrics.inc("vehicle_prediction_errors_total", endpoint="/predict/batch")
+        return {"status": False, "error": f"{e}"}
+
+# Route to score a large CSV upload and stream the predictions back
+@app.post("/predict/csv")
+async def predictCsvRouteClient(request: Request, file: UploadFile = File(...)):
+    """
+    Endpoint to score an uploaded CSV with the raw schema from config/schema.yaml.
+    The upload is parsed and scored chunk by chunk and the predictions are streamed back
+    as CSV, so memory stays flat regardless of the file size. If scoring fails after the
+    response has started, the body ends with a CSV_STREAM_ERROR_MARKER line.
+    """
+    try:
+        scorer = CsvScoringPipeline()
+        chunks = scorer.read_chunks(file.file)
+        # Parse the first chunk up front so a malformed upload still gets a JSON error
+        first_chunk = await run_in_threadpool(next, chunks, None)
+        if first_chunk is None:
+            return {"status": False, "error": "Uploaded CSV has no rows"}
+        scorer.validate_columns(first_chunk)
+    except Exception as e:
+        metrics.inc("vehicle_prediction_errors_total", endpoint="/predict/csv")
         return {"status": False, "error": f"{e}"}
 
+    executor = request.app.state.inference_executor
+
+    async def stream_predictions():
+        chunk, header, rows = first_chunk, True, 0
+        try:
+            while chunk is not None:
+                scored = await executor.run(scorer.score_chunk, chunk)
+                yield scored.to_csv(index=False, header=header)
+                rows += len(scored)
+                chunk, header = await run_in_threadpool(next, chunks, None), False
+        except Exception as e:
+            # The 200 status and the scored rows are already sent, so end the body with a marker
+            # line that tells the client the file is incomplete
+            logger.error(f"CSV scoring failed after {rows} rows: {e}", exc_info=True)
+            metrics.inc("vehicle_prediction_errors_total", endpoint="/predict/csv")
+            yield f"{CSV_STREAM_ERROR_MARKER} scoring failed after {rows} rows: {e}\n"
+
+    return StreamingResponse(stream_predictions(), media_type="text/csv",
+                             headers={"Content-Disposition": "attachment; filename=predictions.csv"})
+
+# Liveness probe: the process is up and the event loop is responsive
+@app.get("/health/live")
+async def liveRouteClient():
+    """
+    Cheap liveness check that never touches the model.
+    """
+    return {"status": "alive"}
+
+# Readiness probe: only ready to take traffic once the model is loaded and warmed up
+@app.get("/health/ready")
+async def readyRouteClient(request: Request):
+    """
+    Returns 200 once the production model has been preloaded and warmed up, 503 before that.
+    """
+    if not request.app.state.ready:
+        content = {"status": "warming_up"}
+        if request.app.state.warmup_error:
+            content["error"] = request.app.state.warmup_error
+        return JSONResponse(status_code=503, content=content)
+
+    # Process workers hold the model themselves; the main process only knows what they warmed
+    predictor_config = VehiclePredictorConfig()
+    cached_model = model_cache.peek(predictor_config.model_bucket_name, predictor_config.model_file_path)
+    model_version = cached_model.version if cached_model is not None else request.app.state.warmed_model_version
+    return {"status": "ready", "model_version": model_version}
+
+# Route exposing the serving metrics to Prometheus
+@app.get("/metrics")
+async def metricsRouteClient():
+    """
+    Endpoint returning the per-stage latency histograms (with p50/p95/p99), request and
+    error counts, model load time and model version in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Main entry point to start the FastAPI server
 if __name__ == "__main__":
-    uvicorn.run(app, host=settings.APP_HOST, port=settings.APP_PORT)
\ No newline at end of file
+    if settings.SERVING_WORKERS > 1:
+        # Load the model once and fork workers that share it
+        PreforkServer(app, workers=settings.SERVING_WORKERS).run()
+    else:
+        uvicorn.run(app, host=settings.APP_HOST, port=settings.APP_PORT)
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Write/read timing of the feature store in each FEATURE_STORE_FORMAT, through the same
+write_table/read_table helpers the training pipeline uses. A full read is what DataIngestion
+and ModelEvaluation do. The pruned read drops the id column, as DataTransformation does.
+The schema-only read is DataValidation. The append adds a 1% delta, as an incremental ingestion
+run does: in place for CSV, as a new part file for Parquet and Feather.
+
+    python -m benchmarks.feature_store_formats --rows 2000000
+
+Every format is checked to return the same frame, dtypes included, as the one written.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.mongo_export import _synthetic_documents
+
+
+def _best(func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--formats", default="csv,parquet,feather")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from src.utils.main_utils import append_table, read_table, read_table_columns, table_file_name, write_table
+
+    dataframe = pd.DataFrame(_synthetic_documents(args.rows, 0, args.seed))
+    delta = pd.DataFrame(_synthetic_documents(max(args.rows // 100, 1), args.rows, args.seed))
+    pruned_columns = [column for column in dataframe.columns if column != "id"]
+    print(f"{args.rows} rows x {dataframe.shape[1]} columns")
+    print(f"{'format':<8} {'size MB':>8} {'write s':>8} {'read s':>8} {'pruned s':>9} {'mmap s':>8} {'schema ms':>10} {'append s':>9}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        baseline = None
+        for table_format in args.formats.split(","):
+            file_path = os.path.join(work_dir, table_file_name("data.csv", table_format))
+            write_seconds, _ = _best(lambda: write_table(file_path, dataframe), args.repeat)
+            read_seconds, loaded = _best(lambda: read_table(file_path, memory_map=False), args.repeat)
+            pruned_seconds, _ = _best(lambda: read_table(file_path, columns=pruned_columns, memory_map=False),
+                                      args.repeat)
+            mmap_seconds, _ = _best(lambda: read_table(file_path, memory_map=True), args.repeat)
+            schema_seconds, _ = _best(lambda: read_table_columns(file_path), args.repeat)
+            pd.testing.assert_frame_equal(loaded, dataframe)
+            size_mb = os.path.getsize(file_path) / 1e6
+            # Appending changes the table, so it is timed once, after the reads
+            append_seconds, _ = _best(lambda: append_table(file_path, delta), 1)
+            pd.testing.assert_frame_equal(read_table(file_path), pd.concat([dataframe, delta], ignore_index=True))
+            print(f"{table_format:<8} {size_mb:8.1f} {write_seconds:8.3f} {read_seconds:8.3f} "
+                  f"{pruned_seconds:9.3f} {mmap_seconds:8.3f} {schema_seconds * 1000:10.2f} {append_seconds:9.3f}")
+            if baseline is None:
+                baseline = write_seconds + read_seconds
+            else:
+                print(f"{'':<8} write+read speed-up x{baseline / (write_seconds + read_seconds):.1f} "
+                      f"over {args.formats.split(',')[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Export timing of the training collection: the list(collection.find()) baseline against the
+streaming, projected export on one cursor and on N concurrent _id range partitions.
+
+Point it at a MongoDB with a copy of the data (or let it seed synthetic documents):
+
+    python -m benchmarks.mongo_export --mongodb-url mongodb://127.0.0.1:27017 --documents 2000000 --partitions 1,2,4,8
+
+--in-process-mongomock runs against mongomock instead. That checks that every mode returns
+the same rows, but mongomock executes queries in this process under the GIL, so the timings
+say nothing about the speed-up on a real server.
+"""
+import argparse
+import os
+import random
+import time
+
+import pandas as pd
+
+BENCHMARK_COLLECTION = "vehicle-export-benchmark"
+
+
+def _synthetic_documents(count: int, start: int, seed: int):
+    rng = random.Random(seed + start)
+    for index in range(start, start + count):
+        yield {"id": index, "Gender": rng.choice(["Male", "Female"]), "Age": rng.randint(20, 85),
+               "Driving_License": rng.randint(0, 1), "Region_Code": float(rng.randint(0, 52)),
+               "Previously_Insured": rng.randint(0, 1), "Vehicle_Age": rng.choice(["< 1 Year", "1-2 Year", "> 2 Years"]),
+               "Vehicle_Damage": rng.choice(["Yes", "No"]), "Annual_Premium": round(rng.uniform(2630, 60000), 1),
+               "Policy_Sales_Channel": float(rng.randint(1, 163)), "Vintage": rng.randint(10, 299),
+               "Response": int(rng.random() < 0.12)}
+
+
+def _seed(collection, documents: int, seed: int) -> None:
+    existing = collection.estimated_document_count()
+    if existing >= documents:
+        return
+    print(f"Seeding {documents - existing} documents into {collection.name}")
+    batch_size = 50000
+    for start in range(existing, documents, batch_size):
+        collection.insert_many(list(_synthetic_documents(min(batch_size, documents - start), start, seed)),
+                               ordered=False)
+
+
+def _timed(label: str, func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best:8.3f}s  {len(result) / best:12,.0f} docs/s")
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", default=os.getenv("MONGODB_URL"))
+    parser.add_argument("--collection", default=BENCHMARK_COLLECTION,
+                        help="Collection to export; synthetic documents are added up to --documents")
+    parser.add_argument("--documents", type=int, default=1000000)
+    parser.add_argument("--partitions", default="1,2,4,8", help="Comma-separated partition counts to time")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-baseline", action="store_true", help="Skip list(collection.find()) on huge collections")
+    parser.add_argument("--in-process-mongomock", action="store_true")
+    args = parser.parse_args()
+
+    from src.configuration.mongo_db_connection import MongoDBClient
+    from src.core.config import settings
+    if args.in_process_mongomock:
+        import mongomock
+        MongoDBClient.client = mongomock.MongoClient()
+    elif args.mongodb_url:
+        settings.database_url = args.mongodb_url
+    from src.data_access.proj1_data import Proj1Data
+
+    data = Proj1Data()
+    _seed(data.mongodb_client.database[args.collection], args.documents, args.seed)
+    print(f"Collection {args.collection}: {data.mongodb_client.database[args.collection].estimated_document_count()} "
+          f"documents, batch size {settings.DATA_INGESTION_EXPORT_BATCH_SIZE}")
+
+    def ordered(frame: pd.DataFrame) -> pd.DataFrame:
+        return frame.sort_values("id", kind="stable").reset_index(drop=True)
+
+    reference, baseline = None, None
+    if not args.skip_baseline:
+        baseline, reference = _timed("baseline: list(collection.find())",
+                                     lambda: data.export_collection_as_dataframe(args.collection, streaming=False),
+                                     args.repeat)
+        reference = ordered(reference)
+    for partitions in [int(count) for count in args.partitions.split(",")]:
+        elapsed, frame = _timed(f"streaming: {partitions} partition(s)",
+                                lambda: data.export_collection_as_dataframe(args.collection, streaming=True,
+                                                                            partitions=partitions),
+                                args.repeat)
+        frame = ordered(frame)
+        if reference is None:
+            reference = frame
+        pd.testing.assert_frame_equal(frame, reference)
+        if baseline is not None:
+            print(f"{'':<40} speed-up x{baseline / elapsed:.1f} over the baseline")
+
+
+if __name__ == "__main__":
+    main()
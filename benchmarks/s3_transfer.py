@@ -0,0 +1,94 @@
+"""
+Push/pull timing of a model-sized object: a single-stream baseline (put_object and
+get_object().read(), as the model pusher and loader used to do) against the tuned
+multipart transfers of SimpleStorageService.
+
+Point it at a local S3 stand-in (MinIO, or `moto_server` from moto[server]):
+
+    python -m benchmarks.s3_transfer --endpoint-url http://127.0.0.1:9000 --size-mb 512
+
+--in-process-moto runs against moto's in-memory mock instead. That checks the code path
+end to end, but with no network in between the timings say nothing about transfer speed.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import boto3
+
+
+def _timed(label: str, func, size_bytes: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<36} {best:8.3f}s  {size_bytes / best / 1e6:9.1f} MB/s")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint-url", default=os.getenv("S3_ENDPOINT_URL"))
+    parser.add_argument("--bucket", default="vehicle-transfer-benchmark")
+    parser.add_argument("--file", help="Object to transfer, e.g. a trained model; default is random bytes")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--in-process-moto", action="store_true")
+    args = parser.parse_args()
+
+    if args.in_process_moto:
+        from moto import mock_aws
+        mock_aws().start()
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+    from src.core.config import settings
+    settings.S3_ENDPOINT_URL = args.endpoint_url
+    from src.cloud_storage.aws_storage import SimpleStorageService
+
+    storage = SimpleStorageService()
+    baseline_client = boto3.client("s3", region_name=settings.AWS_REGION_NAME, endpoint_url=args.endpoint_url)
+    try:
+        baseline_client.create_bucket(Bucket=args.bucket,
+                                      CreateBucketConfiguration={"LocationConstraint": settings.AWS_REGION_NAME})
+    except (baseline_client.exceptions.BucketAlreadyOwnedByYou, baseline_client.exceptions.BucketAlreadyExists):
+        pass
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        source = args.file
+        if source is None:
+            source = os.path.join(work_dir, "payload.bin")
+            with open(source, "wb") as payload:
+                for _ in range(args.size_mb):
+                    payload.write(os.urandom(1024 * 1024))
+        size = os.path.getsize(source)
+        target = os.path.join(work_dir, "downloaded.bin")
+        print(f"Object: {size / 1e6:.1f} MB, endpoint: {args.endpoint_url or 'AWS'}, "
+              f"chunk {settings.S3_MULTIPART_CHUNKSIZE_MB} MB x {settings.S3_MAX_CONCURRENCY} concurrent")
+
+        def baseline_push():
+            with open(source, "rb") as body:
+                baseline_client.put_object(Bucket=args.bucket, Key="baseline", Body=body)
+
+        def baseline_pull():
+            data = baseline_client.get_object(Bucket=args.bucket, Key="baseline")["Body"].read()
+            assert len(data) == size
+
+        def tuned_push():
+            storage.upload_file(source, "tuned", args.bucket, remove=False)
+
+        def tuned_pull():
+            storage.download_file(args.bucket, "tuned", target)
+            assert os.path.getsize(target) == size
+
+        push_before = _timed("push: single put_object", baseline_push, size, args.repeat)
+        push_after = _timed("push: tuned multipart upload", tuned_push, size, args.repeat)
+        pull_before = _timed("pull: get_object().read()", baseline_pull, size, args.repeat)
+        pull_after = _timed("pull: tuned ranged download to file", tuned_pull, size, args.repeat)
+        print(f"push speed-up x{push_before / push_after:.1f}, pull speed-up x{pull_before / pull_after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import boto3
 from src.configuration.aws_connection import S3Client
-from io import StringIO
-from typing import Union,List
+from io import BytesIO, StringIO
+from typing import Optional, Tuple, Union, List
 import os,sys
 from src.utils.logger import get_logger
 from mypy_boto3_s3.service_resource import Bucket
@@ -9,6 +9,11 @@ from src.utils.exception import MyException
 from botocore.exceptions import ClientError
 from pandas import DataFrame,read_csv
 import pickle
+from src.cloud_storage.model_disk_cache import ModelDiskCache
+from src.cloud_storage.storage_backend import ObjectStat, StorageBackend
+from src.core.config import settings
+from src.entity.model_artifact import (is_model_artifact, is_model_artifact_file, load_model_artifact,
+                                       load_model_artifact_file)
 
 logger = get_logger(__name__)
 class SimpleStorageService:
@@ -25,6 +30,7 @@ class SimpleStorageService:
         s3_client = S3Client()
         self.s3_resource = s3_client.s3_resource
         self.s3_client = s3_client.s3_client
+        self.transfer_config = s3_client.transfer_config
 
     def s3_key_path_available(self, bucket_name, s3_key) -> bool:
         """
@@ -44,6 +50,26 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(e, sys)
 
+    def get_object_version(self, bucket_name: str, s3_key: str) -> str:
+        """
+        Returns an identifier for the current content of an S3 object using a single HEAD request.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Key path of the object.
+
+        Returns:
+            str: The object VersionId on versioned buckets, otherwise its ETag.
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+            version_id = response.get("VersionId")
+            if version_id and version_id != "null":
+                return version_id
+            return response["ETag"].strip('"')
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     @staticmethod
     def read_object(object_name: str, decode: bool = True, make_readable: bool = False) -> Union[StringIO, str]:
         """
@@ -114,6 +140,7 @@ class SimpleStorageService:
     def load_model(self, model_name: str, bucket_name: str, model_dir: str = None) -> object:
         """
         Loads a serialized model from the specified S3 bucket.
+        Objects in the model artifact format are wrapped in place instead of unpickled.
 
         Args:
             model_name (str): Name of the model file in the bucket.
@@ -125,14 +152,58 @@ class SimpleStorageService:
         """
         try:
             model_file = model_dir + "/" + model_name if model_dir else model_name
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_obj = self.read_object(file_object, decode=False)
-            model = pickle.loads(model_obj)
+            if settings.MODEL_DISK_CACHE_ENABLED:
+                return self._load_model_through_disk_cache(model_file, bucket_name)[0]
+            # Ranged parts are fetched in parallel straight into one buffer, which is then
+            # unpickled or wrapped without another copy
+            buffer = BytesIO()
+            self.download_fileobj(bucket_name=bucket_name, s3_key=model_file, fileobj=buffer)
+            model_obj = buffer.getbuffer()
+            if is_model_artifact(model_obj):
+                model = load_model_artifact(model_obj)
+            else:
+                model = pickle.loads(model_obj)
             logger.info("Production model loaded from S3 bucket.")
             return model
         except Exception as e:
             raise MyException(e, sys) from e
 
+    def load_model_with_version(self, model_name: str, bucket_name: str,
+                                model_dir: str = None) -> Tuple[object, Optional[str]]:
+        """
+        Loads a model together with the version identifier of the content that was loaded
+        (see get_object_version). With the disk cache enabled this is one conditional GET;
+        otherwise the version is read before the download, so it is never newer than the model.
+
+        Args:
+            model_name (str): Name of the model file in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+            model_dir (str): Directory path within the bucket.
+
+        Returns:
+            Tuple[object, Optional[str]]: The deserialized model and its version.
+        """
+        try:
+            model_file = model_dir + "/" + model_name if model_dir else model_name
+            if settings.MODEL_DISK_CACHE_ENABLED:
+                return self._load_model_through_disk_cache(model_file, bucket_name)
+            version = self.get_object_version(bucket_name=bucket_name, s3_key=model_file)
+            return self.load_model(model_file, bucket_name=bucket_name), version
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _load_model_through_disk_cache(self, model_file: str, bucket_name: str) -> Tuple[object, str]:
+        file_path, entry = ModelDiskCache().fetch(self.s3_client, bucket_name=bucket_name, s3_key=model_file,
+                                                  transfer_config=self.transfer_config)
+        if is_model_artifact_file(file_path):
+            # Mapped straight from the cache file; the cache only ever renames over it
+            model = load_model_artifact_file(file_path)
+        else:
+            with open(file_path, "rb") as model_file_obj:
+                model = pickle.load(model_file_obj)
+        logger.info(f"Production model version {entry.version} loaded from the disk cache.")
+        return model, entry.version
+
     def create_folder(self, folder_name: str, bucket_name: str) -> None:
         """
         Creates a folder in the specified S3 bucket.
@@ -165,7 +236,8 @@ class SimpleStorageService:
         logger.info("Entered the upload_file method of SimpleStorageService class")
         try:
             logger.info(f"Uploading {from_filename} to {to_filename} in {bucket_name}")
-            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename)
+            # Files above the multipart threshold go up as parts in parallel (see S3Client.transfer_config)
+            self.s3_client.upload_file(from_filename, bucket_name, to_filename, Config=self.transfer_config)
             logger.info(f"Uploaded {from_filename} to {to_filename} in {bucket_name}")
 
             # Delete the local file if remove is True
@@ -176,6 +248,40 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(e, sys) from e
 
+    def download_file(self, bucket_name: str, s3_key: str, to_filename: str, extra_args: Optional[dict] = None) -> None:
+        """
+        Streams an S3 object to a local file. Objects above the multipart threshold are
+        fetched as ranged parts in parallel, so the object is never held in memory.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Key of the object.
+            to_filename (str): Destination file path.
+            extra_args (dict): Extra GetObject arguments, e.g. VersionId or IfMatch.
+        """
+        try:
+            self.s3_client.download_file(bucket_name, s3_key, to_filename,
+                                         ExtraArgs=extra_args, Config=self.transfer_config)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def download_fileobj(self, bucket_name: str, s3_key: str, fileobj, extra_args: Optional[dict] = None) -> None:
+        """
+        Streams an S3 object into a writable binary file-like object (e.g. BytesIO),
+        fetching large objects as parallel ranged parts.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Key of the object.
+            fileobj: Writable binary file-like object.
+            extra_args (dict): Extra GetObject arguments, e.g. VersionId or IfMatch.
+        """
+        try:
+            self.s3_client.download_fileobj(bucket_name, s3_key, fileobj,
+                                            ExtraArgs=extra_args, Config=self.transfer_config)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def upload_df_as_csv(self, data_frame: DataFrame, local_filename: str, bucket_filename: str, bucket_name: str) -> None:
         """
         Uploads a DataFrame as a CSV file to the specified S3 bucket.
@@ -232,4 +338,71 @@ class SimpleStorageService:
             logger.info("Exited the read_csv method of SimpleStorageService class")
             return df
         except Exception as e:
-            raise MyException(e, sys) from e
\ No newline at end of file
+            raise MyException(e, sys) from e
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    StorageBackend on S3, built on SimpleStorageService. Model loads go through the local
+    disk cache when it is enabled.
+    """
+
+    def __init__(self):
+        self.s3 = SimpleStorageService()
+
+    def exists(self, bucket_name: str, key: str) -> bool:
+        try:
+            self.s3.s3_client.head_object(Bucket=bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise MyException(e, sys) from e
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def stat(self, bucket_name: str, key: str) -> ObjectStat:
+        try:
+            response = self.s3.s3_client.head_object(Bucket=bucket_name, Key=key)
+            version_id = response.get("VersionId")
+            version = version_id if version_id and version_id != "null" else response["ETag"].strip('"')
+            return ObjectStat(key=key, size=response["ContentLength"], version=version,
+                              last_modified=response["LastModified"].timestamp())
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get(self, bucket_name: str, key: str, missing_ok: bool = False) -> Optional[bytes]:
+        try:
+            # One plain GET: small objects such as registry pointers are read on every refresh
+            # check, and managed downloads add a HEAD first; large files should use get_to_file
+            return self.s3.s3_client.get_object(Bucket=bucket_name, Key=key)["Body"].read()
+        except ClientError as e:
+            if missing_ok and e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise MyException(e, sys) from e
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_to_file(self, bucket_name: str, key: str, to_filename: str) -> None:
+        self.s3.download_file(bucket_name=bucket_name, s3_key=key, to_filename=to_filename)
+
+    def put(self, bucket_name: str, key: str, from_filename: str) -> None:
+        self.s3.upload_file(from_filename, to_filename=key, bucket_name=bucket_name, remove=False)
+
+    def put_bytes(self, bucket_name: str, key: str, data: bytes) -> None:
+        try:
+            self.s3.s3_client.put_object(Bucket=bucket_name, Key=key, Body=data)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def list(self, bucket_name: str, prefix: str = "") -> List[str]:
+        try:
+            paginator = self.s3.s3_client.get_paginator("list_objects_v2")
+            keys = [item["Key"] for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+                    for item in page.get("Contents", [])]
+            return sorted(keys)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load_model(self, bucket_name: str, key: str) -> Tuple[object, Optional[str]]:
+        return self.s3.load_model_with_version(key, bucket_name=bucket_name)
@@ -0,0 +1,128 @@
+import os
+import shutil
+import sys
+import tempfile
+from typing import List, Optional, Tuple
+
+from src.cloud_storage.storage_backend import ObjectStat, StorageBackend
+from src.core.config import settings
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+from src.utils.main_utils import load_object
+
+logger = get_logger(__name__)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Storage backend on a local directory or shared volume: bucket_name/key maps to
+    <root_dir>/<bucket_name>/<key>.
+
+    Writes go to a temp file in the target directory and are renamed into place, so readers
+    on the same volume never see a partial object, and a model memory-mapped from the old
+    file keeps its pages. Model artifacts in the .vmodel format are mapped straight from the
+    storage directory without any copy.
+    """
+
+    def __init__(self, root_dir: str = settings.LOCAL_STORAGE_ROOT):
+        """
+        :param root_dir: Directory holding one sub-directory per bucket
+        """
+        self.root_dir = root_dir
+
+    def _path(self, bucket_name: str, key: str) -> str:
+        bucket_dir = os.path.abspath(os.path.join(self.root_dir, bucket_name))
+        path = os.path.abspath(os.path.join(bucket_dir, key))
+        if os.path.commonpath([bucket_dir, path]) != bucket_dir:
+            raise ValueError(f"Key {key!r} points outside bucket {bucket_name!r}")
+        return path
+
+    def exists(self, bucket_name: str, key: str) -> bool:
+        try:
+            return os.path.isfile(self._path(bucket_name, key))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def stat(self, bucket_name: str, key: str) -> ObjectStat:
+        try:
+            file_stat = os.stat(self._path(bucket_name, key))
+            return ObjectStat(key=key, size=file_stat.st_size,
+                              version=f"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}",
+                              last_modified=file_stat.st_mtime)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get(self, bucket_name: str, key: str, missing_ok: bool = False) -> Optional[bytes]:
+        try:
+            with open(self._path(bucket_name, key), "rb") as file_obj:
+                return file_obj.read()
+        except FileNotFoundError as e:
+            if missing_ok:
+                return None
+            raise MyException(e, sys) from e
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_to_file(self, bucket_name: str, key: str, to_filename: str) -> None:
+        try:
+            shutil.copyfile(self._path(bucket_name, key), to_filename)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _write_atomically(self, bucket_name: str, key: str, write) -> None:
+        path = self._path(bucket_name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.",
+                                        suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                write(tmp_file)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put(self, bucket_name: str, key: str, from_filename: str) -> None:
+        try:
+            def copy(tmp_file):
+                with open(from_filename, "rb") as source:
+                    shutil.copyfileobj(source, tmp_file, length=1024 * 1024)
+
+            self._write_atomically(bucket_name, key, copy)
+            logger.info(f"Stored {from_filename} at {self._path(bucket_name, key)}")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def put_bytes(self, bucket_name: str, key: str, data: bytes) -> None:
+        try:
+            self._write_atomically(bucket_name, key, lambda tmp_file: tmp_file.write(data))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def list(self, bucket_name: str, prefix: str = "") -> List[str]:
+        try:
+            bucket_dir = self._path(bucket_name, "")
+            keys = []
+            for dir_path, _, file_names in os.walk(bucket_dir):
+                for file_name in file_names:
+                    if file_name.startswith(".") and file_name.endswith(".tmp"):
+                        continue  # In-flight write
+                    key = os.path.relpath(os.path.join(dir_path, file_name), bucket_dir).replace(os.sep, "/")
+                    if key.startswith(prefix):
+                        keys.append(key)
+            return sorted(keys)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load_model(self, bucket_name: str, key: str) -> Tuple[object, Optional[str]]:
+        try:
+            # Read the version first, so it is never newer than the model that gets loaded
+            version = self.stat(bucket_name, key).version
+            model = load_object(self._path(bucket_name, key))
+            logger.info(f"Production model version {version} loaded from {self._path(bucket_name, key)}")
+            return model, version
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -0,0 +1,237 @@
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from botocore.exceptions import ClientError, ConnectionError as BotocoreConnectionError, EndpointConnectionError
+
+from src.core.config import settings
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass
+class CachedObject:
+    bucket_name: str
+    s3_key: str
+    etag: str
+    version_id: Optional[str]
+    file_name: str
+    size: int
+
+    @property
+    def version(self) -> str:
+        """Same identifier as SimpleStorageService.get_object_version: VersionId, else ETag."""
+        if self.version_id and self.version_id != "null":
+            return self.version_id
+        return self.etag
+
+
+class ModelDiskCache:
+    """
+    Local disk cache of model objects, keyed by bucket/key and stored with their ETag.
+
+    A fetch revalidates the cached copy with a single conditional GET (If-None-Match).
+    S3 answers 304 Not Modified when the object is unchanged, so a restart, or a cold pod
+    with a pre-seeded cache directory, loads from disk without downloading the model again.
+    When the object has changed, the same request streams the new content to disk.
+
+    Each content version is written to its own file, which is named after the ETag and
+    created through a temp file and an atomic rename. A small JSON index, also renamed into
+    place, points at the current file. A crash mid-download therefore never leaves a
+    truncated model behind, and a model that is memory-mapped from disk keeps its file
+    even after a newer version replaces it.
+    """
+
+    def __init__(self, cache_dir: str = settings.MODEL_DISK_CACHE_DIR):
+        """
+        Args:
+            cache_dir (str): Root directory of the cache; one sub-directory per bucket.
+        """
+        self.cache_dir = cache_dir
+
+    def _entry_dir(self, bucket_name: str) -> str:
+        return os.path.join(self.cache_dir, quote(bucket_name, safe=""))
+
+    def _index_path(self, bucket_name: str, s3_key: str) -> str:
+        return os.path.join(self._entry_dir(bucket_name), quote(s3_key, safe="") + ".json")
+
+    def get_path(self, entry: CachedObject) -> str:
+        return os.path.join(self._entry_dir(entry.bucket_name), entry.file_name)
+
+    def lookup(self, bucket_name: str, s3_key: str) -> Optional[CachedObject]:
+        """
+        Returns the cached entry of bucket/s3_key, or None when it is missing or incomplete.
+        """
+        try:
+            with open(self._index_path(bucket_name, s3_key), "r", encoding="utf-8") as index_file:
+                entry = CachedObject(**json.load(index_file))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        path = self.get_path(entry)
+        if not os.path.exists(path) or os.path.getsize(path) != entry.size:
+            return None
+        return entry
+
+    @staticmethod
+    def _write_atomically(directory: str, file_name: str, chunks) -> int:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{file_name}.", suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                for chunk in chunks:
+                    tmp_file.write(chunk)
+                    size += len(chunk)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, os.path.join(directory, file_name))
+            return size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _write_part(tmp_path: str, start: int, length: int, body) -> None:
+        with open(tmp_path, "r+b") as tmp_file:
+            tmp_file.seek(start)
+            remaining = length
+            while remaining:
+                chunk = body.read(min(DOWNLOAD_CHUNK_BYTES, remaining))
+                if not chunk:
+                    raise IOError(f"Download ended {remaining} bytes early at offset {start + length - remaining}")
+                tmp_file.write(chunk)
+                remaining -= len(chunk)
+        body.close()
+
+    def _download_parts_atomically(self, directory: str, file_name: str, s3_client, transfer_config,
+                                   bucket_name: str, s3_key: str, response: dict) -> int:
+        """
+        Writes the object as parallel ranged GETs of multipart_chunksize bytes. The first part
+        is read from the response that is already open; every other part is requested with
+        If-Match on that response's ETag, so S3 refuses them (412) if the object was overwritten
+        meanwhile, and the file never mixes two versions.
+        """
+        size = response["ContentLength"]
+        part_size = transfer_config.multipart_chunksize
+        part_request = {"Bucket": bucket_name, "Key": s3_key, "IfMatch": response["ETag"]}
+        if response.get("VersionId") and response["VersionId"] != "null":
+            part_request["VersionId"] = response["VersionId"]
+
+        def download_part(start: int) -> None:
+            length = min(part_size, size - start)
+            part = s3_client.get_object(Range=f"bytes={start}-{start + length - 1}", **part_request)
+            self._write_part(tmp_path, start, length, part["Body"])
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{file_name}.", suffix=".tmp")
+        try:
+            os.ftruncate(fd, size)
+            os.close(fd)
+            with ThreadPoolExecutor(max_workers=transfer_config.max_concurrency,
+                                    thread_name_prefix="model-download") as executor:
+                parts = [executor.submit(download_part, start) for start in range(part_size, size, part_size)]
+                try:
+                    self._write_part(tmp_path, 0, min(part_size, size), response["Body"])
+                    for part in parts:
+                        part.result()
+                except BaseException:
+                    for part in parts:
+                        part.cancel()
+                    raise
+            with open(tmp_path, "rb") as tmp_file:
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, os.path.join(directory, file_name))
+            return size
+        except BaseException:
+            response["Body"].close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _store(self, s3_client, bucket_name: str, s3_key: str, response: dict, transfer_config=None) -> CachedObject:
+        entry_dir = self._entry_dir(bucket_name)
+        os.makedirs(entry_dir, exist_ok=True)
+        etag = response["ETag"].strip('"')
+        entry = CachedObject(bucket_name=bucket_name, s3_key=s3_key, etag=etag,
+                             version_id=response.get("VersionId"),
+                             file_name=f"{quote(s3_key, safe='')}.{quote(etag, safe='')}",
+                             size=0)
+        previous = self.lookup(bucket_name, s3_key)
+        if transfer_config is not None and response.get("ContentLength", 0) >= transfer_config.multipart_threshold:
+            # Large object: the rest of it is fetched as parallel ranged parts of the same version
+            entry.size = self._download_parts_atomically(entry_dir, entry.file_name, s3_client, transfer_config,
+                                                         bucket_name, s3_key, response)
+        else:
+            entry.size = self._write_atomically(entry_dir, entry.file_name,
+                                                response["Body"].iter_chunks(DOWNLOAD_CHUNK_BYTES))
+        self._write_index(entry)
+        if previous is not None and previous.file_name != entry.file_name:
+            # Processes that mapped the old file keep their pages; only the name goes away
+            try:
+                os.remove(self.get_path(previous))
+            except FileNotFoundError:
+                pass  # Another process sharing the cache already replaced it
+        return entry
+
+    def _write_index(self, entry: CachedObject) -> None:
+        index_path = self._index_path(entry.bucket_name, entry.s3_key)
+        self._write_atomically(os.path.dirname(index_path), os.path.basename(index_path),
+                               [json.dumps(asdict(entry)).encode("utf-8")])
+
+    def fetch(self, s3_client, bucket_name: str, s3_key: str, transfer_config=None) -> Tuple[str, CachedObject]:
+        """
+        Makes sure the local copy of bucket/s3_key is current and returns its path and entry.
+
+        Args:
+            s3_client: boto3 S3 client.
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Key of the model object.
+            transfer_config: boto3 TransferConfig; objects above its multipart threshold are
+                downloaded as parallel ranged parts instead of one stream.
+
+        Returns:
+            Tuple[str, CachedObject]: Local file path and cache entry of the current object.
+        """
+        try:
+            cached = self.lookup(bucket_name, s3_key)
+            request = {"Bucket": bucket_name, "Key": s3_key}
+            if cached is not None:
+                request["IfNoneMatch"] = f'"{cached.etag}"'
+            try:
+                response = s3_client.get_object(**request)
+            except ClientError as e:
+                status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+                if cached is None or (status != 304 and e.response["Error"]["Code"] not in ("304", "NotModified")):
+                    raise
+                # Unchanged; re-uploads of identical content on versioned buckets get a new VersionId
+                version_id = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {}).get("x-amz-version-id")
+                if version_id and version_id != cached.version_id:
+                    cached.version_id = version_id
+                    self._write_index(cached)
+                metrics.inc("vehicle_model_disk_cache_total", result="hit")
+                logger.info(f"Model s3://{bucket_name}/{s3_key} not modified; using the disk cache")
+                return self.get_path(cached), cached
+            except (EndpointConnectionError, BotocoreConnectionError) as e:
+                if cached is None:
+                    raise
+                metrics.inc("vehicle_model_disk_cache_total", result="offline")
+                logger.warning(f"S3 unreachable ({e}); serving unvalidated disk cache copy of "
+                               f"s3://{bucket_name}/{s3_key} version {cached.version}")
+                return self.get_path(cached), cached
+
+            entry = self._store(s3_client, bucket_name, s3_key, response, transfer_config=transfer_config)
+            metrics.inc("vehicle_model_disk_cache_total", result="miss")
+            logger.info(f"Model s3://{bucket_name}/{s3_key} version {entry.version} downloaded to "
+                        f"the disk cache ({entry.size} bytes)")
+            return self.get_path(entry), entry
+        except Exception as e:
+            raise MyException(e, sys) from e
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.core.config import settings
+
+
+@dataclass(frozen=True)
+class ObjectStat:
+    key: str
+    size: int
+    # Changes whenever the content changes: S3 VersionId or ETag, local mtime and size
+    version: str
+    last_modified: float
+
+
+class StorageBackend(ABC):
+    """
+    Storage of model artifacts, addressed like S3 by bucket name and key.
+
+    Estimators, model evaluation and the model pusher only talk to this interface, so the
+    same code runs against S3 or a local directory / shared volume (see get_storage_backend).
+    """
+
+    @abstractmethod
+    def exists(self, bucket_name: str, key: str) -> bool:
+        """Returns True if an object is stored at bucket_name/key."""
+
+    @abstractmethod
+    def stat(self, bucket_name: str, key: str) -> ObjectStat:
+        """Returns size and version of the object at bucket_name/key; raises if it is missing."""
+
+    @abstractmethod
+    def get(self, bucket_name: str, key: str, missing_ok: bool = False) -> Optional[bytes]:
+        """Returns the content of the object at bucket_name/key; None if it is missing and missing_ok."""
+
+    @abstractmethod
+    def get_to_file(self, bucket_name: str, key: str, to_filename: str) -> None:
+        """Writes the object at bucket_name/key to a local file."""
+
+    @abstractmethod
+    def put(self, bucket_name: str, key: str, from_filename: str) -> None:
+        """Stores a local file at bucket_name/key, replacing any previous object."""
+
+    @abstractmethod
+    def put_bytes(self, bucket_name: str, key: str, data: bytes) -> None:
+        """Stores data at bucket_name/key, replacing any previous object."""
+
+    @abstractmethod
+    def list(self, bucket_name: str, prefix: str = "") -> List[str]:
+        """Returns the keys under prefix, sorted."""
+
+    @abstractmethod
+    def load_model(self, bucket_name: str, key: str) -> Tuple[object, Optional[str]]:
+        """
+        Loads the model stored at bucket_name/key. Returns (model, version of the loaded content).
+        """
+
+
+def get_storage_backend(backend: str = None) -> StorageBackend:
+    """
+    Returns the storage backend selected by settings.STORAGE_BACKEND ("s3" or "local").
+    Implementations are imported on demand, so local runs never import boto3.
+
+    :param backend: Overrides settings.STORAGE_BACKEND
+    """
+    backend = (backend or settings.STORAGE_BACKEND).lower()
+    if backend == "s3":
+        from src.cloud_storage.aws_storage import S3StorageBackend
+        return S3StorageBackend()
+    if backend == "local":
+        from src.cloud_storage.local_storage import LocalStorageBackend
+        return LocalStorageBackend()
+    raise ValueError(f"Unknown storage backend {backend!r}; expected 's3' or 'local'")
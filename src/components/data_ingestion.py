@@ -1,6 +1,9 @@
 import os
 import sys
+import time
+from typing import List, Optional, Tuple
 
+from bson import json_util
 from pandas import DataFrame
 from sklearn.model_selection import train_test_split
 
@@ -10,6 +13,9 @@ from src.utils.logger import get_logger
 from src.data_access.proj1_data import Proj1Data
 from src.entity.artifact_entity import DataIngestionArtifact
 from src.entity.config_entity import DataIngestionConfig
+from src.utils.artifact_writer import artifact_writer
+from src.utils.main_utils import (append_table, copy_table, read_table, read_table_columns, table_parts, write_table,
+                                  write_table_dataset)
 
 logging = get_logger(__name__)
 class DataIngestion:
@@ -26,7 +32,7 @@ class DataIngestion:
     def export_data_into_feature_store(self)->DataFrame:
         """
         Method Name :   export_data_into_feature_store
-        Description :   This method exports data from mongodb to csv file
+        Description :   This method exports data from mongodb to the feature store file
         
         Output      :   data is returned as artifact of data ingestion components
         On Failure  :   Write an exception log and then raise an exception
@@ -34,20 +40,146 @@ class DataIngestion:
         try:
             logging.info(f"Exporting data from mongodb")
             my_data = Proj1Data()
-            dataframe = my_data.export_collection_as_dataframe(collection_name=
-                                                                   self.data_ingestion_config.collection_name)
+            if self.data_ingestion_config.incremental:
+                dataframe = self._export_incremental(my_data)
+            else:
+                dataframe = my_data.export_collection_as_dataframe(collection_name=
+                                                                       self.data_ingestion_config.collection_name,
+                                                                   partitions=self.data_ingestion_config.export_partitions)
             logging.info(f"Shape of dataframe: {dataframe.shape}")
             feature_store_file_path  = self.data_ingestion_config.feature_store_file_path
             dir_path = os.path.dirname(feature_store_file_path)
             os.makedirs(dir_path,exist_ok=True)
             logging.info(f"Saving exported data into feature store file path: {feature_store_file_path}")
-            dataframe.to_csv(feature_store_file_path,index=False,header=True)
+            if self.data_ingestion_config.incremental:
+                # The incremental store itself is only ever written synchronously, before its watermark
+                artifact_writer.submit(copy_table, self.data_ingestion_config.incremental_store_file_path,
+                                       feature_store_file_path)
+            else:
+                artifact_writer.submit(write_table, feature_store_file_path, dataframe)
             return dataframe
 
         except Exception as e:
             raise MyException(e,sys)
 
-    def split_data_as_train_test(self,dataframe: DataFrame) ->None:
+    def read_watermark(self) -> Optional[dict]:
+        """
+        Returns the persisted watermark, or None when the incremental feature store has to be
+        rebuilt: nothing persisted yet, or it was written for another collection or field.
+        """
+        watermark_file_path = self.data_ingestion_config.watermark_file_path
+        if not (os.path.exists(watermark_file_path)
+                and os.path.exists(self.data_ingestion_config.incremental_store_file_path)):
+            return None
+        with open(watermark_file_path) as watermark_file:
+            watermark = json_util.loads(watermark_file.read())
+        if (watermark.get("collection_name") != self.data_ingestion_config.collection_name
+                or watermark.get("field") != self.data_ingestion_config.watermark_field):
+            return None
+        return watermark
+
+    def write_watermark(self, value, store_size: int, documents: int, parts: Optional[List[str]] = None) -> None:
+        """
+        :param store_size: Size of a CSV store; rows past it belong to an interrupted append
+        :param parts: Part files of a Parquet/Feather store; other parts belong to an interrupted append
+        """
+        watermark_file_path = self.data_ingestion_config.watermark_file_path
+        tmp_file_path = watermark_file_path + ".tmp"
+        with open(tmp_file_path, "w") as watermark_file:
+            # json_util keeps ObjectId and datetime watermarks comparable after the round trip
+            watermark_file.write(json_util.dumps({"collection_name": self.data_ingestion_config.collection_name,
+                                                  "field": self.data_ingestion_config.watermark_field,
+                                                  "value": value, "store_size": store_size, "documents": documents,
+                                                  "parts": parts, "updated_at": time.time()}))
+        os.replace(tmp_file_path, watermark_file_path)
+
+    def _rebuild_incremental_store(self, my_data: Proj1Data, high_water_mark) -> DataFrame:
+        store_file_path = self.data_ingestion_config.incremental_store_file_path
+        os.makedirs(os.path.dirname(store_file_path), exist_ok=True)
+        query = {self.data_ingestion_config.watermark_field: {"$lte": high_water_mark}} if high_water_mark is not None else None
+        dataframe = my_data.export_collection_as_dataframe(collection_name=self.data_ingestion_config.collection_name,
+                                                           partitions=self.data_ingestion_config.export_partitions,
+                                                           query=query)
+        if store_file_path.endswith(".csv"):
+            tmp_file_path = os.path.join(os.path.dirname(store_file_path), ".tmp-" + os.path.basename(store_file_path))
+            write_table(tmp_file_path, dataframe)
+            os.replace(tmp_file_path, store_file_path)
+            self.write_watermark(high_water_mark, os.path.getsize(store_file_path), len(dataframe))
+        else:
+            # A directory of parts, so later deltas are added as new files instead of rewriting it
+            parts = write_table_dataset(store_file_path, dataframe)
+            self.write_watermark(high_water_mark, 0, len(dataframe), parts=parts)
+        logging.info(f"Rebuilt incremental feature store with {len(dataframe)} documents up to "
+                     f"{self.data_ingestion_config.watermark_field} {high_water_mark}")
+        return dataframe
+
+    def _export_incremental(self, my_data: Proj1Data) -> DataFrame:
+        """
+        Brings the persistent feature store up to date and returns its content.
+
+        The high-water mark is read before exporting and bounds the query, so documents inserted
+        meanwhile are left for the next run instead of being half-included. Only documents above
+        the persisted watermark are fetched from MongoDB and appended to the store: at the end of
+        a CSV store, or as a new part file of a Parquet/Feather store, so earlier rows are never
+        rewritten.
+
+        Updates of documents already in the store are not reflected; they need a full rebuild
+        (DATA_INGESTION_FULL_REBUILD, which goes through _rebuild_incremental_store). Deletes are:
+        when fewer documents remain up to the watermark than the store holds, it is rebuilt.
+        The store is read back memory-mapped, so its rows are not copied into a read buffer
+        before the frame is built.
+        """
+        config = self.data_ingestion_config
+        store_file_path = config.incremental_store_file_path
+        watermark = None if config.full_rebuild else self.read_watermark()
+        high_water_mark = my_data.get_high_water_mark(config.collection_name, field=config.watermark_field)
+        if watermark is None or watermark["value"] is None:
+            # A store built from an empty collection has no lower bound: {"$gt": None} matches no
+            # ObjectId or date, so the first documents would never be fetched as a delta
+            return self._rebuild_incremental_store(my_data, high_water_mark)
+
+        parts = watermark.get("parts")
+        if store_file_path.endswith(".csv"):
+            store_size = os.path.getsize(store_file_path)
+            if store_size < watermark["store_size"]:
+                logging.warning("Incremental feature store does not match its watermark; rebuilding it")
+                return self._rebuild_incremental_store(my_data, high_water_mark)
+            if store_size > watermark["store_size"]:
+                # Rows appended by a run that stopped before moving the watermark; they are fetched again
+                with open(store_file_path, "r+b") as store_file:
+                    store_file.truncate(watermark["store_size"])
+        else:
+            if not os.path.isdir(store_file_path) or not parts or not set(parts) <= set(table_parts(store_file_path)):
+                logging.warning("Incremental feature store does not match its watermark; rebuilding it")
+                return self._rebuild_incremental_store(my_data, high_water_mark)
+            for part in set(table_parts(store_file_path)) - set(parts):
+                # Written by a run that stopped before moving the watermark; its rows are fetched again
+                os.remove(os.path.join(store_file_path, part))
+
+        if (my_data.count_documents(config.collection_name, {config.watermark_field: {"$lte": watermark["value"]}})
+                != watermark["documents"]):
+            logging.warning("Documents below the watermark were deleted; rebuilding the incremental feature store")
+            return self._rebuild_incremental_store(my_data, high_water_mark)
+
+        if high_water_mark is None or high_water_mark == watermark["value"]:
+            logging.info(f"No new documents since {config.watermark_field} {watermark['value']}")
+        else:
+            delta = my_data.export_collection_as_dataframe(
+                collection_name=config.collection_name,
+                query={config.watermark_field: {"$gt": watermark["value"], "$lte": high_water_mark}})
+            if not set(delta.columns) <= set(read_table_columns(store_file_path)):
+                logging.info("Exported columns changed; rebuilding the incremental feature store")
+                return self._rebuild_incremental_store(my_data, high_water_mark)
+            if len(delta):
+                part = append_table(store_file_path, delta)
+                if parts is not None:
+                    parts = parts + [part]
+            store_size = os.path.getsize(store_file_path) if store_file_path.endswith(".csv") else 0
+            self.write_watermark(high_water_mark, store_size, watermark["documents"] + len(delta), parts=parts)
+            logging.info(f"Appended {len(delta)} new documents up to {config.watermark_field} {high_water_mark}")
+        return read_table(store_file_path, memory_map=True)
+
+    def split_data_as_train_test(self,dataframe: DataFrame) ->Tuple[DataFrame, DataFrame]:
         """
         Method Name :   split_data_as_train_test
         Description :   This method splits the dataframe into train set and test set based on split ratio 
@@ -67,10 +199,11 @@ class DataIngestion:
             os.makedirs(dir_path,exist_ok=True)
             
             logging.info(f"Exporting train and test file path.")
-            train_set.to_csv(self.data_ingestion_config.training_file_path,index=False,header=True)
-            test_set.to_csv(self.data_ingestion_config.testing_file_path,index=False,header=True)
+            artifact_writer.submit(write_table, self.data_ingestion_config.training_file_path, train_set)
+            artifact_writer.submit(write_table, self.data_ingestion_config.testing_file_path, test_set)
 
             logging.info(f"Exported train and test file path.")
+            return train_set, test_set
         except Exception as e:
             raise MyException(e, sys) from e
 
@@ -89,7 +222,7 @@ class DataIngestion:
 
             logging.info("Got the data from mongodb")
 
-            self.split_data_as_train_test(dataframe)
+            train_set, test_set = self.split_data_as_train_test(dataframe)
 
             logging.info("Performed train test split on the dataset")
 
@@ -99,6 +232,8 @@ class DataIngestion:
 
             data_ingestion_artifact = DataIngestionArtifact(trained_file_path=self.data_ingestion_config.training_file_path,
             test_file_path=self.data_ingestion_config.testing_file_path)
+            if settings.TRAINING_IN_MEMORY_ARTIFACTS:
+                data_ingestion_artifact.train_df, data_ingestion_artifact.test_df = train_set, test_set
             
             logging.info(f"Data ingestion artifact: {data_ingestion_artifact}")
             return data_ingestion_artifact
@@ -10,8 +10,10 @@ from src.core.config import settings
 from src.entity.config_entity import DataTransformationConfig
 from src.entity.artifact_entity import DataTransformationArtifact, DataIngestionArtifact, DataValidationArtifact
 from src.utils.exception import MyException
+from src.utils.feature_engineering import engineer_raw_features
 from src.utils.logger import get_logger
-from src.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file
+from src.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file, read_table, read_table_columns
+from src.utils.artifact_writer import artifact_writer
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -30,9 +32,10 @@ class DataTransformation:
             raise MyException(e, sys)
 
     @staticmethod
-    def read_data(file_path) -> pd.DataFrame:
+    def read_data(file_path, exclude_columns: tuple = ()) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            columns = [column for column in read_table_columns(file_path) if column not in exclude_columns]
+            return read_table(file_path, columns=columns)
         except Exception as e:
             raise MyException(e, sys)
 
@@ -74,38 +77,6 @@ class DataTransformation:
             logger.exception("Exception occurred in get_data_transformer_object method of DataTransformation class")
             raise MyException(e, sys) from e
 
-    def _map_gender_column(self, df):
-        """Map Gender column to 0 for Female and 1 for Male."""
-        logger.info("Mapping 'Gender' column to binary values")
-        df['Gender'] = df['Gender'].map({'Female': 0, 'Male': 1}).astype(int)
-        return df
-
-    def _create_dummy_columns(self, df):
-        """Create dummy variables for categorical features."""
-        logger.info("Creating dummy variables for categorical features")
-        df = pd.get_dummies(df, drop_first=True)
-        return df
-
-    def _rename_columns(self, df):
-        """Rename specific columns and ensure integer types for dummy columns."""
-        logger.info("Renaming specific columns and casting to int")
-        df = df.rename(columns={
-            "Vehicle_Age_< 1 Year": "Vehicle_Age_lt_1_Year",
-            "Vehicle_Age_> 2 Years": "Vehicle_Age_gt_2_Years"
-        })
-        for col in ["Vehicle_Age_lt_1_Year", "Vehicle_Age_gt_2_Years", "Vehicle_Damage_Yes"]:
-            if col in df.columns:
-                df[col] = df[col].astype('int')
-        return df
-
-    def _drop_id_column(self, df):
-        """Drop the 'id' column if it exists."""
-        logger.info("Dropping 'id' column")
-        drop_col = self._schema_config['drop_columns']
-        if drop_col in df.columns:
-            df = df.drop(drop_col, axis=1)
-        return df
-
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         """
         Initiates the data transformation component for the pipeline.
@@ -116,8 +87,12 @@ class DataTransformation:
                 raise Exception(self.data_validation_artifact.message)
 
             # Load train and test data
-            train_df = self.read_data(file_path=self.data_ingestion_artifact.trained_file_path)
-            test_df = self.read_data(file_path=self.data_ingestion_artifact.test_file_path)
+            train_df, test_df = self.data_ingestion_artifact.train_df, self.data_ingestion_artifact.test_df
+            if train_df is None or test_df is None:
+                # The id column is dropped before transformation anyway, so it is never read
+                drop_columns = (self._schema_config['drop_columns'],)
+                train_df = self.read_data(file_path=self.data_ingestion_artifact.trained_file_path, exclude_columns=drop_columns)
+                test_df = self.read_data(file_path=self.data_ingestion_artifact.test_file_path, exclude_columns=drop_columns)
             logger.info("Train-Test data loaded")
 
             input_feature_train_df = train_df.drop(columns=[settings.TARGET_COLUMN], axis=1)
@@ -127,16 +102,9 @@ class DataTransformation:
             target_feature_test_df = test_df[settings.TARGET_COLUMN]
             logger.info("Input and Target cols defined for both train and test df.")
 
-            # Apply custom transformations in specified sequence
-            input_feature_train_df = self._map_gender_column(input_feature_train_df)
-            input_feature_train_df = self._drop_id_column(input_feature_train_df)
-            input_feature_train_df = self._create_dummy_columns(input_feature_train_df)
-            input_feature_train_df = self._rename_columns(input_feature_train_df)
-
-            input_feature_test_df = self._map_gender_column(input_feature_test_df)
-            input_feature_test_df = self._drop_id_column(input_feature_test_df)
-            input_feature_test_df = self._create_dummy_columns(input_feature_test_df)
-            input_feature_test_df = self._rename_columns(input_feature_test_df)
+            # Gender mapping, dummy columns and renames, shared with evaluation and scoring
+            input_feature_train_df = engineer_raw_features(input_feature_train_df)
+            input_feature_test_df = engineer_raw_features(input_feature_test_df)
             logger.info("Custom transformations applied to train and test data")
 
             logger.info("Starting data transformation")
@@ -163,17 +131,25 @@ class DataTransformation:
             test_arr = np.c_[input_feature_test_final, np.array(target_feature_test_final)]
             logger.info("feature-target concatenation done for train-test df.")
 
-            save_object(self.data_transformation_config.transformed_object_file_path, preprocessor)
-            save_numpy_array_data(self.data_transformation_config.transformed_train_file_path, array=train_arr)
-            save_numpy_array_data(self.data_transformation_config.transformed_test_file_path, array=test_arr)
+            artifact_writer.submit(save_object, self.data_transformation_config.transformed_object_file_path, preprocessor)
+            artifact_writer.submit(save_numpy_array_data, self.data_transformation_config.transformed_train_file_path,
+                                   array=train_arr)
+            artifact_writer.submit(save_numpy_array_data, self.data_transformation_config.transformed_test_file_path,
+                                   array=test_arr)
             logger.info("Saving transformation object and transformed files.")
 
             logger.info("Data transformation completed successfully")
-            return DataTransformationArtifact(
+            data_transformation_artifact = DataTransformationArtifact(
                 transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
                 transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
                 transformed_test_file_path=self.data_transformation_config.transformed_test_file_path
             )
+            if settings.TRAINING_IN_MEMORY_ARTIFACTS:
+                data_transformation_artifact.preprocessing_object = preprocessor
+                data_transformation_artifact.train_arr, data_transformation_artifact.test_arr = train_arr, test_arr
+                data_transformation_artifact.test_features = input_feature_test_df
+                data_transformation_artifact.test_target = target_feature_test_df
+            return data_transformation_artifact
 
         except Exception as e:
             raise MyException(e, sys) from e
\ No newline at end of file
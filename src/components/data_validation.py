@@ -8,7 +8,7 @@ from pandas import DataFrame
 
 from src.utils.exception import MyException
 from src.utils.logger import get_logger
-from src.utils.main_utils import read_yaml_file
+from src.utils.main_utils import read_table, read_table_columns, read_yaml_file
 from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from src.entity.config_entity import DataValidationConfig
 from src.core.config import settings
@@ -76,7 +76,18 @@ class DataValidation:
     @staticmethod
     def read_data(file_path) -> DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return read_table(file_path)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @staticmethod
+    def read_columns(file_path) -> DataFrame:
+        """
+        Returns an empty dataframe with the columns of the file. The checks below only look
+        at column names, so no rows are read.
+        """
+        try:
+            return DataFrame(columns=read_table_columns(file_path))
         except Exception as e:
             raise MyException(e, sys)
         
@@ -93,8 +104,11 @@ class DataValidation:
         try:
             validation_error_msg = ""
             logger.info("Starting data validation")
-            train_df, test_df = (DataValidation.read_data(file_path=self.data_ingestion_artifact.trained_file_path),
-                                 DataValidation.read_data(file_path=self.data_ingestion_artifact.test_file_path))
+            # Use the frames handed over by data ingestion when present; their files may still be being written
+            train_df, test_df = self.data_ingestion_artifact.train_df, self.data_ingestion_artifact.test_df
+            if train_df is None or test_df is None:
+                train_df, test_df = (DataValidation.read_columns(file_path=self.data_ingestion_artifact.trained_file_path),
+                                     DataValidation.read_columns(file_path=self.data_ingestion_artifact.test_file_path))
 
             # Checking col len of dataframe for train/test df
             status = self.validate_number_of_columns(dataframe=train_df)
@@ -1,10 +1,12 @@
 from src.core.config import settings
 from src.entity.config_entity import ModelEvaluationConfig
-from src.entity.artifact_entity import ModelTrainerArtifact, DataIngestionArtifact, ModelEvaluationArtifact
+from src.entity.artifact_entity import (ModelTrainerArtifact, DataIngestionArtifact, ModelEvaluationArtifact,
+                                        DataTransformationArtifact)
 from sklearn.metrics import f1_score
 from src.utils.exception import MyException
+from src.utils.feature_engineering import engineer_raw_features
 from src.utils.logger import get_logger
-from src.utils.main_utils import load_object
+from src.utils.main_utils import load_object, read_table
 import sys
 import pandas as pd
 from typing import Optional
@@ -24,11 +26,17 @@ class EvaluateModelResponse:
 class ModelEvaluation:
 
     def __init__(self, model_eval_config: ModelEvaluationConfig, data_ingestion_artifact: DataIngestionArtifact,
-                 model_trainer_artifact: ModelTrainerArtifact):
+                 model_trainer_artifact: ModelTrainerArtifact,
+                 data_transformation_artifact: Optional[DataTransformationArtifact] = None):
+        """
+        :param data_transformation_artifact: When it carries the engineered test features, they are
+            scored directly instead of re-reading and re-engineering the test file
+        """
         try:
             self.model_eval_config = model_eval_config
             self.data_ingestion_artifact = data_ingestion_artifact
             self.model_trainer_artifact = model_trainer_artifact
+            self.data_transformation_artifact = data_transformation_artifact
         except Exception as e:
             raise MyException(e, sys) from e
 
@@ -52,37 +60,6 @@ class ModelEvaluation:
         except Exception as e:
             raise  MyException(e,sys)
         
-    def _map_gender_column(self, df):
-        """Map Gender column to 0 for Female and 1 for Male."""
-        logger.info("Mapping 'Gender' column to binary values")
-        df['Gender'] = df['Gender'].map({'Female': 0, 'Male': 1}).astype(int)
-        return df
-
-    def _create_dummy_columns(self, df):
-        """Create dummy variables for categorical features."""
-        logger.info("Creating dummy variables for categorical features")
-        df = pd.get_dummies(df, drop_first=True)
-        return df
-
-    def _rename_columns(self, df):
-        """Rename specific columns and ensure integer types for dummy columns."""
-        logger.info("Renaming specific columns and casting to int")
-        df = df.rename(columns={
-            "Vehicle_Age_< 1 Year": "Vehicle_Age_lt_1_Year",
-            "Vehicle_Age_> 2 Years": "Vehicle_Age_gt_2_Years"
-        })
-        for col in ["Vehicle_Age_lt_1_Year", "Vehicle_Age_gt_2_Years", "Vehicle_Damage_Yes"]:
-            if col in df.columns:
-                df[col] = df[col].astype('int')
-        return df
-    
-    def _drop_id_column(self, df):
-        """Drop the 'id' column if it exists."""
-        logger.info("Dropping 'id' column")
-        if "_id" in df.columns:
-            df = df.drop("_id", axis=1)
-        return df
-
     def evaluate_model(self) -> EvaluateModelResponse:
         """
         Method Name :   evaluate_model
@@ -93,17 +70,20 @@ class ModelEvaluation:
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)
-            x, y = test_df.drop(settings.TARGET_COLUMN, axis=1), test_df[settings.TARGET_COLUMN]
+            if self.data_transformation_artifact is not None and self.data_transformation_artifact.test_features is not None:
+                x, y = self.data_transformation_artifact.test_features, self.data_transformation_artifact.test_target
+                logger.info("Using the test features engineered by data transformation")
+            else:
+                test_df = read_table(self.data_ingestion_artifact.test_file_path)
+                x, y = test_df.drop(settings.TARGET_COLUMN, axis=1), test_df[settings.TARGET_COLUMN]
 
-            logger.info("Test data loaded and now transforming it for prediction...")
+                logger.info("Test data loaded and now transforming it for prediction...")
 
-            x = self._map_gender_column(x)
-            x = self._drop_id_column(x)
-            x = self._create_dummy_columns(x)
-            x = self._rename_columns(x)
+                x = engineer_raw_features(x)
 
-            trained_model = load_object(file_path=self.model_trainer_artifact.trained_model_file_path)
+            trained_model = self.model_trainer_artifact.trained_model
+            if trained_model is None:
+                trained_model = load_object(file_path=self.model_trainer_artifact.trained_model_file_path)
             logger.info("Trained model loaded/exists.")
             trained_model_f1_score = self.model_trainer_artifact.metric_artifact.f1_score
             logger.info(f"F1_Score for this model: {trained_model_f1_score}")
@@ -146,7 +126,9 @@ class ModelEvaluation:
                 is_model_accepted=evaluate_model_response.is_model_accepted,
                 s3_model_path=s3_model_path,
                 trained_model_path=self.model_trainer_artifact.trained_model_file_path,
-                changed_accuracy=evaluate_model_response.difference)
+                changed_accuracy=evaluate_model_response.difference,
+                trained_model_f1_score=evaluate_model_response.trained_model_f1_score,
+                best_model_f1_score=evaluate_model_response.best_model_f1_score)
 
             logger.info(f"Model evaluation artifact: {model_evaluation_artifact}")
             return model_evaluation_artifact
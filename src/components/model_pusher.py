@@ -1,6 +1,5 @@
 import sys
 
-from src.cloud_storage.aws_storage import SimpleStorageService
 from src.utils.exception import MyException
 from src.utils.logger import get_logger
 from src.entity.artifact_entity import ModelPusherArtifact, ModelEvaluationArtifact
@@ -17,7 +16,6 @@ class ModelPusher:
         :param model_evaluation_artifact: Output reference of data evaluation artifact stage
         :param model_pusher_config: Configuration for model pusher
         """
-        self.s3 = SimpleStorageService()
         self.model_evaluation_artifact = model_evaluation_artifact
         self.model_pusher_config = model_pusher_config
         self.proj1_estimator = Proj1Estimator(bucket_name=model_pusher_config.bucket_name,
@@ -38,9 +36,14 @@ class ModelPusher:
             logging.info("Uploading artifacts folder to s3 bucket")
             
             logging.info("Uploading new model to S3 bucket....")
-            self.proj1_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path)
+            metrics = {"trained_model_f1_score": self.model_evaluation_artifact.trained_model_f1_score,
+                       "best_model_f1_score": self.model_evaluation_artifact.best_model_f1_score,
+                       "changed_accuracy": self.model_evaluation_artifact.changed_accuracy}
+            model_version = self.proj1_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path,
+                                                            metrics=metrics)
             model_pusher_artifact = ModelPusherArtifact(bucket_name=self.model_pusher_config.bucket_name,
-                                                        s3_model_path=self.model_pusher_config.s3_model_key_path)
+                                                        s3_model_path=self.model_pusher_config.s3_model_key_path,
+                                                        model_version=model_version)
 
             logging.info("Uploaded artifacts folder to s3 bucket")
             logging.info(f"Model pusher artifact: [{model_pusher_artifact}]")
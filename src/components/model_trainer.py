@@ -5,11 +5,14 @@ import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
 
+from src.core.config import settings
+from src.utils.artifact_writer import artifact_writer
 from src.utils.exception import MyException
 from src.utils.logger import get_logger
 from src.utils.main_utils import load_numpy_array_data, load_object, save_object
 from src.entity.config_entity import ModelTrainerConfig
 from src.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact, ClassificationMetricArtifact
+from src.entity.compiled_forest import CompiledForest
 from src.entity.estimator import MyModel
 
 
@@ -63,6 +66,13 @@ class ModelTrainer:
             precision = precision_score(y_test, y_pred)
             recall = recall_score(y_test, y_pred)
 
+            # Compiled inference (used when serving) must reproduce sklearn exactly on the test set
+            if CompiledForest.from_sklearn(model).matches(model, x_test):
+                logger.info("Compiled inference matches sklearn predictions on the test set.")
+            else:
+                logger.warning("Compiled inference differs from sklearn on the test set; "
+                               "set MODEL_COMPILED_INFERENCE=false when serving this model.")
+
             # Creating metric artifact
             metric_artifact = ClassificationMetricArtifact(f1_score=f1, precision_score=precision, recall_score=recall)
             return model, metric_artifact
@@ -83,8 +93,10 @@ class ModelTrainer:
             print("------------------------------------------------------------------------------------------------")
             print("Starting Model Trainer Component")
             # Load transformed train and test data
-            train_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_train_file_path)
-            test_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_test_file_path)
+            train_arr, test_arr = self.data_transformation_artifact.train_arr, self.data_transformation_artifact.test_arr
+            if train_arr is None or test_arr is None:
+                train_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_train_file_path)
+                test_arr = load_numpy_array_data(file_path=self.data_transformation_artifact.transformed_test_file_path)
             logger.info("train-test data loaded")
             
             # Train model and get metrics
@@ -92,7 +104,9 @@ class ModelTrainer:
             logger.info("Model object and artifact loaded.")
             
             # Load preprocessing object
-            preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
+            preprocessing_obj = self.data_transformation_artifact.preprocessing_object
+            if preprocessing_obj is None:
+                preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
             logger.info("Preprocessing obj loaded.")
 
             # Check if the model's accuracy meets the expected threshold
@@ -103,7 +117,7 @@ class ModelTrainer:
             # Save the final model object that includes both preprocessing and the trained model
             logger.info("Saving new model as performace is better than previous one.")
             my_model = MyModel(preprocessing_object=preprocessing_obj, trained_model_object=trained_model)
-            save_object(self.model_trainer_config.trained_model_file_path, my_model)
+            artifact_writer.submit(save_object, self.model_trainer_config.trained_model_file_path, my_model)
             logger.info("Saved final model object that includes both preprocessing and the trained model")
 
             # Create and return the ModelTrainerArtifact
@@ -111,6 +125,8 @@ class ModelTrainer:
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 metric_artifact=metric_artifact,
             )
+            if settings.TRAINING_IN_MEMORY_ARTIFACTS:
+                model_trainer_artifact.trained_model = my_model
             logger.info(f"Model trainer artifact: {model_trainer_artifact}")
             return model_trainer_artifact
         
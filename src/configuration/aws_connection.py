@@ -1,5 +1,7 @@
 import boto3
 import os
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from src.core.config import settings
 from src.utils.logger import get_logger
 from dotenv import load_dotenv
@@ -15,6 +17,7 @@ class S3Client:
     #creating shared s3 client
     s3_client = None
     s3_resource = None
+    transfer_config = None
 
     def __init__(self):
         
@@ -24,20 +27,34 @@ class S3Client:
             if not __access_key_id or not __secret_access_key:
                 raise Exception("AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables are not configured.")
             
+            # The pool must be at least as large as the transfer concurrency, or parallel parts queue for connections
+            client_config = Config(max_pool_connections=max(settings.S3_MAX_POOL_CONNECTIONS,
+                                                            settings.S3_MAX_CONCURRENCY))
+
             s3_client = boto3.client('s3',
                                      aws_access_key_id=__access_key_id,
                                      aws_secret_access_key=__secret_access_key,
-                                     region_name=settings.AWS_REGION_NAME)
+                                     region_name=settings.AWS_REGION_NAME,
+                                     endpoint_url=settings.S3_ENDPOINT_URL,
+                                     config=client_config)
             
             s3_resource = boto3.resource('s3',
                                          aws_access_key_id=__access_key_id,
                                          aws_secret_access_key=__secret_access_key,
-                                         region_name=settings.AWS_REGION_NAME)
+                                         region_name=settings.AWS_REGION_NAME,
+                                         endpoint_url=settings.S3_ENDPOINT_URL,
+                                         config=client_config)
             
             S3Client.s3_client = s3_client
             S3Client.s3_resource = s3_resource
+            S3Client.transfer_config = TransferConfig(
+                multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * 1024 * 1024,
+                multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE_MB * 1024 * 1024,
+                max_concurrency=settings.S3_MAX_CONCURRENCY,
+                use_threads=True)
             
         self.s3_client = S3Client.s3_client
         self.s3_resource = S3Client.s3_resource
+        self.transfer_config = S3Client.transfer_config
             
         
\ No newline at end of file
@@ -15,12 +15,22 @@ class Settings(BaseSettings):
     database_name: str = "Proj1"
     collection_name: str = "Proj1-Data"
     database_username: str | None = None
-    AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID")
-    AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY")
+    # Only needed with STORAGE_BACKEND="s3"; S3Client raises if they are missing
+    AWS_ACCESS_KEY_ID: str | None = os.getenv("AWS_ACCESS_KEY_ID")
+    AWS_SECRET_ACCESS_KEY: str | None = os.getenv("AWS_SECRET_ACCESS_KEY")
     AWS_REGION_NAME: str | None = Field(
         default="ap-south-1",
         validation_alias=AliasChoices("AWS_REGION_NAME", "AWS_REGION"),
     )
+    # Where models are stored: "s3", or "local" for a directory / shared volume at LOCAL_STORAGE_ROOT
+    STORAGE_BACKEND: str = "s3"
+    LOCAL_STORAGE_ROOT: str = "local_storage"
+    # Custom S3 endpoint, e.g. MinIO or a local moto server standing in for S3
+    S3_ENDPOINT_URL: str | None = None
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_MULTIPART_THRESHOLD_MB: int = 16
+    S3_MULTIPART_CHUNKSIZE_MB: int = 16
+    S3_MAX_CONCURRENCY: int = 32
     AWS_BUCKET_NAME: str = Field(
         default="mlops-test-bucket-23",
         validation_alias=AliasChoices("AWS_BUCKET_NAME", "BUCKET_NAME"),
@@ -43,6 +53,10 @@ class Settings(BaseSettings):
     TRAIN_FILE_NAME: str = "train.csv"
     TEST_FILE_NAME: str = "test.csv"
     SCHEMA_FILE_PATH:str = os.path.join("config", "schema.yaml")
+    # Format of the feature store and the ingested train/test splits: "parquet", "feather" or "csv".
+    # FILE_NAME, TRAIN_FILE_NAME and TEST_FILE_NAME get the matching extension.
+    FEATURE_STORE_FORMAT: str = "parquet"
+    FEATURE_STORE_MEMORY_MAP: bool = True
 
 
     """
@@ -57,6 +71,22 @@ class Settings(BaseSettings):
     DATA_INGESTION_TRAIN_DIR: str = "train"
     DATA_INGESTION_TRAIN_FILE_PATH: str = os.path.join(DATA_INGESTION_INGESTED_DIR, "train.csv")
     DATA_INGESTION_TEST_FILE_PATH: str = os.path.join(DATA_INGESTION_INGESTED_DIR, "test.csv")
+    # Export through a projected cursor decoded batch by batch instead of list(collection.find())
+    DATA_INGESTION_STREAMING_EXPORT: bool = True
+    DATA_INGESTION_EXPORT_BATCH_SIZE: int = 50000
+    # _id ranges exported concurrently, each through its own cursor; 1 reads a single cursor
+    DATA_INGESTION_EXPORT_PARTITIONS: int = 4
+    # Opt-in: keep a feature store across runs and only fetch documents above the persisted watermark.
+    # The watermark field must only grow for new documents: _id (ObjectIds from one writer)
+    # or an indexed insertion timestamp. Updates of documents already in the store are never
+    # picked up; deletes are detected by a count below the watermark and trigger a rebuild.
+    # Collections whose documents are updated in place need DATA_INGESTION_FULL_REBUILD, which
+    # re-exports everything.
+    DATA_INGESTION_INCREMENTAL: bool = False
+    DATA_INGESTION_FULL_REBUILD: bool = False
+    DATA_INGESTION_WATERMARK_FIELD: str = "_id"
+    DATA_INGESTION_INCREMENTAL_STORE_DIR: str = os.path.join(ARTIFACT_DIR, DATA_INGESTION_DIR_NAME, "incremental_feature_store")
+    DATA_INGESTION_WATERMARK_FILE_NAME: str = "watermark.json"
 
 
 
@@ -73,6 +103,16 @@ class Settings(BaseSettings):
     DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
     DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
 
+    """
+    Training pipeline related constants
+    """
+    # Opt-in: hand each stage's DataFrames/arrays/models to the next stage in memory instead of
+    # re-reading the files; the files are still written, on background threads when
+    # TRAINING_ASYNC_ARTIFACT_WRITES is set as well
+    TRAINING_IN_MEMORY_ARTIFACTS: bool = False
+    TRAINING_ASYNC_ARTIFACT_WRITES: bool = False
+    TRAINING_ARTIFACT_WRITE_WORKERS: int = 2
+
     """
     MODEL TRAINER related constant start with MODEL_TRAINER var name
     """
@@ -97,6 +137,60 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("MODEL_BUCKET_NAME", "AWS_BUCKET_NAME"),
     )
     MODEL_PUSHER_S3_KEY:str = "model-registry"
+    # Opt-in: push, evaluate and serve through the versioned registry under MODEL_PUSHER_S3_KEY
+    # instead of overwriting MODEL_FILE_NAME. On a bucket that only has MODEL_FILE_NAME, serving
+    # falls back to it until the first push, which first migrates it into the registry
+    MODEL_REGISTRY_ENABLED: bool = False
+    MODEL_REGISTRY_HISTORY_SIZE: int = 20
+
+
+    """
+    Batch scoring related constants start with BATCH_SCORING VAR NAME
+    """
+    BATCH_SCORING_DIR_NAME: str = "batch_scoring"
+    BATCH_SCORING_CHECKPOINT_FILE_NAME: str = "checkpoint.json"
+    BATCH_SCORING_BATCH_SIZE: int = 10000
+    BATCH_SCORING_WORKERS: int = 4
+    # Chunks buffered between the cursor reader, the scoring workers and the write-back thread
+    BATCH_SCORING_QUEUE_DEPTH: int = 4
+
+    """
+    Model serving related constants
+    """
+    MODEL_REFRESH_ENABLED: bool = False
+    MODEL_COMPILED_INFERENCE: bool = True
+    MODEL_REFRESH_INTERVAL_SECONDS: float = 60.0
+    MODEL_DISK_CACHE_ENABLED: bool = True
+    MODEL_DISK_CACHE_DIR: str = "model_cache"
+    MODEL_PRELOAD_ENABLED: bool = True
+    MODEL_WARMUP_ITERATIONS: int = 20
+    MODEL_WARMUP_RETRY_SECONDS: float = 10.0
+    PREDICTION_BATCH_MAX_RECORDS: int = 10000
+    PREDICTION_MICRO_BATCH_ENABLED: bool = False
+    PREDICTION_MICRO_BATCH_MAX_SIZE: int = 256
+    PREDICTION_MICRO_BATCH_MAX_WAIT_MS: float = 2.0
+    CSV_SCORING_CHUNK_ROWS: int = 50000
+    PREDICTION_CACHE_ENABLED: bool = False
+    PREDICTION_CACHE_MAX_SIZE: int = 100000
+    PREDICTION_CACHE_TTL_SECONDS: float = 300.0
+    INFERENCE_EXECUTOR: str = "thread"
+    INFERENCE_MAX_WORKERS: int = 4
+    METRICS_ENABLED: bool = True
+    SERVING_WORKERS: int = 1
+    SERVING_IMPORT_BUDGET_SECONDS: float = 2.5
+
+
+    """
+    Logging related constants
+    """
+    # Hand records to a listener thread, so logging calls never wait on file or console I/O.
+    # The file is then shared safely between worker processes (locked size check and rotation);
+    # without the queue it is a plain RotatingFileHandler, as with a single process.
+    LOG_QUEUE_ENABLED: bool = False
+    LOG_JSON_FORMAT: bool = False
+    # Per-module sampling of INFO and lower records, "module=value,...", e.g. "src.entity.estimator=0.01"
+    LOG_SAMPLE_RATES: str = ""
+    LOG_RATE_LIMITS: str = ""
 
 
     APP_HOST: str = "0.0.0.0"
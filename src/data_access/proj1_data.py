@@ -1,10 +1,15 @@
+import queue
 import sys
+import threading
 import pandas as pd
 import numpy as np
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from src.utils.logger import get_logger
 from src.utils.exception import MyException
+from src.utils.main_utils import read_yaml_file
 from src.core.config import settings
 from src.configuration.mongo_db_connection import MongoDBClient
 logger = get_logger(__name__)
@@ -14,19 +19,257 @@ class Proj1Data:
     """
     This class is responsible for fetching mongodb data and exporting it as pandas dataframe
     """
-    
+
     def __init__(self):
         try:
             self.mongodb_client = MongoDBClient(database_name=settings.database_name)
+            self._schema_config = read_yaml_file(file_path=settings.SCHEMA_FILE_PATH)
         except Exception as e:
             raise MyException(e, sys)
 
-    def export_collection_as_dataframe(self, collection_name: str,database_name: Optional[str] = None) -> pd.DataFrame:
+    @property
+    def schema_columns(self) -> List[str]:
+        return [list(column.keys())[0] for column in self._schema_config["columns"]]
+
+    def _get_collection(self, collection_name: str, database_name: Optional[str] = None):
+        #access specified collection from the default or specified database
+        if database_name is None:
+            return self.mongodb_client.database[collection_name]
+        return self.mongodb_client.client[database_name][collection_name]
+
+    @staticmethod
+    def _decode_columns(documents: list, columns: List[str]) -> Dict[str, pd.Series]:
+        """
+        Decodes one batch of documents column by column into typed arrays. Columns are built
+        from plain value lists instead of one dict per row, and "na" placeholders become NaN
+        the same way the full-frame replace did (numeric columns with gaps end up float64).
+        Each column owns its own array, so it can be released on its own.
+        """
+        decoded = {}
+        for column in columns:
+            values = pd.Series([document.get(column) for document in documents])
+            if values.isna().all() and not any(column in document for document in documents):
+                continue  # Field absent from the whole batch, as in a frame built from the documents
+            if values.dtype == object:
+                values = values.mask(values == "na").infer_objects()
+            decoded[column] = values
+        return decoded
+
+    @staticmethod
+    def _decode_batch(documents: list, columns: List[str]) -> pd.DataFrame:
+        return pd.DataFrame(Proj1Data._decode_columns(documents, columns))
+
+    @staticmethod
+    def _concat_column_batches(column_batches: Iterable[Tuple[Any, Dict[str, pd.Series]]],
+                               columns: List[str]) -> pd.DataFrame:
+        """
+        Builds one frame from decoded batches as they arrive. Chunks are kept per column and
+        each column is concatenated and then released before the next one, so the peak is the
+        result plus one column rather than every batch plus the result, as with a list of
+        batch frames and pd.concat. Batches come with a sort key and are laid out in key order,
+        whatever order they arrive in. Dtypes come out as pd.concat of the batch frames would
+        give them; a column missing from some batches is NaN there.
+        """
+        chunks: Dict[str, Dict[Any, pd.Series]] = {}
+        lengths: Dict[Any, int] = {}
+        for key, batch in column_batches:
+            for column, values in batch.items():
+                chunks.setdefault(column, {})[key] = values
+            lengths[key] = len(next(iter(batch.values()))) if batch else 0
+            del batch
+        keys = sorted(lengths)
+        concatenated = {}
+        for column in [column for column in columns if column in chunks]:
+            column_chunks = chunks.pop(column)
+            parts = [column_chunks.pop(key) if key in column_chunks else pd.Series(np.nan, index=range(lengths[key]))
+                     for key in keys]
+            concatenated[column] = pd.concat(parts, ignore_index=True)
+            del parts
+        # Not copied into consolidated blocks, which would need the memory of the frame a second time
+        return pd.DataFrame(concatenated, copy=False)
+
+    def _iter_column_batches(self, collection_name: str, database_name: Optional[str] = None,
+                             query: Optional[dict] = None, batch_size: int = settings.DATA_INGESTION_EXPORT_BATCH_SIZE,
+                             include_id: bool = False, sort: Optional[list] = None) -> Iterator[Dict[str, pd.Series]]:
+        collection = self._get_collection(collection_name, database_name)
+        columns = self.schema_columns
+        projection = {column: 1 for column in columns}
+        if include_id:
+            columns = ["_id"] + columns
+        else:
+            projection["_id"] = 0
+        cursor = collection.find(query or {}, projection=projection, sort=sort, batch_size=batch_size)
+        try:
+            while True:
+                documents = list(islice(cursor, batch_size))
+                if not documents:
+                    return
+                yield self._decode_columns(documents, columns)
+        finally:
+            cursor.close()
+
+    def iter_collection_batches(self, collection_name: str, database_name: Optional[str] = None,
+                                query: Optional[dict] = None, batch_size: int = settings.DATA_INGESTION_EXPORT_BATCH_SIZE,
+                                include_id: bool = False, sort: Optional[list] = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams the collection as DataFrames of at most batch_size rows.
+
+        Only the columns listed in config/schema.yaml are projected, so other fields never
+        leave the server, and a single cursor with a large batch_size keeps round trips low.
+
+        Args:
+            collection_name (str): The name of the mongodb collection to export
+            database_name (Optional[str], optional): Name of the database. Defaults to None.
+            query (Optional[dict], optional): Filter on the documents to export. Defaults to all documents.
+            batch_size (int): Documents per cursor batch and per yielded DataFrame.
+            include_id (bool): Also return the _id column, e.g. to track the last exported document.
+            sort (Optional[list], optional): Sort specification of the cursor. Defaults to natural order.
+
+        Yields:
+            pd.DataFrame: The next batch, with schema columns in schema order.
+        """
+        try:
+            for batch in self._iter_column_batches(collection_name, database_name, query=query, batch_size=batch_size,
+                                                   include_id=include_id, sort=sort):
+                yield pd.DataFrame(batch)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def partition_id_ranges(self, collection_name: str, partitions: int,
+                            database_name: Optional[str] = None) -> List[Tuple[Any, Any]]:
+        """
+        Splits the collection into at most `partitions` contiguous _id ranges of about equal size.
+
+        Boundaries are read from the _id index with covered queries (_id-only projection), each
+        one skipping count/partitions keys from the previous boundary, so placing them walks the
+        index once. Nothing is sampled: repeated calls on unchanged data give the same split,
+        and the ranges always cover every _id.
+
+        Args:
+            collection_name (str): The name of the mongodb collection to split
+            partitions (int): Number of ranges wanted
+            database_name (Optional[str], optional): Name of the database. Defaults to None.
+
+        Returns:
+            List[Tuple[Any, Any]]: (lower, upper) _id bounds; lower is inclusive, upper exclusive,
+                and None means unbounded.
+        """
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            step = collection.estimated_document_count() // partitions if partitions > 1 else 0
+            boundaries = []
+            while step and len(boundaries) < partitions - 1:
+                query = {"_id": {"$gte": boundaries[-1]}} if boundaries else {}
+                boundary = next(collection.find(query, projection={"_id": 1}, sort=[("_id", 1)],
+                                                skip=step, limit=1), None)
+                if boundary is None:
+                    break
+                boundaries.append(boundary["_id"])
+            bounds = [None] + boundaries + [None]
+            return list(zip(bounds[:-1], bounds[1:]))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def _id_range_query(lower: Any, upper: Any) -> dict:
+        id_filter = {}
+        if lower is not None:
+            id_filter["$gte"] = lower
+        if upper is not None:
+            id_filter["$lt"] = upper
+        return {"_id": id_filter} if id_filter else {}
+
+    def _export_id_range(self, collection_name: str, database_name: Optional[str], partition: int,
+                         id_range: Tuple[Any, Any], query: Optional[dict], batches: "queue.Queue",
+                         stop: threading.Event) -> None:
+        range_query = self._id_range_query(*id_range)
+        if query:
+            range_query = {"$and": [range_query, query]} if range_query else query
+        # Sorted on the _id index; the (partition, batch) key then fixes the merged order
+        for index, batch in enumerate(self._iter_column_batches(collection_name, database_name, query=range_query,
+                                                                sort=[("_id", 1)])):
+            if stop.is_set():
+                return
+            batches.put(((partition, index), batch))
+            del batch
+
+    def _iter_partitioned_batches(self, collection_name: str, database_name: Optional[str],
+                                  id_ranges: List[Tuple[Any, Any]],
+                                  query: Optional[dict]) -> Iterator[Tuple[Tuple[int, int], Dict[str, pd.Series]]]:
+        """
+        Exports the _id ranges concurrently and yields their batches as soon as any cursor
+        delivers one, so they are folded into the result as they arrive instead of being held
+        per partition until every range is done.
+        """
+        batches: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+        # pymongo releases the GIL while waiting on the server, and MongoClient is thread-safe,
+        # so the partitions share its connection pool
+        with ThreadPoolExecutor(max_workers=len(id_ranges), thread_name_prefix="mongo-export") as executor:
+            futures = [executor.submit(self._export_id_range, collection_name, database_name, partition, id_range,
+                                       query, batches, stop)
+                       for partition, id_range in enumerate(id_ranges)]
+            for future in futures:
+                future.add_done_callback(lambda _: batches.put(None))
+            try:
+                remaining = len(futures)
+                while remaining:
+                    item = batches.get()
+                    if item is None:
+                        remaining -= 1
+                        continue
+                    yield item
+                    del item
+                for future in futures:
+                    future.result()
+            finally:
+                stop.set()
+
+    def get_high_water_mark(self, collection_name: str, field: str = "_id",
+                            database_name: Optional[str] = None) -> Any:
+        """
+        Returns the largest value of field in the collection, or None when it is empty.
+        Runs as a single indexed lookup when field is _id or has an index of its own.
+        """
+        try:
+            collection = self._get_collection(collection_name, database_name)
+            document = collection.find_one({field: {"$exists": True}}, projection={field: 1}, sort=[(field, -1)])
+            return document[field] if document is not None else None
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def count_documents(self, collection_name: str, query: Optional[dict] = None,
+                        database_name: Optional[str] = None) -> int:
+        """
+        Counts the documents matching query; a range on _id or another indexed field is
+        counted on the index without fetching documents.
+
+        Args:
+            collection_name (str): The name of the mongodb collection
+            query (Optional[dict], optional): Filter on the documents to count. Defaults to all documents.
+            database_name (Optional[str], optional): Name of the database. Defaults to None.
+
+        Returns:
+            int: Number of matching documents.
+        """
+        try:
+            return self._get_collection(collection_name, database_name).count_documents(query or {})
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def export_collection_as_dataframe(self, collection_name: str,database_name: Optional[str] = None,
+                                       streaming: bool = settings.DATA_INGESTION_STREAMING_EXPORT,
+                                       partitions: int = 1, query: Optional[dict] = None) -> pd.DataFrame:
         """_summary_
 
         Args:
             collection_name (str): The name of the mongodb collection to export
             database_name (Optional[str], optional): Name of the database. Defaults to None.
+            streaming (bool): Read projected batches through iter_collection_batches instead of
+                materializing every document as a dict first. Defaults to settings.DATA_INGESTION_STREAMING_EXPORT.
+            partitions (int): With streaming, export this many _id ranges concurrently, each through
+                its own cursor on the shared MongoClient. Rows then come back in _id order. Defaults to 1.
+            query (Optional[dict], optional): Filter on the documents to export. Defaults to all documents.
 
         Raises:
             MyException: _description_
@@ -35,14 +278,12 @@ class Proj1Data:
             pd.DataFrame: _description_
         """
         try:
-            #access specified collection from the default or specified database
-            if database_name is None:
-                collection = self.mongodb_client.database[collection_name]
-            else:
-                collection = self.mongodb_client[database_name][collection_name]
-            
             logger.info(f"Exporting collection {collection_name} as dataframe")
-            df = pd.DataFrame(list(collection.find()))
+            if streaming:
+                return self._export_streaming(collection_name, database_name, partitions, query)
+
+            collection = self._get_collection(collection_name, database_name)
+            df = pd.DataFrame(list(collection.find(query or {})))
             if "_id" in df.columns.to_list():
                 df = df.drop(columns=["_id"], axis=1)
             df.replace({"na": np.nan}, inplace=True)
@@ -50,5 +291,15 @@ class Proj1Data:
         except Exception as e:
             raise MyException(e, sys)
 
-
-
+    def _export_streaming(self, collection_name: str, database_name: Optional[str] = None,
+                          partitions: int = 1, query: Optional[dict] = None) -> pd.DataFrame:
+        # Batches are folded into per-column chunks while the cursors are still being read
+        if partitions > 1:
+            id_ranges = self.partition_id_ranges(collection_name, partitions, database_name)
+            logger.info(f"Exporting {collection_name} as {len(id_ranges)} _id range partitions")
+            return self._concat_column_batches(self._iter_partitioned_batches(collection_name, database_name,
+                                                                              id_ranges, query),
+                                               self.schema_columns)
+        return self._concat_column_batches(enumerate(self._iter_column_batches(collection_name, database_name,
+                                                                               query=query)),
+                                           self.schema_columns)
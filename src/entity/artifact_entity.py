@@ -1,10 +1,22 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from pandas import DataFrame, Series
+
+
+def in_memory(default=None):
+    # Live object handed to the next stage with settings.TRAINING_IN_MEMORY_ARTIFACTS;
+    # left out of repr and comparisons, so logging an artifact still only shows its paths
+    return field(default=default, repr=False, compare=False)
 
 
 @dataclass
 class DataIngestionArtifact:
     trained_file_path:str 
     test_file_path:str
+    train_df: Optional[DataFrame] = in_memory()
+    test_df: Optional[DataFrame] = in_memory()
 
 @dataclass
 class DataValidationArtifact:
@@ -17,6 +29,13 @@ class DataTransformationArtifact:
     transformed_object_file_path:str 
     transformed_train_file_path:str
     transformed_test_file_path:str
+    preprocessing_object: Optional[object] = in_memory()
+    train_arr: Optional[np.ndarray] = in_memory()
+    test_arr: Optional[np.ndarray] = in_memory()
+    # Test set after the gender/dummy/rename feature engineering, before the preprocessor
+    # and SMOTEENN: what model evaluation scores the production model on
+    test_features: Optional[DataFrame] = in_memory()
+    test_target: Optional[Series] = in_memory()
 
 @dataclass
 class ClassificationMetricArtifact:
@@ -28,6 +47,7 @@ class ClassificationMetricArtifact:
 class ModelTrainerArtifact:
     trained_model_file_path:str 
     metric_artifact:ClassificationMetricArtifact
+    trained_model: Optional[object] = in_memory()
 
 @dataclass
 class ModelEvaluationArtifact:
@@ -35,8 +55,18 @@ class ModelEvaluationArtifact:
     changed_accuracy:float
     s3_model_path:str 
     trained_model_path:str
+    trained_model_f1_score:Optional[float] = None
+    best_model_f1_score:Optional[float] = None
 
 @dataclass
 class ModelPusherArtifact:
     bucket_name:str
-    s3_model_path:str
\ No newline at end of file
+    s3_model_path:str
+    model_version:Optional[str] = None
+
+@dataclass
+class BatchScoringArtifact:
+    documents_scored:int
+    last_processed_id:str
+    model_version:str
+    elapsed_seconds:float
@@ -0,0 +1,166 @@
+import mmap
+import sys
+
+import numpy as np
+
+from src.utils.exception import MyException
+
+
+def _smallest_int_dtype(max_value: int) -> np.dtype:
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class CompiledForest:
+    """
+    A fitted RandomForestClassifier flattened into contiguous NumPy arrays.
+
+    All trees are stored back to back: feature index, threshold, left/right child (as
+    global node ids) and per-node class values. Leaves point to themselves, so every
+    tree of a batch can be walked together for max_depth steps without branching.
+
+    Results are bit-identical to sklearn:
+    - inputs are cast to float32 like sklearn's tree input validation,
+    - float64 split thresholds are rounded down to the nearest float32, which keeps
+      `x <= threshold` exact for every float32 x,
+    - per-tree class values are accumulated in float64 in estimator order (cumsum adds
+      sequentially, like the forest's accumulation) and divided by the tree count.
+    """
+
+    # Rows scored per traversal block, bounding the (n_trees, rows, n_classes) buffer
+    block_size = 4096
+    # Node arrays moved into shared memory by share_memory()
+    array_names = ("feature", "threshold", "left", "right", "value", "roots")
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, classes: np.ndarray, n_features: int, max_depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.n_features = n_features
+        self.max_depth = max_depth
+        self._shared_buffer = None
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        """
+        Flattens a fitted single-output RandomForestClassifier.
+        """
+        try:
+            if getattr(forest, "n_outputs_", 1) != 1:
+                raise ValueError("Only single-output forests can be compiled")
+
+            trees = [estimator.tree_ for estimator in forest.estimators_]
+            n_classes = int(forest.n_classes_)
+            node_counts = np.array([tree.node_count for tree in trees])
+            offsets = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+            total_nodes = int(node_counts.sum())
+
+            index_dtype = _smallest_int_dtype(total_nodes)
+            feature = np.zeros(total_nodes, dtype=_smallest_int_dtype(forest.n_features_in_))
+            threshold = np.zeros(total_nodes, dtype=np.float32)
+            left = np.empty(total_nodes, dtype=index_dtype)
+            right = np.empty(total_nodes, dtype=index_dtype)
+            value = np.empty((total_nodes, n_classes), dtype=np.float64)
+
+            for tree, offset in zip(trees, offsets):
+                nodes = slice(offset, offset + tree.node_count)
+                node_ids = np.arange(offset, offset + tree.node_count)
+                is_leaf = tree.children_left == -1
+
+                split_threshold = tree.threshold.astype(np.float32)
+                rounded_up = split_threshold.astype(np.float64) > tree.threshold
+                split_threshold[rounded_up] = np.nextafter(split_threshold[rounded_up], np.float32(-np.inf))
+
+                feature[nodes] = np.where(is_leaf, 0, tree.feature)
+                threshold[nodes] = np.where(is_leaf, 0, split_threshold)
+                left[nodes] = np.where(is_leaf, node_ids, tree.children_left + offset)
+                right[nodes] = np.where(is_leaf, node_ids, tree.children_right + offset)
+                value[nodes] = tree.value[:, 0, :n_classes]
+
+            return cls(feature=feature, threshold=threshold, left=left, right=right, value=value,
+                       roots=offsets.astype(index_dtype), classes=np.asarray(forest.classes_),
+                       n_features=int(forest.n_features_in_),
+                       max_depth=max(int(tree.max_depth) for tree in trees))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.array_names)
+
+    @property
+    def is_shared(self) -> bool:
+        return getattr(self, "_shared_buffer", None) is not None
+
+    def share_memory(self) -> "CompiledForest":
+        """
+        Moves the node arrays into one anonymous shared memory mapping and makes them
+        read-only. Processes forked afterwards map the same physical pages, so N workers
+        hold one copy of the trees instead of N.
+        """
+        if self.is_shared:
+            return self
+        offsets, size = {}, 0
+        for name in self.array_names:
+            array = getattr(self, name)
+            # 64-byte alignment keeps every array on its own cache lines
+            size = -(-size // 64) * 64
+            offsets[name] = size
+            size += array.nbytes
+        buffer = mmap.mmap(-1, max(size, 1))
+        for name in self.array_names:
+            array = getattr(self, name)
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=buffer, offset=offsets[name])
+            shared[...] = array
+            shared.flags.writeable = False
+            setattr(self, name, shared)
+        self._shared_buffer = buffer
+        return self
+
+    def __getstate__(self):
+        # mmap objects cannot be pickled; the arrays are pickled as ordinary copies
+        state = self.__dict__.copy()
+        state["_shared_buffer"] = None
+        for name in self.array_names:
+            state[name] = np.array(state[name])
+        return state
+
+    def _predict_proba_block(self, features: np.ndarray) -> np.ndarray:
+        n_rows = features.shape[0]
+        flat_features = features.ravel()
+        row_offset = np.arange(n_rows) * self.n_features
+        node = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            go_left = flat_features.take(row_offset + self.feature.take(node)) <= self.threshold.take(node)
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+        proba = np.cumsum(self.value[node], axis=0)[-1]
+        proba /= len(self.roots)
+        return proba
+
+    def predict_proba(self, features) -> np.ndarray:
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if features.ndim != 2 or features.shape[1] != self.n_features:
+            raise ValueError(f"Expected features of shape (n, {self.n_features}), got {features.shape}")
+        if np.isnan(features).any():
+            raise ValueError("Compiled forest does not handle missing values")
+        if features.shape[0] <= self.block_size:
+            return self._predict_proba_block(features)
+        return np.concatenate([self._predict_proba_block(features[start:start + self.block_size])
+                               for start in range(0, features.shape[0], self.block_size)])
+
+    def predict(self, features) -> np.ndarray:
+        return self.classes.take(np.argmax(self.predict_proba(features), axis=1), axis=0)
+
+    def matches(self, forest, features) -> bool:
+        """
+        True if predictions and probabilities are identical to the sklearn forest on features.
+        """
+        return (np.array_equal(self.predict_proba(features), forest.predict_proba(features))
+                and np.array_equal(self.predict(features), forest.predict(features)))
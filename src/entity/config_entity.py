@@ -1,9 +1,17 @@
 import os
 from src.core.config import settings
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
-from src.utils.main_utils import read_yaml_file
+from src.utils.main_utils import read_yaml_file, table_file_name
 TIMESTAMP: str = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
+# Key the production model is evaluated against, pushed to and served from
+PRODUCTION_MODEL_KEY: str = settings.MODEL_PUSHER_S3_KEY if settings.MODEL_REGISTRY_ENABLED else settings.MODEL_FILE_NAME
+
+
+@lru_cache(maxsize=None)
+def read_model_config(file_path: str) -> dict:
+    return read_yaml_file(file_path=file_path)
 
 @dataclass
 class TrainingPipelineConfig:
@@ -17,11 +25,23 @@ training_pipeline_config: TrainingPipelineConfig = TrainingPipelineConfig()
 @dataclass
 class DataIngestionConfig:
     data_ingestion_dir: str = os.path.join(training_pipeline_config.artifact_dir, settings.DATA_INGESTION_DIR_NAME)
-    feature_store_file_path: str = os.path.join(data_ingestion_dir, settings.DATA_INGESTION_FEATURE_STORE_DIR, settings.FILE_NAME)
-    training_file_path: str = os.path.join(data_ingestion_dir, settings.DATA_INGESTION_INGESTED_DIR, settings.TRAIN_FILE_NAME)
-    testing_file_path: str = os.path.join(data_ingestion_dir, settings.DATA_INGESTION_INGESTED_DIR, settings.TEST_FILE_NAME)
+    feature_store_file_path: str = os.path.join(data_ingestion_dir, settings.DATA_INGESTION_FEATURE_STORE_DIR,
+                                                table_file_name(settings.FILE_NAME))
+    training_file_path: str = os.path.join(data_ingestion_dir, settings.DATA_INGESTION_INGESTED_DIR,
+                                           table_file_name(settings.TRAIN_FILE_NAME))
+    testing_file_path: str = os.path.join(data_ingestion_dir, settings.DATA_INGESTION_INGESTED_DIR,
+                                          table_file_name(settings.TEST_FILE_NAME))
     train_test_split_ratio: float = settings.DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
     collection_name:str = settings.DATA_INGESTION_COLLECTION_NAME
+    export_partitions: int = settings.DATA_INGESTION_EXPORT_PARTITIONS
+    incremental: bool = settings.DATA_INGESTION_INCREMENTAL
+    full_rebuild: bool = settings.DATA_INGESTION_FULL_REBUILD
+    watermark_field: str = settings.DATA_INGESTION_WATERMARK_FIELD
+    # Outside the timestamped artifact dir, so the next run appends to it
+    incremental_store_file_path: str = os.path.join(settings.DATA_INGESTION_INCREMENTAL_STORE_DIR,
+                                                    table_file_name(settings.FILE_NAME))
+    watermark_file_path: str = os.path.join(settings.DATA_INGESTION_INCREMENTAL_STORE_DIR,
+                                            settings.DATA_INGESTION_WATERMARK_FILE_NAME)
 
 
 @dataclass
@@ -42,31 +62,69 @@ class DataTransformationConfig:
 
 @dataclass
 class ModelTrainerConfig:
-    #read yaml file
-    model_config = read_yaml_file(file_path=settings.MODEL_TRAINER_MODEL_CONFIG_FILE_PATH)
     model_trainer_dir: str = os.path.join(training_pipeline_config.artifact_dir,settings.MODEL_TRAINER_DIR_NAME)
     trained_model_file_path: str = os.path.join(model_trainer_dir, settings.MODEL_TRAINER_TRAINED_MODEL_DIR, settings.MODEL_FILE_NAME)
-    expected_accuracy: float = model_config["model"]["trainer"]["expected_score"]
     model_config_file_path: str = settings.MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
-    _n_estimators = model_config["model"]["trainer"]["n_estimators"]
-    _min_samples_split = model_config["model"]["trainer"]["min_samples_split"]
-    _min_samples_leaf = model_config["model"]["trainer"]["min_samples_leaf"]
-    _max_depth = model_config["model"]["trainer"]["max_depth"]
-    _criterion = model_config["model"]["trainer"]["criterion"]
-    _random_state = model_config["model"]["trainer"]["random_state"]
+
+    #read yaml file on first use, so importing this module never touches config/model.yaml
+    @property
+    def model_config(self) -> dict:
+        return read_model_config(self.model_config_file_path)
+
+    @property
+    def _trainer_config(self) -> dict:
+        return self.model_config["model"]["trainer"]
+
+    @property
+    def expected_accuracy(self) -> float:
+        return self._trainer_config["expected_score"]
+
+    @property
+    def _n_estimators(self):
+        return self._trainer_config["n_estimators"]
+
+    @property
+    def _min_samples_split(self):
+        return self._trainer_config["min_samples_split"]
+
+    @property
+    def _min_samples_leaf(self):
+        return self._trainer_config["min_samples_leaf"]
+
+    @property
+    def _max_depth(self):
+        return self._trainer_config["max_depth"]
+
+    @property
+    def _criterion(self):
+        return self._trainer_config["criterion"]
+
+    @property
+    def _random_state(self):
+        return self._trainer_config["random_state"]
     
 @dataclass
 class ModelEvaluationConfig:
     changed_threshold_score: float = settings.MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE
     bucket_name: str = settings.MODEL_BUCKET_NAME
-    s3_model_key_path: str = settings.MODEL_FILE_NAME
+    s3_model_key_path: str = PRODUCTION_MODEL_KEY
 
 @dataclass
 class ModelPusherConfig:
     bucket_name: str = settings.MODEL_BUCKET_NAME
-    s3_model_key_path: str = settings.MODEL_FILE_NAME
+    s3_model_key_path: str = PRODUCTION_MODEL_KEY
     
+@dataclass
+class BatchScoringConfig:
+    # Kept outside the timestamped run directory so a later run can resume from the checkpoint
+    batch_scoring_dir: str = os.path.join(settings.ARTIFACT_DIR, settings.BATCH_SCORING_DIR_NAME)
+    checkpoint_file_path: str = os.path.join(batch_scoring_dir, settings.BATCH_SCORING_CHECKPOINT_FILE_NAME)
+    collection_name: str = settings.DATA_INGESTION_COLLECTION_NAME
+    batch_size: int = settings.BATCH_SCORING_BATCH_SIZE
+    workers: int = settings.BATCH_SCORING_WORKERS
+    queue_depth: int = settings.BATCH_SCORING_QUEUE_DEPTH
+
 @dataclass
 class VehiclePredictorConfig:
-    model_file_path: str = settings.MODEL_FILE_NAME
+    model_file_path: str = PRODUCTION_MODEL_KEY
     model_bucket_name: str = settings.MODEL_BUCKET_NAME
\ No newline at end of file
@@ -1,11 +1,20 @@
 import sys
+import time
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
-from sklearn.pipeline import Pipeline
 
+from src.entity.compiled_forest import CompiledForest
+from src.entity.feature_vector import FastFeatureBuilder
 from src.utils.exception import MyException
 from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    # Only needed for annotations; models in the artifact format never import sklearn
+    from sklearn.pipeline import Pipeline
 
 logger = get_logger(__name__)
 
@@ -20,13 +29,116 @@ class TargetValueMapping:
         return dict(zip(mapping_response.values(),mapping_response.keys()))
 
 class MyModel:
-    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object):
+    def __init__(self, preprocessing_object: "Pipeline", trained_model_object: object):
         """
         :param preprocessing_object: Input Object of preprocesser
         :param trained_model_object: Input Object of trained model 
         """
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
+        self.compiled_model: Optional[CompiledForest] = None
+        self.feature_builder: Optional[FastFeatureBuilder] = None
+        # Header metadata when loaded from the memory-mapped artifact format
+        self.artifact_metadata: dict = {}
+
+    def compile(self) -> bool:
+        """
+        Builds the serving fast paths: the array-based inference engine for the trained forest
+        and the NumPy feature builder for the preprocessing pipeline.
+        Returns False if either is unavailable; the sklearn/pandas path is then used for it.
+        """
+        if self.trained_model_object is None:
+            # Loaded from a model artifact: the fast paths are all there is
+            return self.compiled_model is not None and self.feature_builder is not None
+        compiled = True
+        try:
+            self.compiled_model = CompiledForest.from_sklearn(self.trained_model_object)
+            logger.info(f"Compiled inference engine built ({self.compiled_model.nbytes} bytes)")
+        except Exception as e:
+            logger.warning(f"Compiled inference unavailable, using sklearn predict: {e}")
+            self.compiled_model = None
+            compiled = False
+        try:
+            self.feature_builder = FastFeatureBuilder.from_preprocessing(self.preprocessing_object)
+            logger.info("Fast feature builder extracted from the preprocessing pipeline")
+        except Exception as e:
+            logger.warning(f"Fast feature builder unavailable, using preprocessing transform: {e}")
+            self.feature_builder = None
+            compiled = False
+        return compiled
+
+    def transform_records(self, records: Sequence[Mapping]) -> np.ndarray:
+        """
+        Builds model features for records of raw input values, bypassing pandas when the
+        fast feature builder is available.
+        """
+        feature_builder = getattr(self, "feature_builder", None)
+        if feature_builder is not None:
+            try:
+                return feature_builder.transform_records(records)
+            except Exception as e:
+                logger.warning(f"Fast feature builder failed, falling back to preprocessing transform: {e}")
+        return self.preprocessing_object.transform(pd.DataFrame(list(records)))
+
+    def _transform(self, dataframe: pd.DataFrame) -> np.ndarray:
+        if self.preprocessing_object is None:
+            feature_builder = self.feature_builder
+            return feature_builder.transform_values(
+                np.asarray(dataframe[feature_builder.input_columns], dtype=np.float64))
+        return self.preprocessing_object.transform(dataframe)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        if self.trained_model_object is None:
+            return self.compiled_model.classes
+        return self.trained_model_object.classes_
+
+    def predict_records(self, records: Sequence[Mapping], timings: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Predicts for records (dicts of raw input values) without building a DataFrame.
+
+        :param timings: When given, the seconds spent per stage ("preprocessing_transform",
+            "model_predict") are stored in it for the caller to record, instead of being recorded here
+        """
+        try:
+            start = time.perf_counter()
+            transformed_feature = self.transform_records(records)
+            transformed_at = time.perf_counter()
+            predictions = self._predict_transformed(transformed_feature)
+            stages = {"preprocessing_transform": transformed_at - start,
+                      "model_predict": time.perf_counter() - transformed_at}
+            if timings is None:
+                metrics.observe_stages(stages)
+            else:
+                timings.update(stages)
+            return predictions
+
+        except Exception as e:
+            logger.error("Error occurred in predict_records method", exc_info=True)
+            raise MyException(e, sys) from e
+
+    def _predict_transformed(self, transformed_feature) -> np.ndarray:
+        # Models unpickled from before compiled inference existed have no compiled_model attribute
+        compiled_model = getattr(self, "compiled_model", None)
+        if compiled_model is not None:
+            try:
+                return compiled_model.predict(transformed_feature)
+            except Exception as e:
+                if self.trained_model_object is None:
+                    raise
+                logger.warning(f"Compiled predict failed, falling back to sklearn: {e}")
+        return self.trained_model_object.predict(transformed_feature)
+
+    def _predict_proba_transformed(self, transformed_feature) -> np.ndarray:
+        compiled_model = getattr(self, "compiled_model", None)
+        if compiled_model is not None:
+            try:
+                return compiled_model.predict_proba(transformed_feature)
+            except Exception as e:
+                if self.trained_model_object is None:
+                    raise
+                logger.warning(f"Compiled predict_proba failed, falling back to sklearn: {e}")
+        return self.trained_model_object.predict_proba(transformed_feature)
 
     def predict(self, dataframe: pd.DataFrame) -> DataFrame:
         """
@@ -37,11 +149,13 @@ class MyModel:
             logger.info("Starting prediction process.")
 
             # Step 1: Apply scaling transformations using the pre-trained preprocessing object
-            transformed_feature = self.preprocessing_object.transform(dataframe)
+            with metrics.stage("preprocessing_transform"):
+                transformed_feature = self._transform(dataframe)
 
             # Step 2: Perform prediction using the trained model
             logger.info("Using the trained model to get predictions")
-            predictions = self.trained_model_object.predict(transformed_feature)
+            with metrics.stage("model_predict"):
+                predictions = self._predict_transformed(transformed_feature)
 
             return predictions
 
@@ -50,8 +164,33 @@ class MyModel:
             raise MyException(e, sys) from e
 
 
+    def predict_proba(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """
+        Same as predict but returns the class probabilities, one column per class in classes_ order.
+        """
+        try:
+            with metrics.stage("preprocessing_transform"):
+                transformed_feature = self._transform(dataframe)
+            with metrics.stage("model_predict"):
+                return self._predict_proba_transformed(transformed_feature)
+
+        except Exception as e:
+            logger.error("Error occurred in predict_proba method", exc_info=True)
+            raise MyException(e, sys) from e
+
+    def predict_with_proba(self, dataframe: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (predictions, probabilities) from a single pass over the model.
+        Labels are derived from the probabilities the same way the classifier's own predict does.
+        """
+        proba = self.predict_proba(dataframe)
+        predictions = self.classes_.take(np.argmax(proba, axis=1), axis=0)
+        return predictions, proba
+
     def __repr__(self):
+        if self.trained_model_object is None:
+            return f"{type(self.compiled_model).__name__}()"
         return f"{type(self.trained_model_object).__name__}()"
 
     def __str__(self):
-        return f"{type(self.trained_model_object).__name__}()"
\ No newline at end of file
+        return self.__repr__()
\ No newline at end of file
@@ -0,0 +1,146 @@
+import sys
+from typing import List, Mapping, Sequence
+
+import numpy as np
+
+from src.utils.exception import MyException
+
+
+def _is_passthrough(transformer) -> bool:
+    from sklearn.preprocessing import FunctionTransformer
+
+    # Fitted ColumnTransformers store a passthrough remainder as an identity FunctionTransformer
+    return transformer == "passthrough" or (
+        isinstance(transformer, FunctionTransformer) and transformer.func is None)
+
+
+class FastFeatureBuilder:
+    """
+    Serving fast path for the fitted preprocessing pipeline.
+
+    The fitted StandardScaler/MinMaxScaler constants are pulled out of the ColumnTransformer
+    once, and feature vectors are then built straight from the input fields with NumPy, in
+    the training column order, without a DataFrame. The arithmetic is the same sequence of
+    float64 operations the scalers perform ((x - mean) / scale and x * scale + min), so the
+    output is bit-identical to preprocessing_object.transform.
+    """
+
+    def __init__(self, input_columns: Sequence[str], n_outputs: int,
+                 standard_source: np.ndarray, standard_target: np.ndarray,
+                 standard_mean: np.ndarray, standard_scale: np.ndarray,
+                 minmax_source: np.ndarray, minmax_target: np.ndarray,
+                 minmax_scale: np.ndarray, minmax_min: np.ndarray, minmax_clip,
+                 passthrough_source: np.ndarray, passthrough_target: np.ndarray):
+        self.input_columns: List[str] = list(input_columns)
+        self.n_outputs = n_outputs
+        self.standard_source = standard_source
+        self.standard_target = standard_target
+        self.standard_mean = standard_mean
+        self.standard_scale = standard_scale
+        self.minmax_source = minmax_source
+        self.minmax_target = minmax_target
+        self.minmax_scale = minmax_scale
+        self.minmax_min = minmax_min
+        self.minmax_clip = minmax_clip
+        self.passthrough_source = passthrough_source
+        self.passthrough_target = passthrough_target
+
+    @classmethod
+    def from_preprocessing(cls, preprocessing_object) -> "FastFeatureBuilder":
+        """
+        Extracts the fitted constants from the saved preprocessing pipeline.
+        Raises if the pipeline holds anything other than a ColumnTransformer of
+        StandardScaler, MinMaxScaler and passthrough/drop columns.
+        """
+        # sklearn is only imported here, so serving a model artifact never loads it
+        from sklearn.compose import ColumnTransformer
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+        try:
+            column_transformer = preprocessing_object
+            if isinstance(column_transformer, Pipeline):
+                if len(column_transformer.steps) != 1:
+                    raise ValueError("Only single-step preprocessing pipelines are supported")
+                column_transformer = column_transformer.steps[0][1]
+            if not isinstance(column_transformer, ColumnTransformer):
+                raise ValueError(f"Unsupported preprocessing object {type(column_transformer).__name__}")
+
+            input_columns = list(column_transformer.feature_names_in_)
+            position = {column: index for index, column in enumerate(input_columns)}
+
+            groups = {"standard": ([], []), "minmax": ([], []), "passthrough": ([], [])}
+            standard_mean, standard_scale, minmax_scale, minmax_min = [], [], [], []
+            minmax_clip = None
+            n_outputs = 0
+            for _, transformer, columns in column_transformer.transformers_:
+                if transformer == "drop" or len(columns) == 0:
+                    continue
+                sources = [position[column] if isinstance(column, str) else int(column) for column in columns]
+                targets = list(range(n_outputs, n_outputs + len(sources)))
+                n_outputs += len(sources)
+
+                if isinstance(transformer, StandardScaler):
+                    kind = "standard"
+                    standard_mean.extend(transformer.mean_ if transformer.with_mean else np.zeros(len(sources)))
+                    standard_scale.extend(transformer.scale_ if transformer.with_std else np.ones(len(sources)))
+                elif isinstance(transformer, MinMaxScaler):
+                    kind = "minmax"
+                    minmax_scale.extend(transformer.scale_)
+                    minmax_min.extend(transformer.min_)
+                    if transformer.clip:
+                        minmax_clip = transformer.feature_range
+                elif _is_passthrough(transformer):
+                    kind = "passthrough"
+                else:
+                    raise ValueError(f"Unsupported transformer {type(transformer).__name__}")
+                groups[kind][0].extend(sources)
+                groups[kind][1].extend(targets)
+
+            as_index = lambda values: np.asarray(values, dtype=np.intp)
+            return cls(input_columns=input_columns, n_outputs=n_outputs,
+                       standard_source=as_index(groups["standard"][0]),
+                       standard_target=as_index(groups["standard"][1]),
+                       standard_mean=np.asarray(standard_mean, dtype=np.float64),
+                       standard_scale=np.asarray(standard_scale, dtype=np.float64),
+                       minmax_source=as_index(groups["minmax"][0]),
+                       minmax_target=as_index(groups["minmax"][1]),
+                       minmax_scale=np.asarray(minmax_scale, dtype=np.float64),
+                       minmax_min=np.asarray(minmax_min, dtype=np.float64),
+                       minmax_clip=minmax_clip,
+                       passthrough_source=as_index(groups["passthrough"][0]),
+                       passthrough_target=as_index(groups["passthrough"][1]))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def transform_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Applies the fitted scaling to raw input values of shape (n, len(input_columns)).
+        """
+        features = np.empty((values.shape[0], self.n_outputs), dtype=np.float64)
+
+        standard = values[:, self.standard_source]
+        standard -= self.standard_mean
+        standard /= self.standard_scale
+        features[:, self.standard_target] = standard
+
+        minmax = values[:, self.minmax_source]
+        minmax *= self.minmax_scale
+        minmax += self.minmax_min
+        if self.minmax_clip is not None:
+            np.clip(minmax, self.minmax_clip[0], self.minmax_clip[1], out=minmax)
+        features[:, self.minmax_target] = minmax
+
+        features[:, self.passthrough_target] = values[:, self.passthrough_source]
+        return features
+
+    def transform_records(self, records: Sequence[Mapping]) -> np.ndarray:
+        """
+        Builds the feature matrix for records mapping input column names to raw values
+        (numbers or numeric strings, as posted by the HTML form).
+        """
+        n_inputs = len(self.input_columns)
+        values = np.empty((len(records), n_inputs), dtype=np.float64)
+        for row, record in enumerate(records):
+            values[row] = [float(record[column]) for column in self.input_columns]
+        return self.transform_values(values)
@@ -0,0 +1,246 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.entity.compiled_forest import CompiledForest
+from src.entity.estimator import MyModel
+from src.entity.feature_vector import FastFeatureBuilder
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# File layout:
+#   MAGIC (8 bytes) | format version (uint32 LE) | header length (uint32 LE) | JSON header
+#   | raw array bytes, each array starting on an ARRAY_ALIGNMENT boundary
+# The header lists every array's dtype, shape and offset from the start of the file, so
+# loading maps the file and wraps each array in place without copying or unpickling. It also
+# holds the CRC-32 of the array bytes, so a truncated or corrupted file is rejected on load.
+MAGIC = b"VIMODEL\x00"
+FORMAT_VERSION = 1
+MODEL_ARTIFACT_EXTENSION = ".vmodel"
+ARRAY_ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+_FOREST_ARRAYS = CompiledForest.array_names + ("classes",)
+_FEATURE_BUILDER_ARRAYS = ("standard_source", "standard_target", "standard_mean", "standard_scale",
+                           "minmax_source", "minmax_target", "minmax_scale", "minmax_min",
+                           "passthrough_source", "passthrough_target")
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+
+def is_model_artifact(data: Buffer) -> bool:
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def is_model_artifact_file(file_path: str) -> bool:
+    with open(file_path, "rb") as file_obj:
+        return is_model_artifact(file_obj.read(len(MAGIC)))
+
+
+def _payload_range(header: dict) -> Tuple[int, int]:
+    # From the first array to the end of the last one, alignment padding included
+    specs = header["arrays"].values()
+    start = min((spec["offset"] for spec in specs), default=0)
+    end = max((spec["offset"] + np.dtype(spec["dtype"]).itemsize * int(np.prod(spec["shape"], dtype=np.int64))
+               for spec in specs), default=0)
+    return start, end
+
+
+def _collect_arrays(model: MyModel) -> Dict[str, np.ndarray]:
+    compiled_model = model.compiled_model
+    feature_builder = model.feature_builder
+    arrays = {f"forest.{name}": getattr(compiled_model, name) for name in _FOREST_ARRAYS}
+    arrays.update({f"features.{name}": getattr(feature_builder, name) for name in _FEATURE_BUILDER_ARRAYS})
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError(f"Array {name} has dtype {array.dtype}, which cannot be stored as raw bytes")
+    return {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+
+def save_model_artifact(file_path: str, model: MyModel, metadata: Optional[dict] = None) -> None:
+    """
+    Writes model in the memory-mappable artifact format.
+    The compiled forest and fast feature builder are built if the model does not have them yet;
+    models that cannot be compiled (e.g. not a RandomForestClassifier) are rejected.
+
+    :param file_path: Destination file, written atomically
+    :param model: Fitted MyModel to store
+    :param metadata: Extra JSON-serializable values stored in the header
+    """
+    try:
+        if getattr(model, "compiled_model", None) is None or getattr(model, "feature_builder", None) is None:
+            if not model.compile():
+                raise ValueError("Only models with a compilable forest and preprocessing can be stored "
+                                 "in the model artifact format")
+
+        arrays = _collect_arrays(model)
+        compiled_model = model.compiled_model
+        feature_builder = model.feature_builder
+        header = {
+            "format_version": FORMAT_VERSION,
+            "created_at": time.time(),
+            "model_type": str(model),
+            "forest": {"n_features": compiled_model.n_features, "max_depth": compiled_model.max_depth},
+            "features": {"input_columns": feature_builder.input_columns,
+                         "n_outputs": feature_builder.n_outputs,
+                         "minmax_clip": list(feature_builder.minmax_clip)
+                         if feature_builder.minmax_clip is not None else None},
+            "metadata": metadata or {},
+            "arrays": {},
+            # Fixed width, so filling it in does not move the arrays
+            "payload_crc32": "0" * 8,
+        }
+
+        # Offsets depend on the header length, so lay the arrays out until it is stable
+        header_bytes = b""
+        while True:
+            offset = _align(_PREAMBLE.size + len(header_bytes))
+            for name, array in arrays.items():
+                header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+                offset = _align(offset + array.nbytes)
+            new_header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+            if len(new_header_bytes) == len(header_bytes):
+                break
+            header_bytes = new_header_bytes
+
+        crc, position = 0, _payload_range(header)[0]
+        for name, array in arrays.items():
+            offset = header["arrays"][name]["offset"]
+            crc = zlib.crc32(array.tobytes(), zlib.crc32(b"\0" * (offset - position), crc))
+            position = offset + array.nbytes
+        header["payload_crc32"] = f"{crc:08x}"
+        header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        tmp_file_path = file_path + ".tmp"
+        with open(tmp_file_path, "wb") as file_obj:
+            file_obj.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+            file_obj.write(header_bytes)
+            for name, array in arrays.items():
+                file_obj.write(b"\0" * (header["arrays"][name]["offset"] - file_obj.tell()))
+                file_obj.write(array.tobytes())
+        os.replace(tmp_file_path, file_path)
+        logger.info(f"Model artifact written to {file_path} ({os.path.getsize(file_path)} bytes)")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def read_model_artifact_header(data: Buffer) -> Tuple[dict, int]:
+    """
+    Parses and validates the preamble and JSON header. Returns (header, format version).
+    """
+    magic, version, header_length = _PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a model artifact: bad magic bytes")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Model artifact format version {version} is newer than the supported "
+                         f"version {FORMAT_VERSION}")
+    header = json.loads(bytes(data[_PREAMBLE.size:_PREAMBLE.size + header_length]).decode("utf-8"))
+    return header, version
+
+
+def _verify_payload(data: Buffer, header: dict) -> None:
+    start, end = _payload_range(header)
+    if len(data) < end:
+        raise ValueError(f"Model artifact is truncated: {len(data)} bytes, the arrays end at {end}")
+    expected_crc = header.get("payload_crc32")
+    if expected_crc is not None and f"{zlib.crc32(memoryview(data)[start:end]):08x}" != expected_crc:
+        raise ValueError("Model artifact is corrupted: the array bytes do not match their checksum")
+
+
+def load_model_artifact(data: Buffer) -> MyModel:
+    """
+    Builds a MyModel whose arrays are read-only views into data (an mmap or bytes), so
+    nothing is copied or unpickled. The model serves through the compiled forest and the
+    fast feature builder; it carries no sklearn objects. Truncated or corrupted data is
+    rejected before any array is wrapped.
+    """
+    try:
+        header, _ = read_model_artifact_header(data)
+        _verify_payload(data, header)
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            arrays[name] = np.frombuffer(data, dtype=dtype, count=count, offset=spec["offset"]).reshape(spec["shape"])
+
+        compiled_model = CompiledForest(
+            **{name: arrays[f"forest.{name}"] for name in _FOREST_ARRAYS},
+            n_features=header["forest"]["n_features"], max_depth=header["forest"]["max_depth"])
+        if isinstance(data, mmap.mmap):
+            # File-backed pages are already shared between processes mapping the same file
+            compiled_model._shared_buffer = data
+
+        features = header["features"]
+        feature_builder = FastFeatureBuilder(
+            input_columns=features["input_columns"], n_outputs=features["n_outputs"],
+            minmax_clip=tuple(features["minmax_clip"]) if features["minmax_clip"] is not None else None,
+            **{name: arrays[f"features.{name}"] for name in _FEATURE_BUILDER_ARRAYS})
+
+        model = MyModel(preprocessing_object=None, trained_model_object=None)
+        model.compiled_model = compiled_model
+        model.feature_builder = feature_builder
+        model.artifact_metadata = header.get("metadata", {})
+        return model
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def load_model_artifact_file(file_path: str) -> MyModel:
+    """
+    Memory-maps file_path read-only and loads the model from it.
+    """
+    try:
+        with open(file_path, "rb") as file_obj:
+            data = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        return load_model_artifact(data)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def convert_pickle_to_model_artifact(pickle_file_path: str, artifact_file_path: str) -> None:
+    """
+    Converts a dill/pickle MyModel file (as written by save_object) to the artifact format
+    and checks that the converted model predicts exactly like the original.
+    """
+    try:
+        from src.utils.main_utils import load_object
+
+        model = load_object(pickle_file_path)
+        save_model_artifact(artifact_file_path, model,
+                            metadata={"source": os.path.basename(pickle_file_path)})
+
+        converted = load_model_artifact_file(artifact_file_path)
+        input_columns = converted.feature_builder.input_columns
+        sample = pd.DataFrame(np.random.RandomState(0).normal(size=(256, len(input_columns))), columns=input_columns)
+        expected = model.trained_model_object.predict_proba(model.preprocessing_object.transform(sample))
+        if not np.array_equal(converted.predict_proba(sample), expected):
+            raise ValueError("Converted model does not reproduce the original predictions")
+        logger.info(f"Converted {pickle_file_path} to {artifact_file_path}")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a pickled MyModel to the memory-mappable artifact format")
+    parser.add_argument("pickle_file_path")
+    parser.add_argument("artifact_file_path", nargs="?")
+    args = parser.parse_args()
+    convert_pickle_to_model_artifact(
+        args.pickle_file_path,
+        args.artifact_file_path or os.path.splitext(args.pickle_file_path)[0] + MODEL_ARTIFACT_EXTENSION)
@@ -0,0 +1,122 @@
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from src.core.config import settings
+from src.entity.estimator import MyModel
+from src.entity.s3_estimator import Proj1Estimator
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedModel:
+    bucket_name: str
+    model_path: str
+    version: Optional[str]
+    model: MyModel
+    loaded_at: float
+    load_seconds: float
+
+    @property
+    def cache_key(self) -> Tuple[str, str, Optional[str]]:
+        return (self.bucket_name, self.model_path, self.version)
+
+
+class ModelCache:
+    """
+    Process-wide, thread-safe cache of production models keyed by (bucket, key, object version).
+
+    A model is downloaded and unpickled once per process and then shared by every request.
+    Lookups of an already loaded model never touch S3; a new version is only picked up
+    through an explicit reload() or invalidate().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._entries: Dict[Tuple[str, str], CachedModel] = {}
+
+    def _get_load_lock(self, bucket_name: str, model_path: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault((bucket_name, model_path), threading.Lock())
+
+    def _load(self, bucket_name: str, model_path: str) -> CachedModel:
+        logger.info(f"Loading model s3://{bucket_name}/{model_path} into the model cache")
+        estimator = Proj1Estimator(bucket_name=bucket_name, model_path=model_path)
+        start = time.perf_counter()
+        model, version = estimator.load_model_with_version()
+        if settings.MODEL_COMPILED_INFERENCE:
+            model.compile()
+        load_seconds = time.perf_counter() - start
+        metrics.observe("vehicle_model_load_duration_seconds", load_seconds)
+        metrics.inc("vehicle_model_loads_total")
+        logger.info(f"Cached model version {version} loaded in {load_seconds:.3f}s")
+        return CachedModel(bucket_name=bucket_name, model_path=model_path, version=version,
+                           model=model, loaded_at=time.time(), load_seconds=load_seconds)
+
+    def get_entry(self, bucket_name: str, model_path: str, version: Optional[str] = None) -> CachedModel:
+        """
+        Returns the cached model for bucket/model_path, loading it on first use.
+        If version is given and differs from the cached one, the model is reloaded.
+        """
+        try:
+            entry = self._entries.get((bucket_name, model_path))
+            if entry is not None and (version is None or entry.version == version):
+                return entry
+
+            with self._get_load_lock(bucket_name, model_path):
+                # Another thread may have finished loading while we waited for the lock
+                entry = self._entries.get((bucket_name, model_path))
+                if entry is None or (version is not None and entry.version != version):
+                    entry = self._load(bucket_name, model_path)
+                    with self._lock:
+                        self._entries[(bucket_name, model_path)] = entry
+                return entry
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_model(self, bucket_name: str, model_path: str) -> MyModel:
+        return self.get_entry(bucket_name=bucket_name, model_path=model_path).model
+
+    def peek(self, bucket_name: str, model_path: str) -> Optional[CachedModel]:
+        """Returns the cached entry without loading anything."""
+        return self._entries.get((bucket_name, model_path))
+
+    def reload(self, bucket_name: str, model_path: str,
+               validator: Optional[Callable[[MyModel], None]] = None) -> CachedModel:
+        """
+        Downloads the current model and swaps it into the cache.
+
+        The previous model keeps serving until the new one is fully loaded and, if a
+        validator is given, has passed it. A validator signals failure by raising.
+        """
+        try:
+            with self._get_load_lock(bucket_name, model_path):
+                entry = self._load(bucket_name, model_path)
+                if validator is not None:
+                    validator(entry.model)
+                with self._lock:
+                    self._entries[(bucket_name, model_path)] = entry
+                return entry
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def invalidate(self, bucket_name: Optional[str] = None, model_path: Optional[str] = None) -> None:
+        """
+        Drops cached models. Without arguments the whole cache is cleared, otherwise only
+        entries matching the given bucket and/or model path.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if (bucket_name is None or key[0] == bucket_name) and (model_path is None or key[1] == model_path):
+                    del self._entries[key]
+        logger.info(f"Model cache invalidated for bucket={bucket_name} model_path={model_path}")
+
+
+model_cache = ModelCache()
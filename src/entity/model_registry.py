@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from src.cloud_storage.storage_backend import StorageBackend, get_storage_backend
+from src.core.config import settings
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Registry layout under the registry prefix (settings.MODEL_PUSHER_S3_KEY):
+#   versions/<version>/<model file name>   immutable model, never overwritten
+#   versions/<version>/metrics.json        evaluation metrics recorded when it was pushed
+#   current.json                           pointer naming the served version
+# Promote and rollback only rewrite current.json, a single small PUT (atomic on S3 and,
+# through rename, on the local backend).
+POINTER_FILE_NAME = "current.json"
+METRICS_FILE_NAME = "metrics.json"
+VERSIONS_DIR_NAME = "versions"
+
+
+@dataclass
+class RegistryPointer:
+    version: str
+    model_key: str
+    promoted_at: float
+    # Versions served before this one, most recent last; rollback walks back through them
+    history: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RegisteredModel:
+    version: str
+    model_key: str
+    metrics: dict
+
+
+class ModelRegistry:
+    """
+    Versioned model registry on a storage backend: every pushed model gets an immutable
+    versioned key next to its metrics, and a pointer object names the version in production.
+    """
+
+    def __init__(self, bucket_name: str = settings.MODEL_BUCKET_NAME,
+                 registry_prefix: str = settings.MODEL_PUSHER_S3_KEY,
+                 storage: Optional[StorageBackend] = None):
+        """
+        :param bucket_name: Bucket holding the registry
+        :param registry_prefix: Key prefix of the registry inside the bucket
+        :param storage: Storage backend; defaults to the one selected by settings.STORAGE_BACKEND
+        """
+        self.bucket_name = bucket_name
+        self.registry_prefix = registry_prefix.strip("/")
+        self.storage = storage if storage is not None else get_storage_backend()
+
+    @property
+    def pointer_key(self) -> str:
+        return f"{self.registry_prefix}/{POINTER_FILE_NAME}"
+
+    def _version_prefix(self, version: str) -> str:
+        return f"{self.registry_prefix}/{VERSIONS_DIR_NAME}/{version}/"
+
+    @staticmethod
+    def _new_version(model_file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(model_file_path, "rb") as model_file:
+            for chunk in iter(lambda: model_file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        # Sorts by push time; the content hash keeps two pushes in the same second apart
+        return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{digest.hexdigest()[:12]}"
+
+    def current(self) -> Optional[RegistryPointer]:
+        """
+        Returns the pointer to the version in production, or None if nothing was promoted yet.
+        """
+        try:
+            # A single GET; serving resolves the pointer on every refresh check
+            data = self.storage.get(self.bucket_name, self.pointer_key, missing_ok=True)
+            if data is None:
+                return None
+            return RegistryPointer(**json.loads(data))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def register(self, model_file_path: str, metrics: Optional[dict] = None) -> RegisteredModel:
+        """
+        Uploads a model under a new immutable version together with its metrics.
+        The model is not served until the version is promoted.
+
+        :param model_file_path: Local model file (pickle or .vmodel artifact)
+        :param metrics: JSON-serializable evaluation metrics stored next to the model
+        """
+        try:
+            version = self._new_version(model_file_path)
+            model_key = self._version_prefix(version) + os.path.basename(model_file_path)
+            if self.storage.exists(self.bucket_name, model_key):
+                raise ValueError(f"Model version {version} is already registered")
+            record = dict(metrics or {}, version=version, registered_at=time.time(),
+                          source_file=os.path.basename(model_file_path))
+            self.storage.put(self.bucket_name, model_key, model_file_path)
+            self.storage.put_bytes(self.bucket_name, self._version_prefix(version) + METRICS_FILE_NAME,
+                                   json.dumps(record, indent=2, default=str).encode("utf-8"))
+            logger.info(f"Registered model version {version} at {model_key}")
+            return RegisteredModel(version=version, model_key=model_key, metrics=record)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def migrate_legacy_model(self, legacy_key: str = settings.MODEL_FILE_NAME) -> Optional[RegistryPointer]:
+        """
+        Registers and promotes the model stored at the pre-registry key, so a bucket that
+        switches to the registry keeps its production model as the first version (and as the
+        rollback target of the next push). Does nothing once a version has been promoted or
+        when there is no legacy model. The legacy object itself is left in place.
+
+        :param legacy_key: Key the model was pushed to before the registry existed
+        """
+        try:
+            if self.current() is not None or not self.storage.exists(self.bucket_name, legacy_key):
+                return None
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                model_file_path = os.path.join(tmp_dir, os.path.basename(legacy_key))
+                self.storage.get_to_file(self.bucket_name, legacy_key, model_file_path)
+                registered = self.register(model_file_path, metrics={"migrated_from": legacy_key})
+            logger.info(f"Migrated {legacy_key} into the registry as version {registered.version}")
+            return self.promote(registered.version)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_version(self, version: str) -> RegisteredModel:
+        """
+        Returns the model key and metrics of a registered version; raises if it does not exist.
+        """
+        try:
+            prefix = self._version_prefix(version)
+            keys = self.storage.list(self.bucket_name, prefix)
+            model_keys = [key for key in keys if not key.endswith("/" + METRICS_FILE_NAME)]
+            if not model_keys:
+                raise ValueError(f"Model version {version} is not registered")
+            metrics = {}
+            if prefix + METRICS_FILE_NAME in keys:
+                metrics = json.loads(self.storage.get(self.bucket_name, prefix + METRICS_FILE_NAME))
+            return RegisteredModel(version=version, model_key=model_keys[0], metrics=metrics)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def list_versions(self) -> List[str]:
+        """
+        Returns all registered versions, oldest first.
+        """
+        try:
+            prefix = f"{self.registry_prefix}/{VERSIONS_DIR_NAME}/"
+            return sorted({key[len(prefix):].split("/", 1)[0] for key in self.storage.list(self.bucket_name, prefix)})
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _write_pointer(self, pointer: RegistryPointer) -> None:
+        self.storage.put_bytes(self.bucket_name, self.pointer_key, json.dumps(asdict(pointer)).encode("utf-8"))
+
+    def promote(self, version: str) -> RegistryPointer:
+        """
+        Points production at a registered version. Nothing is uploaded but the pointer.
+        """
+        try:
+            registered = self.get_version(version)
+            current = self.current()
+            history = list(current.history) if current is not None else []
+            if current is not None and current.version != version:
+                history.append(current.version)
+            pointer = RegistryPointer(version=version, model_key=registered.model_key, promoted_at=time.time(),
+                                      history=history[-settings.MODEL_REGISTRY_HISTORY_SIZE:])
+            self._write_pointer(pointer)
+            logger.info(f"Promoted model version {version}")
+            return pointer
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def rollback(self, steps: int = 1) -> RegistryPointer:
+        """
+        Points production back at the version served steps promotions ago.
+        """
+        try:
+            current = self.current()
+            if current is None or len(current.history) < steps:
+                raise ValueError(f"Cannot roll back {steps} version(s): not enough promotion history")
+            version = current.history[-steps]
+            registered = self.get_version(version)
+            pointer = RegistryPointer(version=version, model_key=registered.model_key, promoted_at=time.time(),
+                                      history=current.history[:-steps])
+            self._write_pointer(pointer)
+            logger.info(f"Rolled back from model version {current.version} to {version}")
+            return pointer
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and switch the production model version")
+    parser.add_argument("--bucket", default=settings.MODEL_BUCKET_NAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List registered versions")
+    subparsers.add_parser("current", help="Show the version in production")
+    promote_parser = subparsers.add_parser("promote", help="Serve a registered version")
+    promote_parser.add_argument("version")
+    rollback_parser = subparsers.add_parser("rollback", help="Serve the previously promoted version")
+    rollback_parser.add_argument("--steps", type=int, default=1)
+    migrate_parser = subparsers.add_parser("migrate", help="Register and promote the pre-registry model")
+    migrate_parser.add_argument("--legacy-key", default=settings.MODEL_FILE_NAME)
+    args = parser.parse_args()
+
+    registry = ModelRegistry(bucket_name=args.bucket)
+    if args.command == "list":
+        current = registry.current()
+        for registered_version in registry.list_versions():
+            marker = "*" if current is not None and current.version == registered_version else " "
+            print(f"{marker} {registered_version}")
+    elif args.command == "current":
+        pointer = registry.current()
+        print(json.dumps(asdict(pointer) if pointer is not None else None, indent=2))
+    elif args.command == "promote":
+        print(registry.promote(args.version))
+    elif args.command == "migrate":
+        print(registry.migrate_legacy_model(args.legacy_key))
+    else:
+        print(registry.rollback(args.steps))
@@ -1,29 +1,58 @@
-from src.cloud_storage.aws_storage import SimpleStorageService
+from src.cloud_storage.storage_backend import StorageBackend, get_storage_backend
+from src.core.config import settings
+from src.entity.model_registry import ModelRegistry
 from src.utils.exception import MyException
+from src.utils.logger import get_logger
 from src.entity.estimator import MyModel
+import os
 import sys
+from typing import Optional, Tuple
 from pandas import DataFrame
 
+logger = get_logger(__name__)
+
 
 class Proj1Estimator:
     """
-    This class is used to save and retrieve our model from s3 bucket and to do prediction
+    This class is used to save and retrieve our model from the model storage (S3 or a local directory, see
+    settings.STORAGE_BACKEND) and to do prediction.
+    A model_path equal to settings.MODEL_PUSHER_S3_KEY is the versioned model registry: the model is resolved
+    through its pointer, and saving registers and promotes a new version.
     """
 
-    def __init__(self,bucket_name,model_path,):
+    def __init__(self,bucket_name,model_path,storage:StorageBackend=None):
         """
         :param bucket_name: Name of your model bucket
-        :param model_path: Location of your model in bucket
+        :param model_path: Location of your model in bucket, or the registry prefix
+        :param storage: Storage backend; defaults to the one selected by settings.STORAGE_BACKEND
         """
         self.bucket_name = bucket_name
-        self.s3 = SimpleStorageService()
+        self.storage = storage if storage is not None else get_storage_backend()
         self.model_path = model_path
+        self.registry: Optional[ModelRegistry] = None
+        if model_path.strip("/") == settings.MODEL_PUSHER_S3_KEY.strip("/"):
+            self.registry = ModelRegistry(bucket_name=bucket_name, registry_prefix=model_path, storage=self.storage)
         self.loaded_model:MyModel=None
 
+    def _resolve(self) -> Tuple[str, Optional[str]]:
+        """
+        Returns (key of the model to load, registry version or None).
+        A registry without a promoted version falls back to the pre-registry MODEL_FILE_NAME key.
+        """
+        if self.registry is None:
+            return self.model_path, None
+        pointer = self.registry.current()
+        if pointer is None:
+            logger.warning(f"No model promoted in registry {self.model_path}; using {settings.MODEL_FILE_NAME}")
+            return settings.MODEL_FILE_NAME, None
+        return pointer.model_key, pointer.version
 
     def is_model_present(self,model_path):
         try:
-            return self.s3.s3_key_path_available(bucket_name=self.bucket_name, s3_key=model_path)
+            if self.registry is not None and model_path == self.model_path:
+                return self.registry.current() is not None or self.storage.exists(
+                    bucket_name=self.bucket_name, key=settings.MODEL_FILE_NAME)
+            return self.storage.exists(bucket_name=self.bucket_name, key=model_path)
         except MyException as e:
             print(e)
             return False
@@ -34,21 +63,53 @@ class Proj1Estimator:
         :return:
         """
 
-        return self.s3.load_model(self.model_path,bucket_name=self.bucket_name)
+        return self.load_model_with_version()[0]
+
+    def load_model_with_version(self,)->Tuple[MyModel,Optional[str]]:
+        """
+        Load the model from the model_path together with the version of the loaded content
+        (the registry version when model_path is the registry)
+        :return:
+        """
+        try:
+            model_key, registry_version = self._resolve()
+            model, content_version = self.storage.load_model(bucket_name=self.bucket_name, key=model_key)
+            return model, registry_version or content_version
+        except Exception as e:
+            raise MyException(e, sys) from e
 
-    def save_model(self,from_file,remove:bool=False)->None:
+    def get_model_version(self,)->str:
+        """
+        Version identifier of the model currently served from model_path: the registry version,
+        else the object's VersionId or ETag
+        :return:
+        """
+        try:
+            model_key, registry_version = self._resolve()
+            return registry_version or self.storage.stat(bucket_name=self.bucket_name, key=model_key).version
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def save_model(self,from_file,remove:bool=False,metrics:Optional[dict]=None)->Optional[str]:
         """
         Save the model to the model_path
         :param from_file: Your local system model path
         :param remove: By default it is false that mean you will have your model locally available in your system folder
-        :return:
+        :param metrics: Evaluation metrics stored next to the model in the registry
+        :return: The new registry version, or None outside the registry
         """
         try:
-            self.s3.upload_file(from_file,
-                                to_filename=self.model_path,
-                                bucket_name=self.bucket_name,
-                                remove=remove
-                                )
+            version = None
+            if self.registry is not None:
+                # The first push to a bucket that predates the registry keeps the old model as a rollback target
+                self.registry.migrate_legacy_model(settings.MODEL_FILE_NAME)
+                version = self.registry.register(from_file, metrics=metrics).version
+                self.registry.promote(version)
+            else:
+                self.storage.put(bucket_name=self.bucket_name, key=self.model_path, from_filename=from_file)
+            if remove:
+                os.remove(from_file)
+            return version
         except Exception as e:
             raise MyException(e, sys)
 
@@ -63,4 +124,4 @@ class Proj1Estimator:
                 self.loaded_model = self.load_model()
             return self.loaded_model.predict(dataframe=dataframe)
         except Exception as e:
-            raise MyException(e, sys)
\ No newline at end of file
+            raise MyException(e, sys)
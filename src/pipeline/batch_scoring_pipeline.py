@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from src.configuration.mongo_db_connection import MongoDBClient
+from src.entity.artifact_entity import BatchScoringArtifact
+from src.entity.config_entity import BatchScoringConfig, VehiclePredictorConfig
+from src.entity.model_cache import model_cache
+from src.pipeline.prediction_pipeline import VEHICLE_FEATURE_COLUMNS, VehicleDataClassifier
+from src.utils.exception import MyException
+from src.utils.feature_engineering import engineer_raw_features
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Raw document fields the model features are engineered from
+SCORING_PROJECTION = {"Gender": 1, "Age": 1, "Driving_License": 1, "Region_Code": 1, "Previously_Insured": 1,
+                      "Vehicle_Age": 1, "Vehicle_Damage": 1, "Annual_Premium": 1, "Policy_Sales_Channel": 1,
+                      "Vintage": 1}
+
+
+def _load_worker_model() -> None:
+    # Process pool initializer: every worker loads the production model once into its own cache
+    VehicleDataClassifier().load_model()
+
+
+def _score_documents(documents: pd.DataFrame) -> Tuple[np.ndarray, str]:
+    """
+    Scores one chunk of raw documents in a worker process.
+    Returns the predictions and the version of the model that produced them.
+    """
+    predictor_config = VehiclePredictorConfig()
+    cached_model = model_cache.get_entry(bucket_name=predictor_config.model_bucket_name,
+                                         model_path=predictor_config.model_file_path)
+    features = engineer_raw_features(documents.replace({"na": np.nan}), feature_columns=VEHICLE_FEATURE_COLUMNS)
+    return cached_model.model.predict(features), cached_model.version
+
+
+# Marks the end of a stream passed between threads
+_END = object()
+
+
+def _put(buffer: queue.Queue, item, stop: threading.Event) -> bool:
+    # Blocks while the buffer is full, but gives up once the consumer has stopped
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_ahead(chunks: Iterator[pd.DataFrame], depth: int) -> Iterator[pd.DataFrame]:
+    """
+    Iterates chunks on a background thread that keeps up to depth chunks buffered, so the
+    next cursor batches are fetched while the current ones are being scored and written.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for chunk in chunks:
+                if not _put(buffer, chunk, stop):
+                    return
+            _put(buffer, _END, stop)
+        except BaseException as e:
+            _put(buffer, e, stop)
+
+    reader = threading.Thread(target=produce, name="batch-scoring-reader", daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        reader.join()
+        chunks.close()
+
+
+class MongoBatchScoringPipeline:
+    """
+    Offline job that scores every document of the collection and writes the prediction back.
+
+    Documents are read through one batched cursor in _id order on a reader thread, chunks are
+    scored in a process pool, and results are written back with unordered bulk_write calls on
+    a writer thread; bounded queues between the three keep the reads, scoring and writes
+    overlapping without buffering the collection. After each chunk is written, its last _id is
+    checkpointed, so an interrupted run resumes where it stopped. The checkpoint is removed
+    once a pass completes, so the next run scores the whole collection again (e.g. with a
+    newly pushed model).
+    """
+
+    def __init__(self, batch_scoring_config: BatchScoringConfig = BatchScoringConfig()):
+        """
+        :param batch_scoring_config: Configuration for batch scoring
+        """
+        try:
+            self.batch_scoring_config = batch_scoring_config
+            self.mongodb_client = MongoDBClient()
+            self.collection = self.mongodb_client.database[batch_scoring_config.collection_name]
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def read_checkpoint(self) -> Optional[ObjectId]:
+        checkpoint_file_path = self.batch_scoring_config.checkpoint_file_path
+        if not os.path.exists(checkpoint_file_path):
+            return None
+        with open(checkpoint_file_path) as checkpoint_file:
+            return ObjectId(json.load(checkpoint_file)["last_processed_id"])
+
+    def write_checkpoint(self, last_processed_id: ObjectId, model_version: str) -> None:
+        checkpoint_file_path = self.batch_scoring_config.checkpoint_file_path
+        os.makedirs(os.path.dirname(checkpoint_file_path), exist_ok=True)
+        tmp_file_path = checkpoint_file_path + ".tmp"
+        with open(tmp_file_path, "w") as checkpoint_file:
+            json.dump({"last_processed_id": str(last_processed_id), "model_version": model_version}, checkpoint_file)
+        os.replace(tmp_file_path, checkpoint_file_path)
+
+    def clear_checkpoint(self) -> None:
+        if os.path.exists(self.batch_scoring_config.checkpoint_file_path):
+            os.remove(self.batch_scoring_config.checkpoint_file_path)
+
+    def _iter_chunks(self, after_id: Optional[ObjectId]):
+        query = {"_id": {"$gt": after_id}} if after_id is not None else {}
+        cursor = self.collection.find(query, projection=SCORING_PROJECTION, sort=[("_id", 1)],
+                                      batch_size=self.batch_scoring_config.batch_size)
+        while True:
+            documents = list(islice(cursor, self.batch_scoring_config.batch_size))
+            if not documents:
+                return
+            yield pd.DataFrame(documents)
+
+    def _write_back(self, ids: pd.Series, predictions: np.ndarray, model_version: str) -> None:
+        operations = [UpdateOne({"_id": _id}, {"$set": {"prediction": int(prediction), "model_version": model_version}})
+                      for _id, prediction in zip(ids, predictions)]
+        self.collection.bulk_write(operations, ordered=False)
+
+    def _write_behind(self, results: queue.Queue, stop: threading.Event, progress: dict) -> None:
+        # Writer thread: write-back and checkpoint in read order, so the checkpoint only ever
+        # covers finished chunks
+        try:
+            while True:
+                item = results.get()
+                if item is _END:
+                    return
+                ids, predictions, model_version = item
+                self._write_back(ids, predictions, model_version)
+                self.write_checkpoint(ids.iloc[-1], model_version)
+                progress["documents_scored"] += len(ids)
+                progress["last_id"], progress["model_version"] = ids.iloc[-1], model_version
+                elapsed = time.perf_counter() - progress["start"]
+                logger.info(f"Scored {progress['documents_scored']} documents "
+                            f"({progress['documents_scored'] / elapsed:.0f} docs/sec)")
+        except BaseException as e:
+            progress["error"] = e
+            stop.set()
+
+    def run(self, resume: bool = True) -> BatchScoringArtifact:
+        """
+        Method Name :   run
+        Description :   Scores the collection (from the last checkpoint when resume is True)
+                        and removes the checkpoint once every document has been scored
+
+        Output      :   Returns the batch scoring artifact
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            logger.info("Entered the run method of MongoBatchScoringPipeline class")
+            start = time.perf_counter()
+            after_id = self.read_checkpoint() if resume else None
+            if after_id is not None:
+                logger.info(f"Resuming batch scoring after _id {after_id}")
+
+            workers = self.batch_scoring_config.workers
+            queue_depth = self.batch_scoring_config.queue_depth
+            progress = {"documents_scored": 0, "last_id": after_id, "model_version": "", "start": start, "error": None}
+            results: queue.Queue = queue.Queue(maxsize=queue_depth)
+            stop = threading.Event()
+            writer = threading.Thread(target=self._write_behind, args=(results, stop, progress),
+                                      name="batch-scoring-writer", daemon=True)
+            writer.start()
+            in_flight = deque()
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_load_worker_model) as executor:
+                    chunks = _read_ahead(self._iter_chunks(after_id), queue_depth)
+                    try:
+                        while not stop.is_set():
+                            # Keep every worker busy with one chunk queued behind it
+                            while len(in_flight) < 2 * workers:
+                                chunk = next(chunks, None)
+                                if chunk is None:
+                                    break
+                                ids = chunk.pop("_id")
+                                in_flight.append((ids, executor.submit(_score_documents, chunk)))
+                            if not in_flight:
+                                break
+
+                            # Results go to the writer in read order; put blocks while it is queue_depth behind
+                            ids, future = in_flight.popleft()
+                            predictions, model_version = future.result()
+                            _put(results, (ids, predictions, model_version), stop)
+                    finally:
+                        chunks.close()
+                        for _, future in in_flight:
+                            future.cancel()
+            finally:
+                _put(results, _END, stop)
+                writer.join()
+            if progress["error"] is not None:
+                raise progress["error"]
+
+            # A completed pass starts over from the first document next time
+            self.clear_checkpoint()
+            last_id = progress["last_id"]
+            artifact = BatchScoringArtifact(documents_scored=progress["documents_scored"],
+                                            last_processed_id=str(last_id) if last_id is not None else "",
+                                            model_version=progress["model_version"],
+                                            elapsed_seconds=time.perf_counter() - start)
+            logger.info(f"Batch scoring artifact: {artifact}")
+            return artifact
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score every document of the collection and write the predictions back")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore the checkpoint of an interrupted run and score from the first document")
+    args = parser.parse_args()
+    MongoBatchScoringPipeline().run(resume=not args.no_resume)
@@ -0,0 +1,73 @@
+import sys
+from typing import BinaryIO, Iterator, Optional
+
+import pandas as pd
+from pandas import DataFrame
+
+from src.core.config import settings
+from src.pipeline.prediction_pipeline import VEHICLE_FEATURE_COLUMNS, VehicleDataClassifier
+from src.utils.exception import MyException
+from src.utils.feature_engineering import engineer_raw_features
+from src.utils.logger import get_logger
+from src.utils.main_utils import read_yaml_file
+
+logger = get_logger(__name__)
+
+
+class CsvScoringPipeline:
+    """
+    Scores CSV files with the raw config/schema.yaml layout in fixed-size chunks, so memory
+    use depends on the chunk size rather than on the size of the file.
+    """
+
+    def __init__(self, classifier: Optional[VehicleDataClassifier] = None,
+                 chunk_rows: int = settings.CSV_SCORING_CHUNK_ROWS):
+        """
+        :param classifier: Classifier used to score each chunk
+        :param chunk_rows: Number of CSV rows parsed and scored at a time
+        """
+        try:
+            self.classifier = classifier or VehicleDataClassifier()
+            self.chunk_rows = chunk_rows
+            self._schema_config = read_yaml_file(file_path=settings.SCHEMA_FILE_PATH)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    @property
+    def id_column(self) -> str:
+        return self._schema_config["drop_columns"]
+
+    @property
+    def required_columns(self) -> list:
+        # Every raw column except the id and the target has to be present to build the features
+        columns = [list(column.keys())[0] for column in self._schema_config["columns"]]
+        return [column for column in columns if column not in (self.id_column, settings.TARGET_COLUMN)]
+
+    def read_chunks(self, file_obj: BinaryIO) -> Iterator[DataFrame]:
+        """
+        Lazily parses the CSV in chunks of chunk_rows rows.
+        """
+        try:
+            return iter(pd.read_csv(file_obj, chunksize=self.chunk_rows))
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def validate_columns(self, chunk: DataFrame) -> None:
+        missing_columns = [column for column in self.required_columns if column not in chunk.columns]
+        if missing_columns:
+            raise Exception(f"Uploaded CSV is missing columns: {missing_columns}")
+
+    def score_chunk(self, chunk: DataFrame) -> DataFrame:
+        """
+        Applies the DataTransformation feature engineering to a raw chunk and scores it.
+        Returns the id column (when present) and the prediction of every row.
+        """
+        try:
+            features = engineer_raw_features(chunk, feature_columns=VEHICLE_FEATURE_COLUMNS)
+            scored = DataFrame(index=chunk.index)
+            if self.id_column in chunk.columns:
+                scored[self.id_column] = chunk[self.id_column]
+            scored["prediction"] = self.classifier.predict(dataframe=features)
+            return scored
+        except Exception as e:
+            raise MyException(e, sys) from e
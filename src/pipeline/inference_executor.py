@@ -0,0 +1,54 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.core.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class InferenceExecutor:
+    """
+    Bounded pool that runs CPU-bound model loading and prediction off the event loop.
+
+    kind="thread" uses a ThreadPoolExecutor sharing the process-wide model cache.
+    kind="process" uses a ProcessPoolExecutor; every worker process keeps its own model
+    cache, so callables and their arguments must be picklable (VehicleDataClassifier
+    bound methods and DataFrames are).
+    """
+
+    def __init__(self, kind: str = settings.INFERENCE_EXECUTOR,
+                 max_workers: Optional[int] = settings.INFERENCE_MAX_WORKERS,
+                 initializer: Optional[Callable] = None, initargs: tuple = ()):
+        """
+        :param kind: "thread" or "process"
+        :param max_workers: Pool size; defaults to the number of CPUs when not set
+        :param initializer: Optional callable run once in every process worker
+        :param initargs: Arguments passed to initializer
+        """
+        self.kind = kind.lower()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if self.kind == "thread":
+            self._executor: Executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                          thread_name_prefix="inference")
+        elif self.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 initializer=initializer, initargs=initargs)
+        else:
+            raise ValueError(f"Unknown inference executor kind '{kind}', expected 'thread' or 'process'")
+        logger.info(f"Inference executor started: kind={self.kind}, max_workers={self.max_workers}")
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) in the pool and awaits its result without blocking the loop.
+        """
+        if kwargs:
+            func = functools.partial(func, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Inference executor shut down")
@@ -0,0 +1,215 @@
+import asyncio
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.config import settings
+from src.pipeline.inference_executor import InferenceExecutor
+from src.pipeline.prediction_pipeline import VehicleData, VehicleDataClassifier
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+MICRO_BATCH_SIZE_METRIC = "vehicle_micro_batch_size"
+# Power-of-two size buckets up to the largest batch the settings allow
+metrics.describe(MICRO_BATCH_SIZE_METRIC, "Rows per micro-batch scored",
+                 buckets=[2 ** power
+                          for power in range(max(settings.PREDICTION_MICRO_BATCH_MAX_SIZE - 1, 1).bit_length() + 1)])
+
+
+class MicroBatchStats:
+    """
+    Counters for the batch sizes the micro-batcher actually achieved.
+    Batch sizes are bucketed by powers of two (1, 2, 4, ... max_batch_size).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches_total = 0
+        self.rows_total = 0
+        self.errors_total = 0
+        self.max_batch_size_seen = 0
+        self.batch_size_buckets: Dict[int, int] = {}
+
+    def record(self, batch_size: int, failed: bool = False) -> None:
+        bucket = 1
+        while bucket < batch_size:
+            bucket *= 2
+        with self._lock:
+            self.batches_total += 1
+            self.rows_total += batch_size
+            self.errors_total += int(failed)
+            self.max_batch_size_seen = max(self.max_batch_size_seen, batch_size)
+            self.batch_size_buckets[bucket] = self.batch_size_buckets.get(bucket, 0) + 1
+        metrics.observe(MICRO_BATCH_SIZE_METRIC, batch_size)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "batches_total": self.batches_total,
+                "rows_total": self.rows_total,
+                "errors_total": self.errors_total,
+                "mean_batch_size": self.rows_total / self.batches_total if self.batches_total else 0.0,
+                "max_batch_size_seen": self.max_batch_size_seen,
+                "batch_size_buckets": dict(sorted(self.batch_size_buckets.items())),
+            }
+
+
+class PredictionMicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into one vectorized model call.
+
+    Each request puts its row on an asyncio queue and awaits a future. A single worker task
+    drains the queue, flushing when max_batch_size rows are collected or max_wait_ms has
+    passed since the first row of the batch, scores the batch in one call and fans the
+    results back out to the waiting requests.
+
+    Up to max_in_flight batches are scored at once, so every worker of the executor can be
+    busy. While all of them are, rows keep queueing and the next batch grows instead.
+    """
+
+    def __init__(self, classifier: Optional[VehicleDataClassifier] = None,
+                 max_batch_size: int = settings.PREDICTION_MICRO_BATCH_MAX_SIZE,
+                 max_wait_ms: float = settings.PREDICTION_MICRO_BATCH_MAX_WAIT_MS,
+                 executor: Optional[InferenceExecutor] = None, max_in_flight: Optional[int] = None):
+        """
+        :param classifier: Classifier used to score the batches
+        :param max_batch_size: Flush as soon as this many rows are queued
+        :param max_wait_ms: Flush at the latest this many milliseconds after the first queued row
+        :param executor: Pool the batches are scored in; the loop's default executor if not given
+        :param max_in_flight: Batches scored concurrently; defaults to the executor's worker count
+        """
+        self.classifier = classifier or VehicleDataClassifier()
+        self.executor = executor
+        if max_in_flight is None:
+            max_in_flight = executor.max_workers if executor is not None else (
+                settings.INFERENCE_MAX_WORKERS or os.cpu_count() or 1)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self.stats = MicroBatchStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    @property
+    def queue_depth(self) -> int:
+        # Rows waiting to join a batch
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def batches_in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._worker = asyncio.create_task(self._run(), name="prediction-micro-batcher")
+        logger.info(f"Micro-batcher started: max_batch_size={self.max_batch_size}, "
+                    f"max_wait_ms={self.max_wait_seconds * 1000}, max_in_flight={self.max_in_flight}")
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        # Batches already handed to the executor, and the one being collected, finish and answer their requests
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        # Rows queued after the last batch was taken are failed rather than left waiting
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped before the row was scored"))
+        logger.info(f"Micro-batcher stopped: {self.stats.as_dict()}")
+
+    async def predict(self, vehicle_data: VehicleData):
+        """
+        Queues one row and waits for its prediction.
+        """
+        if self._worker is None:
+            raise RuntimeError("PredictionMicroBatcher.start() must be awaited before predict()")
+        record = vehicle_data.get_vehicle_data_as_record()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _collect_batch(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        # Fills the caller's list, so rows already taken off the queue are not lost on cancellation
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued before waiting on the clock
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _score(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        # Requests that gave up while queued are not scored
+        batch = [(record, future) for record, future in batch if not future.done()]
+        if not batch:
+            return
+        try:
+            records = [record for record, _ in batch]
+            if self.executor is not None:
+                predictions, timings = await self.executor.run(self.classifier.predict_records_timed, records)
+            else:
+                predictions, timings = await asyncio.get_running_loop().run_in_executor(
+                    None, self.classifier.predict_records_timed, records)
+            metrics.observe_stages(timings)
+        except Exception as e:
+            self.stats.record(len(batch), failed=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(MyException(e, sys))
+            return
+
+        self.stats.record(len(batch))
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+    async def _score_and_release(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        try:
+            await self._score(batch)
+        finally:
+            self._slots.release()
+
+    async def _run(self) -> None:
+        while True:
+            # Wait for a free slot before collecting, so rows arriving meanwhile join the next batch
+            await self._slots.acquire()
+            batch: List[Tuple[dict, asyncio.Future]] = []
+            try:
+                await self._collect_batch(batch)
+            except BaseException:
+                if not batch:
+                    self._slots.release()
+                    raise
+                # Stopped mid-collection: the rows already taken are still scored, and stop() waits for them
+                self._dispatch(batch)
+                raise
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        task = asyncio.create_task(self._score_and_release(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
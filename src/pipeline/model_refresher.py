@@ -0,0 +1,108 @@
+import sys
+import threading
+from typing import Optional
+
+from src.core.config import settings
+from src.entity.estimator import MyModel
+from src.entity.model_cache import ModelCache, model_cache
+from src.entity.s3_estimator import Proj1Estimator
+from src.pipeline.prediction_pipeline import sample_vehicle_data
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ModelRefresher:
+    """
+    Background watcher that hot-swaps the served model when the object in S3 changes.
+
+    The watcher runs on its own daemon thread, so downloading and unpickling a new model
+    never happens on the event loop. Requests keep using the cached model until the new
+    one has been loaded and passed a smoke prediction, after which the cache entry is
+    replaced in a single assignment.
+    """
+
+    def __init__(self, bucket_name: str, model_path: str,
+                 interval_seconds: float = settings.MODEL_REFRESH_INTERVAL_SECONDS,
+                 cache: ModelCache = model_cache):
+        """
+        :param bucket_name: Name of the model bucket
+        :param model_path: Location of the model in the bucket
+        :param interval_seconds: Seconds to wait between two version checks
+        :param cache: Model cache whose entry is swapped on change
+        """
+        self.bucket_name = bucket_name
+        self.model_path = model_path
+        self.interval_seconds = interval_seconds
+        self.cache = cache
+        self._estimator = Proj1Estimator(bucket_name=bucket_name, model_path=model_path)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def smoke_test(model: MyModel) -> None:
+        """
+        Raises if the model cannot score a typical row.
+        """
+        dataframe = sample_vehicle_data().get_vehicle_input_data_frame()
+        predictions = model.predict(dataframe)
+        if len(predictions) != 1 or predictions[0] not in (0, 1):
+            raise Exception(f"Smoke prediction returned unexpected output: {predictions}")
+
+    def check_once(self) -> bool:
+        """
+        Compares the version in S3 with the cached one and reloads on change.
+        Returns True if a new model was swapped in.
+        """
+        try:
+            version = self._estimator.get_model_version()
+            current = self.cache.peek(bucket_name=self.bucket_name, model_path=self.model_path)
+            if current is not None and current.version == version:
+                return False
+
+            logger.info(f"Model version changed to {version}; refreshing the served model")
+            entry = self.cache.reload(bucket_name=self.bucket_name, model_path=self.model_path,
+                                      validator=self.smoke_test)
+            logger.info(f"Swapped in model version {entry.version}")
+            return True
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.check_once()
+            except Exception as e:
+                # Keep serving the current model and try again on the next tick
+                logger.error(f"Model refresh failed, keeping the current model: {e}")
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="model-refresher", daemon=True)
+        self._thread.start()
+        logger.info(f"Model refresher started with a {self.interval_seconds}s interval")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("Model refresher stopped")
+
+
+_process_refresher: Optional[ModelRefresher] = None
+
+
+def start_process_refresher(bucket_name: str, model_path: str, interval_seconds: float) -> None:
+    """
+    Starts one refresher for the current process. Used as the initializer of inference
+    worker processes, which each hold their own model cache.
+    """
+    global _process_refresher
+    if _process_refresher is None:
+        _process_refresher = ModelRefresher(bucket_name=bucket_name, model_path=model_path,
+                                            interval_seconds=interval_seconds)
+        _process_refresher.start()
@@ -0,0 +1,84 @@
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.core.config import settings
+from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.model_cache import model_cache
+from src.pipeline.model_refresher import start_process_refresher
+from src.pipeline.prediction_pipeline import VEHICLE_FEATURE_COLUMNS, build_vehicle_data_frame
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+def synthetic_vehicle_records(n_rows: int, seed: int = 0) -> List[dict]:
+    """
+    Builds n_rows plausible VehicleData records spanning the ranges seen in training,
+    so warm-up walks many different paths through the trees.
+    """
+    random_state = np.random.RandomState(seed)
+    vehicle_age = random_state.randint(0, 3, size=n_rows)
+    columns = {
+        "Gender": random_state.randint(0, 2, size=n_rows),
+        "Age": random_state.randint(20, 86, size=n_rows),
+        "Driving_License": np.ones(n_rows, dtype=int),
+        "Region_Code": random_state.randint(0, 53, size=n_rows).astype(float),
+        "Previously_Insured": random_state.randint(0, 2, size=n_rows),
+        "Annual_Premium": random_state.uniform(2630.0, 100000.0, size=n_rows).round(1),
+        "Policy_Sales_Channel": random_state.randint(1, 164, size=n_rows).astype(float),
+        "Vintage": random_state.randint(10, 300, size=n_rows),
+        "Vehicle_Age_lt_1_Year": (vehicle_age == 0).astype(int),
+        "Vehicle_Age_gt_2_Years": (vehicle_age == 2).astype(int),
+        "Vehicle_Damage_Yes": random_state.randint(0, 2, size=n_rows),
+    }
+    return [{column: columns[column][row].item() for column in VEHICLE_FEATURE_COLUMNS} for row in range(n_rows)]
+
+
+def warm_up_model(iterations: int = settings.MODEL_WARMUP_ITERATIONS,
+                  prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig()) -> Optional[str]:
+    """
+    Loads the production model into this process's model cache (through Proj1Estimator)
+    and runs warm-up predictions on synthetic rows through every serving path: single
+    records, DataFrame batches and probabilities. The model is called directly so the
+    synthetic rows never land in the prediction cache.
+    Returns the version of the warmed model.
+    """
+    try:
+        start = time.perf_counter()
+        cached_model = model_cache.get_entry(bucket_name=prediction_pipeline_config.model_bucket_name,
+                                             model_path=prediction_pipeline_config.model_file_path)
+        model = cached_model.model
+        records = synthetic_vehicle_records(n_rows=max(iterations, 1) + 64)
+        for record in records[:iterations]:
+            model.predict_records([record])
+        batch = build_vehicle_data_frame(records[-64:])
+        model.predict(batch)
+        model.predict_with_proba(batch)
+
+        elapsed = time.perf_counter() - start
+        metrics.set_gauge("vehicle_model_warmup_seconds", elapsed)
+        logger.info(f"Model version {cached_model.version} warmed up with {iterations} predictions in {elapsed:.3f}s")
+        return cached_model.version
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def initialize_inference_worker(bucket_name: str, model_path: str, refresh_interval_seconds: float) -> None:
+    """
+    Initializer of inference worker processes: each one preloads and warms its own model
+    copy before taking work, then starts its own refresher if refreshing is enabled.
+    """
+    if settings.MODEL_PRELOAD_ENABLED:
+        try:
+            warm_up_model(prediction_pipeline_config=VehiclePredictorConfig(model_file_path=model_path,
+                                                                            model_bucket_name=bucket_name))
+        except Exception as e:
+            # The worker still starts; its first request loads the model instead
+            logger.error(f"Inference worker warm-up failed: {e}")
+    if settings.MODEL_REFRESH_ENABLED:
+        start_process_refresher(bucket_name, model_path, refresh_interval_seconds)
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Mapping, Optional, Tuple
+
+from src.core.config import settings
+
+
+class PredictionCache:
+    """
+    Bounded, thread-safe LRU cache of predictions with an optional TTL.
+
+    Keys are the normalized feature tuple of a record, so "25", 25 and 25.0 hit the same
+    entry. Every lookup carries the version of the model that would answer it; when the
+    version changes the whole cache is dropped, so a hot-swapped model never serves
+    predictions made by its predecessor.
+    """
+
+    def __init__(self, max_size: int = settings.PREDICTION_CACHE_MAX_SIZE,
+                 ttl_seconds: float = settings.PREDICTION_CACHE_TTL_SECONDS):
+        """
+        :param max_size: Maximum number of cached predictions; least recently used are evicted first
+        :param ttl_seconds: Lifetime of an entry in seconds; 0 disables expiry
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[object, float]]" = OrderedDict()
+        self._model_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(record: Mapping, columns) -> Tuple[float, ...]:
+        return tuple(float(record[column]) for column in columns)
+
+    def _sync_version(self, model_version: Optional[str]) -> None:
+        # Caller holds the lock
+        if model_version != self._model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._model_version = model_version
+
+    def get(self, key: Hashable, model_version: Optional[str]):
+        """
+        Returns the cached prediction or None.
+        """
+        with self._lock:
+            self._sync_version(model_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if self.ttl_seconds and expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value, model_version: Optional[str]) -> None:
+        with self._lock:
+            self._sync_version(model_version)
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "model_version": self._model_version,
+            }
+
+
+prediction_cache = PredictionCache()
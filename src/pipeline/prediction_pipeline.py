@@ -1,9 +1,16 @@
 import sys
+import time
+import numpy as np
+from src.core.config import settings
 from src.entity.config_entity import VehiclePredictorConfig
-from src.entity.s3_estimator import Proj1Estimator
+from src.entity.model_cache import model_cache
+from src.pipeline.prediction_cache import PredictionCache, prediction_cache
 from src.utils.exception import MyException
+from src.utils.feature_engineering import VEHICLE_FEATURE_COLUMNS
 from src.utils.logger import get_logger
+from src.utils.metrics import metrics
 from pandas import DataFrame
+from typing import Dict, Mapping, Optional, Sequence, Tuple
 
 logging = get_logger(__name__)
 
@@ -47,13 +54,20 @@ class VehicleData:
         """
         try:
             
-            vehicle_input_dict = self.get_vehicle_data_as_dict()
-            return DataFrame(vehicle_input_dict)
+            with metrics.stage("dataframe_build"):
+                vehicle_input_dict = self.get_vehicle_data_as_dict()
+                return DataFrame(vehicle_input_dict)
         
         except Exception as e:
             raise MyException(e, sys) from e
 
 
+    def get_vehicle_data_as_record(self) -> dict:
+        """
+        This function returns the VehicleData fields as a flat dictionary of scalars
+        """
+        return {column: getattr(self, column) for column in VEHICLE_FEATURE_COLUMNS}
+
     def get_vehicle_data_as_dict(self):
         """
         This function returns a dictionary from VehicleData class input
@@ -82,6 +96,35 @@ class VehicleData:
         except Exception as e:
             raise MyException(e, sys) from e
 
+def build_vehicle_data_frame(records: Sequence[Mapping]) -> DataFrame:
+    """
+    Builds a single columnar DataFrame from many records carrying the VehicleData fields,
+    keeping the input order. One column list per feature avoids building a dict per row.
+    """
+    try:
+        with metrics.stage("dataframe_build"):
+            columns = {column: [record[column] for record in records] for column in VEHICLE_FEATURE_COLUMNS}
+            return DataFrame(columns, columns=list(VEHICLE_FEATURE_COLUMNS))
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+def sample_vehicle_data() -> VehicleData:
+    """
+    Returns a typical, fully populated VehicleData row.
+    Used to smoke-test a freshly loaded model before it starts serving.
+    """
+    return VehicleData(Gender=1,
+                       Age=35,
+                       Driving_License=1,
+                       Region_Code=28.0,
+                       Previously_Insured=0,
+                       Annual_Premium=30000.0,
+                       Policy_Sales_Channel=26.0,
+                       Vintage=150,
+                       Vehicle_Age_lt_1_Year=0,
+                       Vehicle_Age_gt_2_Years=0,
+                       Vehicle_Damage_Yes=1)
+
 class VehicleDataClassifier:
     def __init__(self,prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig(),) -> None:
         """
@@ -92,6 +135,18 @@ class VehicleDataClassifier:
         except Exception as e:
             raise MyException(e, sys)
 
+    def load_model(self) -> None:
+        """
+        Makes sure the production model is loaded into this process's model cache.
+        """
+        try:
+            model_cache.get_entry(
+                bucket_name=self.prediction_pipeline_config.model_bucket_name,
+                model_path=self.prediction_pipeline_config.model_file_path,
+            )
+        except Exception as e:
+            raise MyException(e, sys)
+
     def predict(self, dataframe) -> str:
         """
         This is the method of VehicleDataClassifier
@@ -99,7 +154,7 @@ class VehicleDataClassifier:
         """
         try:
             logging.info("Entered predict method of VehicleDataClassifier class")
-            model = Proj1Estimator(
+            model = model_cache.get_model(
                 bucket_name=self.prediction_pipeline_config.model_bucket_name,
                 model_path=self.prediction_pipeline_config.model_file_path,
             )
@@ -107,5 +162,66 @@ class VehicleDataClassifier:
             
             return result
         
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def predict_records(self, records, timings: Optional[Dict[str, float]] = None) -> list:
+        """
+        This is the method of VehicleDataClassifier
+        Returns: Predictions for records of raw VehicleData values, built without pandas
+
+        :param timings: When given, the seconds spent per stage ("prediction_cache_lookup",
+            "preprocessing_transform", "model_predict") are stored in it instead of being recorded here
+        """
+        try:
+            cached_model = model_cache.get_entry(
+                bucket_name=self.prediction_pipeline_config.model_bucket_name,
+                model_path=self.prediction_pipeline_config.model_file_path,
+            )
+            if not settings.PREDICTION_CACHE_ENABLED:
+                return cached_model.model.predict_records(records, timings=timings)
+
+            # Serve repeats from the prediction cache and score only the misses, in one call
+            start = time.perf_counter()
+            keys = [PredictionCache.make_key(record, VEHICLE_FEATURE_COLUMNS) for record in records]
+            results = [prediction_cache.get(key, cached_model.version) for key in keys]
+            missing = [index for index, result in enumerate(results) if result is None]
+            lookup_seconds = time.perf_counter() - start
+            if timings is None:
+                metrics.observe_stages({"prediction_cache_lookup": lookup_seconds})
+            else:
+                timings["prediction_cache_lookup"] = lookup_seconds
+            if missing:
+                predictions = cached_model.model.predict_records([records[index] for index in missing],
+                                                                 timings=timings)
+                for index, prediction in zip(missing, predictions):
+                    results[index] = prediction
+                    prediction_cache.put(keys[index], prediction, cached_model.version)
+            return np.asarray(results)
+
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def predict_records_timed(self, records) -> Tuple[list, Dict[str, float]]:
+        """
+        Same as predict_records, also returning the seconds spent per stage. Meant for the
+        inference pool: the caller records the stages, so they reach the serving metrics
+        from a process pool worker too.
+        """
+        timings: Dict[str, float] = {}
+        return self.predict_records(records, timings=timings), timings
+
+    def predict_with_proba(self, dataframe):
+        """
+        This is the method of VehicleDataClassifier
+        Returns: (predictions, class probabilities) computed in one vectorized model call
+        """
+        try:
+            model = model_cache.get_model(
+                bucket_name=self.prediction_pipeline_config.model_bucket_name,
+                model_path=self.prediction_pipeline_config.model_file_path,
+            )
+            return model.predict_with_proba(dataframe)
+
         except Exception as e:
             raise MyException(e, sys)
\ No newline at end of file
@@ -0,0 +1,165 @@
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+from src.core.config import settings
+from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.model_cache import model_cache
+from src.utils.exception import MyException
+from src.utils.logger import get_logger, stop_log_listener
+
+logger = get_logger(__name__)
+
+# A worker that dies sooner than this after being forked is restarted with a delay
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+
+
+def _reset_inherited_clients() -> None:
+    """
+    Drops the shared boto3 and MongoClient instances a worker inherited from the master.
+    Neither is fork-safe (the child would reuse the parent's pooled connections and lock
+    state), so each worker creates its own on first use. Modules that were never imported
+    are left alone, so a worker does not import boto3 or pymongo just to reset them.
+    """
+    aws_connection = sys.modules.get("src.configuration.aws_connection")
+    if aws_connection is not None:
+        aws_connection.S3Client.s3_client = aws_connection.S3Client.s3_resource = None
+    mongo_db_connection = sys.modules.get("src.configuration.mongo_db_connection")
+    if mongo_db_connection is not None:
+        mongo_db_connection.MongoDBClient.client = None
+
+
+class PreforkServer:
+    """
+    Pre-fork multi-worker server for the FastAPI app.
+
+    The master loads the production model once, moves the compiled tree arrays into a
+    read-only shared memory mapping and freezes the garbage collector, so the objects that
+    exist at fork time are never written by the children. It then binds the listening
+    socket and forks the workers, each running its own uvicorn server (and app lifespan)
+    on the shared socket. The workers find the model already in their inherited model
+    cache, so each one costs its own interpreter state rather than another copy of the
+    forest. A worker that exits is replaced until the master receives SIGTERM or SIGINT.
+
+    A model swapped in later by the refresher is loaded privately by each worker.
+    """
+
+    def __init__(self, app, workers: int = settings.SERVING_WORKERS, host: str = settings.APP_HOST,
+                 port: int = settings.APP_PORT,
+                 prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig()):
+        """
+        :param app: ASGI application served by every worker
+        :param workers: Number of worker processes to fork
+        :param host: Interface to listen on
+        :param port: Port to listen on
+        :param prediction_pipeline_config: Model the master preloads before forking
+        """
+        self.app = app
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.prediction_pipeline_config = prediction_pipeline_config
+        self._socket: Optional[socket.socket] = None
+        self._worker_pids: Dict[int, float] = {}
+        self._stopping = False
+
+    def preload(self) -> None:
+        """
+        Loads the model into the master's model cache and prepares it to be shared.
+        """
+        try:
+            cached_model = model_cache.get_entry(bucket_name=self.prediction_pipeline_config.model_bucket_name,
+                                                 model_path=self.prediction_pipeline_config.model_file_path)
+            compiled_model = getattr(cached_model.model, "compiled_model", None)
+            if compiled_model is not None:
+                compiled_model.share_memory()
+                logger.info(f"Compiled forest moved to shared memory ({compiled_model.nbytes} bytes)")
+
+            # Everything allocated so far is inherited by the workers; keeping it out of the
+            # collector's generations stops gc passes from dirtying (and copying) those pages
+            gc.collect()
+            gc.freeze()
+            logger.info(f"Model version {cached_model.version} preloaded in the master; "
+                        f"{gc.get_freeze_count()} objects frozen")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn_worker(self) -> int:
+        pid = os.fork()
+        if pid:
+            self._worker_pids[pid] = time.monotonic()
+            return pid
+
+        # Worker process: uvicorn installs its own SIGTERM/SIGINT handlers for graceful shutdown
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        _reset_inherited_clients()
+        exit_code = 0
+        try:
+            config = uvicorn.Config(self.app, host=self.host, port=self.port)
+            uvicorn.Server(config).run(sockets=[self._socket])
+        except BaseException as e:
+            logger.error(f"Serving worker {os.getpid()} crashed: {e}")
+            exit_code = 1
+        finally:
+            # os._exit skips atexit, so write out queued log records first
+            stop_log_listener()
+            os._exit(exit_code)
+
+    def _handle_stop(self, signum, frame) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info(f"Received signal {signum}; stopping {len(self._worker_pids)} serving workers")
+        for pid in list(self._worker_pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        """
+        Preloads the model, forks the workers and supervises them until shutdown.
+        Falls back to a single in-process uvicorn server for one worker or without fork().
+        """
+        if self.workers <= 1 or not hasattr(os, "fork"):
+            uvicorn.run(self.app, host=self.host, port=self.port)
+            return
+
+        self.preload()
+        self._socket = self._bind()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        for _ in range(self.workers):
+            self._spawn_worker()
+        logger.info(f"Serving on {self.host}:{self.port} with {self.workers} pre-forked workers")
+
+        try:
+            while self._worker_pids:
+                pid, status = os.wait()
+                started_at = self._worker_pids.pop(pid, None)
+                if self._stopping or started_at is None:
+                    continue
+                logger.warning(f"Serving worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; "
+                               f"starting a replacement")
+                if time.monotonic() - started_at < MIN_WORKER_LIFETIME_SECONDS:
+                    time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+                if not self._stopping:
+                    self._spawn_worker()
+        finally:
+            self._socket.close()
+            logger.info("All serving workers stopped")
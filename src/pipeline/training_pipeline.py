@@ -7,6 +7,7 @@ from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
 from src.components.model_evaluation import ModelEvaluation
 from src.components.model_pusher import ModelPusher
+from src.utils.artifact_writer import artifact_writer
 from src.entity.config_entity import (DataIngestionConfig,
                                           DataValidationConfig,
                                           DataTransformationConfig,
@@ -96,13 +97,15 @@ class TrainPipeline:
         
 
     def start_model_evaluation(self, data_ingestion_artifact: DataIngestionArtifact,
-                               model_trainer_artifact: ModelTrainerArtifact):
+                               model_trainer_artifact: ModelTrainerArtifact,
+                               data_transformation_artifact: DataTransformationArtifact = None):
         try:
             logger.info("Entered the start_model_evaluation method of TrainPipeline class")
             
             model_eval = ModelEvaluation(model_eval_config=self.model_evaluation_config,
                                           data_ingestion_artifact=data_ingestion_artifact,
-                                          model_trainer_artifact=model_trainer_artifact)
+                                          model_trainer_artifact=model_trainer_artifact,
+                                          data_transformation_artifact=data_transformation_artifact)
             model_eval_artifact = model_eval.initiate_model_evaluation()
             logger.info("Exited the start_model_evaluation method of TrainPipeline class")
             return model_eval_artifact
@@ -146,8 +149,12 @@ class TrainPipeline:
             
             logger.info('Starting model evaluation')
             model_eval_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact,
-                                                             model_trainer_artifact=model_trainer_artifact)
+                                                             model_trainer_artifact=model_trainer_artifact,
+                                                             data_transformation_artifact=data_transformation_artifact)
             logger.info(f'Model evaluation {model_eval_artifact}')
+
+            # Artifacts persisted in the background; the pusher uploads the trained model file
+            artifact_writer.wait()
             
             if model_eval_artifact.is_model_accepted:
                 logger.info('Starting model pusher')
@@ -158,4 +165,6 @@ class TrainPipeline:
                 raise Exception('Model not accepted')      
             
         except Exception as e:
+            # Keep whatever this run produced on disk for inspection
+            artifact_writer.wait(raise_errors=False)
             raise MyException(e, sys)
\ No newline at end of file
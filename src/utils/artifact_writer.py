@@ -0,0 +1,66 @@
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from src.core.config import settings
+from src.utils.exception import MyException
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ArtifactWriter:
+    """
+    Persists training artifacts (feature store, splits, arrays, model files) in the background.
+
+    With the in-memory handoff, each stage passes its live DataFrames and arrays to the next
+    one, so nothing downstream waits for the files. They are still written for auditability,
+    on worker threads, while later stages keep computing. Without the handoff, stages read the
+    files of the previous stage and writes run inline.
+    """
+
+    def __init__(self, asynchronous: bool = settings.TRAINING_IN_MEMORY_ARTIFACTS and settings.TRAINING_ASYNC_ARTIFACT_WRITES,
+                 workers: int = settings.TRAINING_ARTIFACT_WRITE_WORKERS):
+        """
+        :param asynchronous: Write on worker threads instead of inline
+        :param workers: Number of writer threads
+        """
+        self.asynchronous = asynchronous
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self, write: Callable, *args, **kwargs) -> None:
+        """
+        Runs write(*args, **kwargs), on a worker thread when asynchronous. The arguments must
+        not be modified afterwards; stages only ever derive new frames from their inputs.
+        """
+        if not self.asynchronous:
+            write(*args, **kwargs)
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="artifact-writer")
+            self._pending.append(self._executor.submit(write, *args, **kwargs))
+
+    def wait(self, raise_errors: bool = True) -> None:
+        """
+        Blocks until every submitted write has finished.
+
+        :param raise_errors: Raise the first failed write; when False, failures are only logged
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        first_error = None
+        for future in pending:
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Writing a training artifact failed: {error}")
+                first_error = first_error or error
+        if first_error is not None and raise_errors:
+            raise MyException(first_error, sys) from first_error
+
+
+artifact_writer = ArtifactWriter()
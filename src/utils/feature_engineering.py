@@ -0,0 +1,46 @@
+import sys
+from typing import Sequence
+
+import pandas as pd
+
+from src.utils.exception import MyException
+
+# Model input columns, in the order the preprocessing pipeline was fitted on
+VEHICLE_FEATURE_COLUMNS = ("Gender", "Age", "Driving_License", "Region_Code", "Previously_Insured",
+                           "Annual_Premium", "Policy_Sales_Channel", "Vintage",
+                           "Vehicle_Age_lt_1_Year", "Vehicle_Age_gt_2_Years", "Vehicle_Damage_Yes")
+
+GENDER_MAPPING = {'Female': 0, 'Male': 1}
+
+# Dummy columns of the categorical features, with the first category of each dropped
+DUMMY_COLUMNS = {
+    "Vehicle_Age_lt_1_Year": ("Vehicle_Age", "< 1 Year"),
+    "Vehicle_Age_gt_2_Years": ("Vehicle_Age", "> 2 Years"),
+    "Vehicle_Damage_Yes": ("Vehicle_Damage", "Yes"),
+}
+
+
+def engineer_raw_features(dataframe: pd.DataFrame,
+                          feature_columns: Sequence[str] = VEHICLE_FEATURE_COLUMNS) -> pd.DataFrame:
+    """
+    Applies the custom feature engineering (gender mapping, dummy columns, renaming) to raw rows
+    with the config/schema.yaml layout and returns feature_columns in order. Training, evaluation
+    and scoring all go through this function, so the model always sees the same features.
+
+    Dummy columns are built against the fixed category values instead of pd.get_dummies,
+    so every chunk of a file yields the same columns even if it lacks some categories.
+    Columns outside feature_columns, such as the id and the target, are left out.
+    """
+    try:
+        features = pd.DataFrame(index=dataframe.index)
+        for column in feature_columns:
+            if column == "Gender":
+                features[column] = dataframe["Gender"].map(GENDER_MAPPING).astype(int)
+            elif column in DUMMY_COLUMNS:
+                source_column, category = DUMMY_COLUMNS[column]
+                features[column] = (dataframe[source_column] == category).astype(int)
+            else:
+                features[column] = dataframe[column]
+        return features
+    except Exception as e:
+        raise MyException(e, sys) from e
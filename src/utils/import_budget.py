@@ -0,0 +1,105 @@
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from src.core.config import PROJECT_DIR, settings
+
+# Modules only the training pipeline needs; importing the serving app must not pull them in
+TRAINING_ONLY_MODULES = ("imblearn", "src.pipeline.training_pipeline", "src.components")
+
+
+@dataclass
+class ImportTimeReport:
+    module: str
+    total_seconds: float
+    # Cumulative import time per module, in seconds, as reported by -X importtime
+    cumulative_seconds: Dict[str, float] = field(default_factory=dict)
+    # Import nesting depth per module; top-level imports of the measured module have depth 1
+    depth: Dict[str, int] = field(default_factory=dict)
+
+    def slowest(self, count: int = 15, max_depth: Optional[int] = None) -> List[tuple]:
+        modules = [(name, seconds) for name, seconds in self.cumulative_seconds.items()
+                   if max_depth is None or self.depth[name] <= max_depth]
+        return sorted(modules, key=lambda item: item[1], reverse=True)[:count]
+
+    def imported(self, prefixes: Sequence[str]) -> List[str]:
+        """
+        Returns the prefixes for which the module itself or any submodule was imported.
+        """
+        return [prefix for prefix in prefixes
+                if any(name == prefix or name.startswith(prefix + ".") for name in self.cumulative_seconds)]
+
+
+def parse_importtime(output: str, module: str) -> ImportTimeReport:
+    """
+    Parses the stderr of python -X importtime.
+    Lines look like "import time:      1644 |     560345 |     src.utils.main_utils",
+    with self and cumulative times in microseconds and two spaces of indent per level.
+    """
+    report = ImportTimeReport(module=module, total_seconds=0.0)
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        report.cumulative_seconds[name] = int(cumulative) / 1e6
+        report.depth[name] = depth
+    report.total_seconds = report.cumulative_seconds.get(module, 0.0)
+    return report
+
+
+def measure_import_time(module: str = "app", runs: int = 3) -> ImportTimeReport:
+    """
+    Imports module in fresh interpreters with -X importtime and returns the fastest run,
+    so a cold disk cache or a busy machine does not decide the result.
+
+    :param module: Module to import, resolved from the project directory
+    :param runs: Number of fresh interpreters to measure
+    """
+    best = None
+    for _ in range(max(runs, 1)):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=PROJECT_DIR, env=os.environ.copy(), capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+        report = parse_importtime(completed.stderr, module)
+        if best is None or report.total_seconds < best.total_seconds:
+            best = report
+    return best
+
+
+def check_import_budget(module: str = "app", budget_seconds: float = settings.SERVING_IMPORT_BUDGET_SECONDS,
+                        forbidden_modules: Sequence[str] = TRAINING_ONLY_MODULES, runs: int = 3) -> List[str]:
+    """
+    Measures the cold import of module and returns the budget violations (empty when it passes):
+    an import time above budget_seconds, or any of forbidden_modules being imported.
+    """
+    report = measure_import_time(module, runs=runs)
+    print(f"Import of {module}: {report.total_seconds:.3f}s (budget {budget_seconds:.3f}s)")
+    for name, seconds in report.slowest(max_depth=2):
+        print(f"  {seconds:8.3f}s  {'  ' * (report.depth[name] - 1)}{name}")
+
+    violations = []
+    if report.total_seconds > budget_seconds:
+        violations.append(f"import of {module} took {report.total_seconds:.3f}s, over the "
+                          f"{budget_seconds:.3f}s budget")
+    loaded = report.imported(forbidden_modules)
+    if loaded:
+        violations.append(f"import of {module} loaded training-only modules: {', '.join(loaded)}")
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the serving app's cold-start import time against a budget")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-seconds", type=float, default=settings.SERVING_IMPORT_BUDGET_SECONDS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    violations = check_import_budget(args.module, budget_seconds=args.budget_seconds, runs=args.runs)
+    for violation in violations:
+        print(f"FAIL: {violation}")
+    sys.exit(1 if violations else 0)
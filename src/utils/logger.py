@@ -1,14 +1,238 @@
+import atexit
+import json
 import logging
 import logging.handlers
+import math
 import os
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from from_root import from_root
+
+try:
+    import fcntl
+except ImportError:  # Windows: rotation falls back to single-process behaviour
+    fcntl = None
+
 # Global logger instance
 _central_logger: Optional[logging.Logger] = None
 _log_file_path: Optional[Path] = None
+# Queue mode: the central logger only holds a QueueHandler; the listener thread owns the real handlers
+_log_queue: Optional[queue.SimpleQueue] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_output_handlers: List[logging.Handler] = []
+
+CENTRAL_LOGGER_NAME = "vehicle_insurance"
+
+
+def _parse_module_values(value: Optional[str]) -> Dict[str, float]:
+    """
+    Parses "module=value,module=value" (e.g. "src.entity.estimator=0.01") into a dict.
+    """
+    parsed = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            module_name, number = item.rsplit("=", 1)
+            parsed[module_name.strip()] = float(number)
+    return parsed
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as a single-line JSON object, for log shippers that parse structured logs.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class LogSampler(logging.Filter):
+    """
+    Thins out hot-path messages of one logger: keeps a fixed fraction of records and/or at
+    most max_per_second of them. Records above max_level (warnings and errors by default)
+    always pass.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, max_per_second: Optional[float] = None,
+                 max_level: int = logging.INFO):
+        """
+        Args:
+            sample_rate: Fraction of records to keep, between 0 and 1; kept evenly (every Nth record)
+            max_per_second: Upper bound on records kept per second, or None for no limit
+            max_level: Highest level that is sampled
+        """
+        super().__init__()
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.max_per_second = max_per_second
+        self.max_level = max_level
+        self.dropped = 0
+        self._seen = 0
+        self._window_start = 0.0
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        with self._lock:
+            self._seen += 1
+            keep = math.ceil(self._seen * self.sample_rate) > math.ceil((self._seen - 1) * self.sample_rate)
+            if keep and self.max_per_second is not None:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start = now
+                    self._window_count = 0
+                keep = self._window_count < self.max_per_second
+                if keep:
+                    self._window_count += 1
+            if not keep:
+                self.dropped += 1
+            return keep
+
+
+def configure_log_sampling(module_name: str, sample_rate: float = 1.0,
+                           max_per_second: Optional[float] = None) -> LogSampler:
+    """
+    Installs (or replaces) the sampler of a module's logger.
+
+    Args:
+        module_name: Module name as passed to get_logger, e.g. "src.entity.estimator"
+        sample_rate: Fraction of INFO and lower records to keep
+        max_per_second: Upper bound on INFO and lower records kept per second
+
+    Returns:
+        The installed LogSampler
+    """
+    module_logger = logging.getLogger(f"{CENTRAL_LOGGER_NAME}.{module_name}")
+    for existing in [f for f in module_logger.filters if isinstance(f, LogSampler)]:
+        module_logger.removeFilter(existing)
+    sampler = LogSampler(sample_rate=sample_rate, max_per_second=max_per_second)
+    module_logger.addFilter(sampler)
+    return sampler
+
+
+class MultiProcessRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that several processes can share. Each write holds an exclusive
+    lock on a sidecar lock file, re-checks the size of the file on disk, and reopens the
+    stream if another process has already rotated it. That way only one process rotates,
+    and no process keeps writing to a renamed backup. It is only installed behind the log
+    queue, so the locking runs on the listener thread rather than on the logging call.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self._lock_file = None
+        self._lock_pid = None
+
+    def _acquire_file_lock(self) -> None:
+        # flock() locks belong to the open file description, which a forked child shares with
+        # its parent; each process opens the lock file itself so the lock excludes the others
+        if self._lock_pid != os.getpid():
+            self._lock_file = open(f"{self.baseFilename}.lock", "a")
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+
+    def _reopen_if_rotated(self) -> None:
+        if self.stream is None:
+            return
+        try:
+            rotated = os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            self.stream.close()
+            self.stream = self._open()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if fcntl is None:
+            super().emit(record)
+            return
+        try:
+            self._acquire_file_lock()
+        except (OSError, ValueError):
+            self.handleError(record)
+            return
+        try:
+            self._reopen_if_rotated()
+            # Another process may have written since our last write; size the file as it is now
+            if self.stream is not None:
+                self.stream.seek(0, os.SEEK_END)
+            super().emit(record)
+            if self.stream is not None:
+                self.stream.flush()
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        super().close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+        self._lock_file = None
+        self._lock_pid = None
+
+
+def _start_queue_listener() -> None:
+    global _log_queue, _queue_listener
+    _log_queue = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(_log_queue, *_output_handlers, respect_handler_level=True)
+    _queue_listener.start()
+    _central_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+
+
+def _restart_queue_listener_after_fork() -> None:
+    # The listener thread does not survive fork(): a forked child (pre-fork serving worker,
+    # process pool worker) gets a fresh queue and its own listener over the inherited handlers
+    global _queue_listener
+    if _queue_listener is None or _central_logger is None:
+        return
+    for handler in [h for h in _central_logger.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        _central_logger.removeHandler(handler)
+    _queue_listener = None
+    _start_queue_listener()
+    # multiprocessing children leave through os._exit, which skips atexit; flush on their exit path instead
+    from multiprocessing.util import Finalize
+    Finalize(None, stop_log_listener, exitpriority=0)
+
+
+def stop_log_listener() -> None:
+    """
+    Stops the queue listener after writing out every queued record. Logging continues
+    synchronously afterwards. Call this before leaving a process through os._exit().
+    """
+    global _queue_listener
+    if _queue_listener is None:
+        return
+    listener, _queue_listener = _queue_listener, None
+    for handler in [h for h in _central_logger.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        _central_logger.removeHandler(handler)
+    for handler in _output_handlers:
+        _central_logger.addHandler(handler)
+    try:
+        listener.stop()
+    except Exception:
+        pass
+
+
+atexit.register(stop_log_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_listener_after_fork)
 
 
 def setup_central_logger(
@@ -22,6 +246,10 @@ def setup_central_logger(
     date_format: str = "%Y-%m-%d %H:%M:%S",
     settings=None,
     force_reinit: bool = False,
+    use_queue: Optional[bool] = None,
+    json_format: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    rate_limits: Optional[Dict[str, float]] = None,
 ) -> logging.Logger:
     """
     Setup centralized logger that writes to a single file with rotation.
@@ -35,8 +263,15 @@ def setup_central_logger(
         backup_count: Number of backup files to keep
         log_format: Format string for log messages
         date_format: Format string for timestamps
-        settings: Settings instance to get log levels from
+        settings: Settings instance to get log levels and the LOG_* options from (defaults to src.core.config.settings)
         force_reinit: Force reinitialization even if logger exists
+        use_queue: Hand records to a background listener thread through a QueueHandler, so
+            logging calls never wait on file or console I/O (defaults to settings.LOG_QUEUE_ENABLED)
+        json_format: Write one JSON object per line instead of log_format (defaults to settings.LOG_JSON_FORMAT)
+        sample_rates: Fraction of INFO and lower records kept per module, e.g.
+            {"src.entity.estimator": 0.01} (defaults to settings.LOG_SAMPLE_RATES, "module=rate,...")
+        rate_limits: Maximum INFO and lower records per second per module
+            (defaults to settings.LOG_RATE_LIMITS, "module=limit,...")
 
     Returns:
         Configured logger instance
@@ -48,22 +283,35 @@ def setup_central_logger(
 
     # If force_reinit, clear existing handlers
     if _central_logger is not None and force_reinit:
+        stop_log_listener()
         for handler in _central_logger.handlers[:]:
             _central_logger.removeHandler(handler)
             handler.close()
+        _output_handlers.clear()
         _central_logger = None
 
+    if settings is None:
+        from src.core.config import settings
+
     # Determine log levels from settings, environment variables, or parameters
     if console_log_level is None:
-        if settings is not None and hasattr(settings, "CONSOLE_LOG_LEVEL"):
+        if hasattr(settings, "CONSOLE_LOG_LEVEL"):
             console_log_level = settings.CONSOLE_LOG_LEVEL
         else:
             console_log_level = os.getenv("CONSOLE_LOG_LEVEL", log_level)
     if file_log_level is None:
-        if settings is not None:
+        if hasattr(settings, "FILE_LOG_LEVEL"):
             file_log_level = settings.FILE_LOG_LEVEL
         else:
             file_log_level = os.getenv("FILE_LOG_LEVEL", log_level)
+    if use_queue is None:
+        use_queue = settings.LOG_QUEUE_ENABLED
+    if json_format is None:
+        json_format = settings.LOG_JSON_FORMAT
+    if sample_rates is None:
+        sample_rates = _parse_module_values(settings.LOG_SAMPLE_RATES)
+    if rate_limits is None:
+        rate_limits = _parse_module_values(settings.LOG_RATE_LIMITS)
 
     # Create logs directory if it doesn't exist
     ROOT_DIR = Path(__file__).resolve().parents[2]
@@ -74,10 +322,15 @@ def setup_central_logger(
     _log_file_path = log_dir / log_file
 
     # Create formatter
-    formatter = logging.Formatter(log_format, date_format)
-
-    # Create rotating file handler with specific log level
-    file_handler = logging.handlers.RotatingFileHandler(
+    if json_format:
+        formatter = JsonFormatter(datefmt=date_format)
+    else:
+        formatter = logging.Formatter(log_format, date_format)
+
+    # Create rotating file handler with specific log level. Behind the queue, the locked size check
+    # that lets worker processes share the file runs on the listener thread, off the calling thread
+    file_handler_class = MultiProcessRotatingFileHandler if use_queue else logging.handlers.RotatingFileHandler
+    file_handler = file_handler_class(
         _log_file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
     )
     file_handler.setFormatter(formatter)
@@ -89,20 +342,29 @@ def setup_central_logger(
     console_handler.setLevel(getattr(logging, console_log_level.upper()))
 
     # Create central logger - set to lowest level to allow handlers to filter
-    _central_logger = logging.getLogger("vehicle_insurance")
+    _central_logger = logging.getLogger(CENTRAL_LOGGER_NAME)
     min_level = min(
         getattr(logging, console_log_level.upper()),
         getattr(logging, file_log_level.upper()),
     )
     _central_logger.setLevel(min_level)
 
-    # Add handlers
-    _central_logger.addHandler(file_handler)
-    _central_logger.addHandler(console_handler)
+    # Add handlers, either directly or behind the queue
+    _output_handlers[:] = [file_handler, console_handler]
+    if use_queue:
+        _start_queue_listener()
+    else:
+        for handler in _output_handlers:
+            _central_logger.addHandler(handler)
 
     # Prevent propagation to avoid duplicate logs
     _central_logger.propagate = False
 
+    # Sample or rate-limit hot-path messages per module
+    for module_name in set(sample_rates) | set(rate_limits):
+        configure_log_sampling(module_name, sample_rate=sample_rates.get(module_name, 1.0),
+                               max_per_second=rate_limits.get(module_name))
+
     return _central_logger
 
 
@@ -223,6 +485,6 @@ def should_log(level: str, module_name: Optional[str] = None) -> bool:
     return logger.isEnabledFor(getattr(logging, level.upper()))
 
 
-# Initialize logger when module is imported (will use environment variables as fallback)
+# Initialize logger when module is imported (with the options of src.core.config.settings)
 if _central_logger is None:
     setup_central_logger()
@@ -1,11 +1,15 @@
 import os
+import shutil
 import sys
+from typing import List, Optional
 
 import numpy as np
 import dill
 import yaml
+import pandas as pd
 from pandas import DataFrame
 import joblib
+from src.core.config import settings
 from src.utils.exception import MyException
 from src.utils.logger import get_logger
 
@@ -36,10 +40,15 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
 def load_object(file_path: str) -> object:
     """
     Returns model/object from project directory.
+    Files in the model artifact format are memory-mapped instead of unpickled.
     file_path: str location of file to load
     return: Model/Obj
     """
     try:
+        from src.entity.model_artifact import is_model_artifact_file, load_model_artifact_file
+
+        if is_model_artifact_file(file_path):
+            return load_model_artifact_file(file_path)
         with open(file_path, "rb") as file_obj:
             obj = dill.load(file_obj)
         return obj
@@ -75,9 +84,20 @@ def load_numpy_array_data(file_path: str) -> np.array:
 
 
 def save_object(file_path: str, obj: object) -> None:
+    """
+    Saves obj with dill, or in the memory-mappable model artifact format when file_path
+    has the model artifact extension (.vmodel).
+    """
     logger.info("Entered the save_object method of utils")
 
     try:
+        from src.entity.model_artifact import MODEL_ARTIFACT_EXTENSION, save_model_artifact
+
+        if file_path.endswith(MODEL_ARTIFACT_EXTENSION):
+            save_model_artifact(file_path, obj)
+            logger.info("Exited the save_object method of utils")
+            return
+
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, "wb") as file_obj:
             dill.dump(obj, file_obj)
@@ -88,6 +108,199 @@ def save_object(file_path: str, obj: object) -> None:
         raise MyException(e, sys) from e
 
 
+# Formats of the feature store and the ingested train/test splits, keyed by settings.FEATURE_STORE_FORMAT
+TABLE_FILE_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+
+def table_file_name(file_name: str, table_format: Optional[str] = None) -> str:
+    """
+    Returns file_name with the extension of table_format, e.g. data.csv -> data.parquet.
+    table_format: "csv", "parquet" or "feather"; defaults to settings.FEATURE_STORE_FORMAT
+    """
+    table_format = (table_format or settings.FEATURE_STORE_FORMAT).lower()
+    if table_format not in TABLE_FILE_EXTENSIONS:
+        raise ValueError(f"Unknown table format {table_format!r}; expected one of {list(TABLE_FILE_EXTENSIONS)}")
+    return os.path.splitext(file_name)[0] + TABLE_FILE_EXTENSIONS[table_format]
+
+
+def _table_format(file_path: str) -> str:
+    extension = os.path.splitext(file_path)[1].lower()
+    for table_format, table_extension in TABLE_FILE_EXTENSIONS.items():
+        if extension == table_extension:
+            return table_format
+    raise ValueError(f"Cannot tell the table format of {file_path}; expected one of {list(TABLE_FILE_EXTENSIONS.values())}")
+
+
+def write_table(file_path: str, dataframe: DataFrame) -> None:
+    """
+    Writes dataframe without its index in the format given by the file extension.
+    Parquet and Feather keep the column dtypes, so readers skip text parsing and type inference.
+    file_path: str location of the .csv, .parquet or .feather file
+    """
+    try:
+        table_format = _table_format(file_path)
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        if table_format == "csv":
+            dataframe.to_csv(file_path, index=False, header=True)
+        elif table_format == "parquet":
+            dataframe.to_parquet(file_path, index=False)
+        else:
+            # Uncompressed, so a memory-mapped read uses the file pages without decoding
+            dataframe.reset_index(drop=True).to_feather(file_path, compression="uncompressed")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def table_parts(file_path: str) -> List[str]:
+    """
+    Returns the part file names of a Parquet or Feather table directory, in append order.
+    Temp files of an append in progress are not parts.
+    """
+    extension = TABLE_FILE_EXTENSIONS[_table_format(file_path)]
+    return sorted(name for name in os.listdir(file_path) if name.startswith("part-") and name.endswith(extension))
+
+
+def _open_dataset(file_path: str, parts: Optional[List[str]] = None, memory_map: bool = False):
+    from pyarrow import dataset, fs, unify_schemas
+
+    dataset_format = _table_format(file_path)
+    filesystem = fs.LocalFileSystem(use_mmap=memory_map)
+    part_paths = [os.path.join(file_path, part) for part in (table_parts(file_path) if parts is None else parts)]
+    # Only footers/headers are read here. A column that is int in one part and float in another
+    # (NaN in a later delta) is widened the way pd.concat would widen it
+    schema = unify_schemas([dataset.dataset(path, format=dataset_format, filesystem=filesystem).schema
+                            for path in part_paths], promote_options="permissive") if part_paths else None
+    return dataset.dataset(part_paths, schema=schema, format=dataset_format, filesystem=filesystem)
+
+
+def read_table(file_path: str, columns: Optional[List[str]] = None,
+               memory_map: bool = settings.FEATURE_STORE_MEMORY_MAP) -> DataFrame:
+    """
+    Reads a table written by write_table, or a table directory grown by append_table.
+    file_path: str location of the .csv, .parquet or .feather file or directory
+    columns: only these columns are read (Parquet and Feather skip the others on disk)
+    memory_map: map the file instead of reading it into a buffer first
+    """
+    try:
+        table_format = _table_format(file_path)
+        if table_format == "csv":
+            dataframe = pd.read_csv(file_path, usecols=columns, memory_map=memory_map)
+            return dataframe[columns] if columns is not None else dataframe
+        if os.path.isdir(file_path):
+            table = _open_dataset(file_path, memory_map=memory_map).to_table(columns=columns)
+            # Arrow buffers are released column by column while the frame is built
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        if table_format == "parquet":
+            return pd.read_parquet(file_path, columns=columns, memory_map=memory_map)
+        from pyarrow import feather
+
+        return feather.read_table(file_path, columns=columns, memory_map=memory_map).to_pandas()
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def read_table_columns(file_path: str) -> List[str]:
+    """
+    Returns the column names of a table written by write_table or append_table without reading its rows.
+    """
+    try:
+        table_format = _table_format(file_path)
+        if table_format == "csv":
+            return pd.read_csv(file_path, nrows=0).columns.tolist()
+        if os.path.isdir(file_path):
+            return _open_dataset(file_path).schema.names
+        if table_format == "parquet":
+            from pyarrow import parquet
+
+            return parquet.read_schema(file_path).names
+        from pyarrow import ipc
+
+        with ipc.open_file(file_path) as reader:
+            return reader.schema.names
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def write_table_dataset(file_path: str, dataframe: DataFrame) -> List[str]:
+    """
+    Writes dataframe as a new Parquet or Feather table directory holding it as its first part,
+    replacing whatever table was at file_path. Returns the part names.
+    """
+    try:
+        extension = TABLE_FILE_EXTENSIONS[_table_format(file_path)]
+        tmp_dir_path = os.path.join(os.path.dirname(file_path), ".tmp-" + os.path.basename(file_path))
+        shutil.rmtree(tmp_dir_path, ignore_errors=True)
+        os.makedirs(tmp_dir_path)
+        part = f"part-00000{extension}"
+        write_table(os.path.join(tmp_dir_path, part), dataframe)
+        _remove_table(file_path)
+        os.replace(tmp_dir_path, file_path)
+        return [part]
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def _remove_table(file_path: str) -> None:
+    if os.path.isdir(file_path):
+        shutil.rmtree(file_path)
+    elif os.path.exists(file_path):
+        os.remove(file_path)
+
+
+def append_table(file_path: str, dataframe: DataFrame) -> str:
+    """
+    Appends the rows of dataframe to a table, in its column order, and returns the name of the
+    file the rows went to.
+    CSV is appended in place. A Parquet or Feather table is a directory of part files: each
+    append writes the rows as a new part-<n> file (temp file and atomic rename) and never
+    reads or rewrites the earlier rows. A single file written by write_table is first moved
+    into the directory as its first part.
+    """
+    try:
+        table_format = _table_format(file_path)
+        dataframe = dataframe.reindex(columns=read_table_columns(file_path))
+        if table_format == "csv":
+            dataframe.to_csv(file_path, mode="a", index=False, header=False)
+            return os.path.basename(file_path)
+        extension = TABLE_FILE_EXTENSIONS[table_format]
+        if os.path.isfile(file_path):
+            tmp_file_path = os.path.join(os.path.dirname(file_path), ".tmp-" + os.path.basename(file_path))
+            os.replace(file_path, tmp_file_path)
+            os.makedirs(file_path)
+            os.replace(tmp_file_path, os.path.join(file_path, f"part-00000{extension}"))
+        parts = table_parts(file_path)
+        part = f"part-{int(parts[-1][len('part-'):-len(extension)]) + 1 if parts else 0:05d}{extension}"
+        tmp_part_path = os.path.join(file_path, ".tmp-" + part)
+        write_table(tmp_part_path, dataframe)
+        os.replace(tmp_part_path, os.path.join(file_path, part))
+        return part
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def copy_table(source_path: str, destination_path: str) -> None:
+    """
+    Copies a table file or table directory. Parts are never modified once written, so a
+    directory is copied as hard links to its parts when both paths are on one filesystem.
+    """
+    try:
+        if not os.path.isdir(source_path):
+            shutil.copyfile(source_path, destination_path)
+            return
+        tmp_dir_path = os.path.join(os.path.dirname(destination_path), ".tmp-" + os.path.basename(destination_path))
+        shutil.rmtree(tmp_dir_path, ignore_errors=True)
+        os.makedirs(tmp_dir_path)
+        for part in table_parts(source_path):
+            try:
+                os.link(os.path.join(source_path, part), os.path.join(tmp_dir_path, part))
+            except OSError:
+                shutil.copyfile(os.path.join(source_path, part), os.path.join(tmp_dir_path, part))
+        _remove_table(destination_path)
+        os.replace(tmp_dir_path, destination_path)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
 # def drop_columns(df: DataFrame, cols: list)-> DataFrame:
 
 #     """
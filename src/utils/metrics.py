@@ -0,0 +1,257 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.config import settings
+
+# Upper bounds (seconds) of the latency buckets; spans sub-millisecond stages to slow requests
+DEFAULT_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REPORTED_QUANTILES = (0.5, 0.95, 0.99)
+STAGE_DURATION_METRIC = "vehicle_stage_duration_seconds"
+
+Labels = Tuple[Tuple[str, str], ...]
+# A collector returns samples computed at scrape time: (metric name, labels, value). They are
+# rendered as gauges unless the name was described with metric_type="counter"
+GaugeSample = Tuple[str, Dict[str, str], float]
+
+
+def _label_key(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram. Recording is a bisect plus three additions under a
+    lock, so it is cheap enough to wrap every stage of every request.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the buckets in seconds; a +Inf bucket is implied
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self._counts), self._sum, self._count
+
+    def quantile(self, q: float, snapshot: Optional[Tuple[List[int], float, int]] = None) -> float:
+        """
+        Estimates the q-quantile by linear interpolation inside the bucket holding it,
+        the same way Prometheus' histogram_quantile does.
+        """
+        counts, _, count = snapshot or self.snapshot()
+        if count == 0:
+            return float("nan")
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    # Falls in the +Inf bucket: the best bound we have is the largest finite one
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+class ServingMetrics:
+    """
+    In-process registry of the serving histograms, counters and gauges, rendered in the
+    Prometheus text exposition format.
+
+    Only what is recorded in this process is reported; with INFERENCE_EXECUTOR=process the
+    stages that run inside the pool workers are not visible here.
+    """
+
+    def __init__(self, enabled: bool = settings.METRICS_ENABLED):
+        """
+        :param enabled: When False every record call is a no-op
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Labels, LatencyHistogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._types: Dict[str, str] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[GaugeSample]]] = {}
+
+    def describe(self, name: str, help_text: str, metric_type: Optional[str] = None,
+                 buckets: Optional[Sequence[float]] = None) -> None:
+        """
+        Sets the HELP text of a metric. metric_type declares the type of collected samples,
+        e.g. "counter" for running totals a collector reads from another component. buckets
+        replaces the latency buckets of a histogram observed under name, e.g. for sizes.
+        """
+        self._help[name] = help_text
+        if metric_type is not None:
+            self._types[name] = metric_type
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series is not None else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, {}).setdefault(
+                    key, LatencyHistogram(self._buckets.get(name, DEFAULT_LATENCY_BUCKETS)))
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """
+        Records the duration of the with-block into the histogram name{labels}.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def stage(self, stage: str):
+        """
+        Times one stage of the prediction path, e.g. `with metrics.stage("model_predict"):`.
+        """
+        return self.time(STAGE_DURATION_METRIC, stage=stage)
+
+    def observe_stages(self, timings: Dict[str, float]) -> None:
+        """
+        Records stage durations measured elsewhere, e.g. {"model_predict": 0.002} returned by
+        an inference pool worker, whose own recordings would stay in its process.
+        """
+        for stage, seconds in timings.items():
+            self.observe(STAGE_DURATION_METRIC, seconds, stage=stage)
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = float(value)
+
+    def register_collector(self, name: str, collector: Callable[[], Iterable[GaugeSample]]) -> None:
+        """
+        Registers (or replaces) a callable whose samples are computed on every scrape.
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def unregister_collector(self, name: str) -> None:
+        with self._lock:
+            self._collectors.pop(name, None)
+
+    def get_histogram(self, name: str, **labels) -> Optional[LatencyHistogram]:
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def _header(self, lines: List[str], name: str, metric_type: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text format. Each histogram is followed by a
+        <name>_quantile gauge carrying its estimated p50/p95/p99.
+        """
+        with self._lock:
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            collectors = list(self._collectors.values())
+
+        for collector in collectors:
+            for name, labels, value in collector():
+                series = counters if self._types.get(name) == "counter" else gauges
+                series.setdefault(name, {})[_label_key(labels)] = float(value)
+
+        lines: List[str] = []
+        for name in sorted(histograms):
+            self._header(lines, name, "histogram")
+            quantile_lines = []
+            for labels, histogram in sorted(histograms[name].items()):
+                snapshot = histogram.snapshot()
+                counts, total, count = snapshot
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', _format_value(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                for q in REPORTED_QUANTILES:
+                    quantile_lines.append(f"{name}_quantile{_format_labels(labels, [('quantile', str(q))])} "
+                                          f"{_format_value(histogram.quantile(q, snapshot))}")
+            lines.append(f"# TYPE {name}_quantile gauge")
+            lines.extend(quantile_lines)
+
+        for metric_type, series_by_name in (("counter", counters), ("gauge", gauges)):
+            for name in sorted(series_by_name):
+                self._header(lines, name, metric_type)
+                for labels, value in sorted(series_by_name[name].items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = ServingMetrics()
+metrics.describe(STAGE_DURATION_METRIC, "Duration of each stage of the prediction path")
+metrics.describe("vehicle_request_duration_seconds", "End-to-end HTTP request duration by endpoint")
+metrics.describe("vehicle_requests_total", "HTTP requests by endpoint and status code")
+metrics.describe("vehicle_prediction_errors_total", "Prediction requests that failed, by endpoint")
+metrics.describe("vehicle_model_load_duration_seconds", "Time to download, unpickle and compile a model")
+metrics.describe("vehicle_model_loads_total", "Models loaded into the model cache")
+metrics.describe("vehicle_model_info", "Version of the model currently serving")
+metrics.describe("vehicle_model_load_seconds", "Load time of the model currently serving")
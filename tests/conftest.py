@@ -0,0 +1,12 @@
+import mongomock
+import pytest
+
+from src.configuration.mongo_db_connection import MongoDBClient
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    # MongoDBClient shares one class-level client, so pointing it at mongomock covers every Proj1Data
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(MongoDBClient, "client", client)
+    return client
@@ -0,0 +1,22 @@
+import random
+from typing import Iterator
+
+
+def synthetic_documents(count: int, start: int = 0, seed: int = 0, na_rate: float = 0.0) -> Iterator[dict]:
+    """
+    Documents shaped like the training collection, ids start..start+count. With na_rate, that
+    share of the nullable fields holds the "na" placeholder the raw data uses for missing values.
+    """
+    rng = random.Random(seed + start)
+
+    def maybe_na(value):
+        return "na" if na_rate and rng.random() < na_rate else value
+
+    for index in range(start, start + count):
+        yield {"id": index, "Gender": rng.choice(["Male", "Female"]), "Age": maybe_na(rng.randint(20, 85)),
+               "Driving_License": rng.randint(0, 1), "Region_Code": maybe_na(float(rng.randint(0, 52))),
+               "Previously_Insured": rng.randint(0, 1), "Vehicle_Age": rng.choice(["< 1 Year", "1-2 Year", "> 2 Years"]),
+               "Vehicle_Damage": maybe_na(rng.choice(["Yes", "No"])),
+               "Annual_Premium": round(rng.uniform(2630, 60000), 1),
+               "Policy_Sales_Channel": float(rng.randint(1, 163)), "Vintage": rng.randint(10, 299),
+               "Response": int(rng.random() < 0.12)}
@@ -0,0 +1,68 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.entity.compiled_forest import CompiledForest
+
+
+@pytest.fixture(scope="module")
+def fitted_forest():
+    rng = np.random.default_rng(7)
+    features = rng.normal(size=(600, 8))
+    # Integer-valued columns put many samples exactly on the split thresholds
+    features[:, :3] = rng.integers(0, 4, size=(600, 3))
+    target = ((features[:, 0] + features[:, 3] > 1) ^ (features[:, 5] > 0.5)).astype(int)
+    forest = RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(features, target)
+    holdout = rng.normal(size=(300, 8))
+    holdout[:, :3] = rng.integers(0, 4, size=(300, 3))
+    return forest, holdout
+
+
+def test_predictions_match_sklearn(fitted_forest):
+    forest, holdout = fitted_forest
+    compiled = CompiledForest.from_sklearn(forest)
+
+    assert np.array_equal(compiled.predict_proba(holdout), forest.predict_proba(holdout))
+    assert np.array_equal(compiled.predict(holdout), forest.predict(holdout))
+    assert compiled.matches(forest, holdout)
+
+
+def test_predictions_match_sklearn_across_blocks(fitted_forest):
+    forest, holdout = fitted_forest
+    compiled = CompiledForest.from_sklearn(forest)
+    compiled.block_size = 64
+
+    assert np.array_equal(compiled.predict_proba(holdout), forest.predict_proba(holdout))
+
+
+def test_shared_and_pickled_forest_predict_the_same(fitted_forest):
+    forest, holdout = fitted_forest
+    compiled = CompiledForest.from_sklearn(forest).share_memory()
+    restored = pickle.loads(pickle.dumps(compiled))
+
+    assert compiled.is_shared and not restored.is_shared
+    assert np.array_equal(restored.predict_proba(holdout), forest.predict_proba(holdout))
+    assert np.array_equal(compiled.predict(holdout), forest.predict(holdout))
+
+
+def test_string_labels_are_returned():
+    rng = np.random.default_rng(3)
+    features = rng.normal(size=(200, 4))
+    labels = np.where(features[:, 0] > 0, "yes", "no")
+    labelled_forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(features, labels)
+
+    compiled = CompiledForest.from_sklearn(labelled_forest)
+    assert np.array_equal(compiled.predict(features), labelled_forest.predict(features))
+
+
+def test_rejects_wrong_shape_and_missing_values(fitted_forest):
+    forest, holdout = fitted_forest
+    compiled = CompiledForest.from_sklearn(forest)
+    with pytest.raises(ValueError):
+        compiled.predict_proba(holdout[:, :5])
+    with_nan = holdout.copy()
+    with_nan[0, 0] = np.nan
+    with pytest.raises(ValueError):
+        compiled.predict_proba(with_nan)
@@ -0,0 +1,52 @@
+import pytest
+
+from src.components.data_ingestion import DataIngestion
+from src.core.config import settings
+from src.entity.config_entity import DataIngestionConfig
+from src.utils.artifact_writer import artifact_writer
+from tests.synthetic_data import synthetic_documents
+
+
+@pytest.fixture
+def collection(mongo_client):
+    return mongo_client[settings.database_name][settings.DATA_INGESTION_COLLECTION_NAME]
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def config(request, tmp_path):
+    return DataIngestionConfig(feature_store_file_path=str(tmp_path / "run" / f"data.{request.param}"),
+                               incremental_store_file_path=str(tmp_path / "store" / f"data.{request.param}"),
+                               watermark_file_path=str(tmp_path / "store" / "watermark.json"),
+                               incremental=True)
+
+
+def _ingest(config):
+    dataframe = DataIngestion(config).export_data_into_feature_store()
+    artifact_writer.wait()
+    return dataframe
+
+
+def test_new_documents_are_appended(collection, config):
+    collection.insert_many(list(synthetic_documents(300, 0)))
+    assert len(_ingest(config)) == 300
+
+    collection.insert_many(list(synthetic_documents(50, 300)))
+
+    assert _ingest(config)["id"].tolist() == list(range(350))
+
+
+def test_store_built_from_an_empty_collection_picks_up_the_first_documents(collection, config):
+    assert len(_ingest(config)) == 0
+
+    collection.insert_many(list(synthetic_documents(100, 0)))
+
+    assert _ingest(config)["id"].tolist() == list(range(100))
+
+
+def test_deleted_documents_trigger_a_rebuild(collection, config):
+    collection.insert_many(list(synthetic_documents(200, 0)))
+    _ingest(config)
+
+    collection.delete_many({"id": {"$lt": 20}})
+
+    assert _ingest(config)["id"].tolist() == list(range(20, 200))
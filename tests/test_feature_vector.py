@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import MinMaxScaler, PolynomialFeatures, StandardScaler
+
+from src.components.data_transformation import DataTransformation
+from src.core.config import settings
+from src.entity.feature_vector import FastFeatureBuilder
+from src.pipeline.prediction_pipeline import VEHICLE_FEATURE_COLUMNS
+from src.utils.exception import MyException
+from src.utils.feature_engineering import DUMMY_COLUMNS, engineer_raw_features
+from tests.synthetic_data import synthetic_documents
+
+
+def _training_features(rows: int, seed: int) -> pd.DataFrame:
+    # The same feature engineering DataTransformation applies before the preprocessor
+    return engineer_raw_features(pd.DataFrame(synthetic_documents(rows, 0, seed)))
+
+
+@pytest.fixture(scope="module")
+def transformation():
+    return DataTransformation(data_ingestion_artifact=None, data_transformation_config=None,
+                              data_validation_artifact=None)
+
+
+@pytest.fixture(scope="module")
+def fitted_preprocessor(transformation):
+    preprocessor = transformation.get_data_transformer_object()
+    preprocessor.fit(_training_features(2000, 1))
+    return preprocessor
+
+
+def test_input_columns_follow_the_dummy_and_rename_steps(fitted_preprocessor):
+    builder = FastFeatureBuilder.from_preprocessing(fitted_preprocessor)
+
+    assert tuple(builder.input_columns) == VEHICLE_FEATURE_COLUMNS
+
+
+def test_transform_values_matches_preprocessor(fitted_preprocessor):
+    builder = FastFeatureBuilder.from_preprocessing(fitted_preprocessor)
+    features = _training_features(500, 2)
+    values = features[builder.input_columns].to_numpy(dtype=np.float64)
+
+    assert np.array_equal(builder.transform_values(values), fitted_preprocessor.transform(features))
+
+
+def test_transform_records_matches_preprocessor(fitted_preprocessor):
+    builder = FastFeatureBuilder.from_preprocessing(fitted_preprocessor)
+    features = _training_features(200, 3)
+    # The HTML form posts every field as a string
+    records = [{column: str(value) for column, value in record.items()}
+               for record in features.to_dict(orient="records")]
+
+    assert np.array_equal(builder.transform_records(records), fitted_preprocessor.transform(features))
+
+
+def test_clipped_and_uncentred_scalers_match():
+    features = _training_features(1000, 4)
+    preprocessor = ColumnTransformer(
+        transformers=[("StandardScaler", StandardScaler(with_mean=False), ["Age", "Vintage"]),
+                      ("MinMaxScaler", MinMaxScaler(clip=True), ["Annual_Premium"])],
+        remainder="passthrough").fit(features.iloc[:500])
+    builder = FastFeatureBuilder.from_preprocessing(preprocessor)
+    values = features[builder.input_columns].to_numpy(dtype=np.float64)
+
+    assert np.array_equal(builder.transform_values(values), preprocessor.transform(features))
+
+
+def test_unsupported_transformer_is_rejected():
+    features = _training_features(100, 5)
+    preprocessor = ColumnTransformer(transformers=[("Polynomial", PolynomialFeatures(), ["Age"])],
+                                     remainder="passthrough").fit(features)
+
+    with pytest.raises(MyException):
+        FastFeatureBuilder.from_preprocessing(preprocessor)
+
+
+def test_engineered_features_match_get_dummies():
+    # The fixed-category dummies give the same frame as get_dummies(drop_first=True) and the renames
+    raw = pd.DataFrame(synthetic_documents(500, 0, 6))
+    df = raw.drop(columns=["id", "_id", settings.TARGET_COLUMN], errors="ignore")
+    df["Gender"] = df["Gender"].map({'Female': 0, 'Male': 1})
+    expected = pd.get_dummies(df, drop_first=True).rename(columns={
+        "Vehicle_Age_< 1 Year": "Vehicle_Age_lt_1_Year", "Vehicle_Age_> 2 Years": "Vehicle_Age_gt_2_Years"})
+    expected[list(DUMMY_COLUMNS)] = expected[list(DUMMY_COLUMNS)].astype(int)
+
+    pd.testing.assert_frame_equal(engineer_raw_features(raw), expected)
@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+
+from src.core.config import PROJECT_DIR
+
+
+def test_serving_app_imports_within_budget_without_credentials():
+    # Importing the app must not need cloud credentials; they are only read on first use
+    env = {name: value for name, value in os.environ.items()
+           if not name.startswith("AWS_") and name != "MONGODB_URL"}
+    completed = subprocess.run([sys.executable, "-m", "src.utils.import_budget"], cwd=PROJECT_DIR, env=env,
+                               capture_output=True, text=True, timeout=300)
+
+    assert completed.returncode == 0, completed.stdout + completed.stderr[-2000:]
+    assert "FAIL" not in completed.stdout
@@ -0,0 +1,30 @@
+import logging.handlers
+
+import pytest
+
+from src.core.config import Settings
+from src.utils import logger as central_logger
+
+
+@pytest.fixture
+def reinit():
+    yield lambda **options: central_logger.setup_central_logger(force_reinit=True, settings=Settings(**options))
+    central_logger.setup_central_logger(force_reinit=True)
+    central_logger.configure_log_sampling("src.entity.estimator")
+
+
+def test_without_the_queue_the_file_is_written_by_a_plain_rotating_handler(reinit):
+    configured = reinit(LOG_QUEUE_ENABLED=False)
+
+    file_handler = central_logger._output_handlers[0]
+    assert type(file_handler) is logging.handlers.RotatingFileHandler
+    assert file_handler in configured.handlers
+
+
+def test_behind_the_queue_the_listener_owns_the_multi_process_handler(reinit):
+    configured = reinit(LOG_QUEUE_ENABLED=True, LOG_SAMPLE_RATES="src.entity.estimator=0.5")
+
+    assert isinstance(central_logger._output_handlers[0], central_logger.MultiProcessRotatingFileHandler)
+    assert [type(handler) for handler in configured.handlers] == [logging.handlers.QueueHandler]
+    sampler = logging.getLogger(f"{central_logger.CENTRAL_LOGGER_NAME}.src.entity.estimator").filters[-1]
+    assert sampler.sample_rate == 0.5
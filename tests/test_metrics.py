@@ -0,0 +1,32 @@
+from src.utils.metrics import STAGE_DURATION_METRIC, ServingMetrics
+
+
+def _lines(registry: ServingMetrics, prefix: str):
+    return [line for line in registry.render().splitlines() if line.startswith(prefix)]
+
+
+def test_size_histogram_buckets_are_cumulative():
+    registry = ServingMetrics(enabled=True)
+    registry.describe("vehicle_micro_batch_size", "Rows per micro-batch scored", buckets=[1, 2, 4, 8])
+    for size in (1, 3, 3, 8, 20):
+        registry.observe("vehicle_micro_batch_size", size)
+
+    assert [line for line in _lines(registry, "vehicle_micro_batch_size_") if "_quantile" not in line] == [
+        'vehicle_micro_batch_size_bucket{le="1.0"} 1',
+        'vehicle_micro_batch_size_bucket{le="2.0"} 1',
+        'vehicle_micro_batch_size_bucket{le="4.0"} 3',
+        'vehicle_micro_batch_size_bucket{le="8.0"} 4',
+        'vehicle_micro_batch_size_bucket{le="+Inf"} 5',
+        "vehicle_micro_batch_size_sum 35.0",
+        "vehicle_micro_batch_size_count 5",
+    ]
+
+
+def test_stages_measured_elsewhere_are_recorded_per_stage():
+    registry = ServingMetrics(enabled=True)
+
+    registry.observe_stages({"prediction_cache_lookup": 0.0002, "preprocessing_transform": 0.001,
+                             "model_predict": 0.003})
+
+    for stage in ("prediction_cache_lookup", "preprocessing_transform", "model_predict"):
+        assert registry.get_histogram(STAGE_DURATION_METRIC, stage=stage).snapshot()[2] == 1
@@ -0,0 +1,49 @@
+import asyncio
+
+from src.pipeline.micro_batcher import PredictionMicroBatcher
+
+
+class _Row:
+    def __init__(self, value: int):
+        self.value = value
+
+    def get_vehicle_data_as_record(self) -> dict:
+        return {"value": self.value}
+
+
+class _DoublingClassifier:
+    def predict_records_timed(self, records):
+        return [record["value"] * 2 for record in records], {"model_predict": 0.001}
+
+
+def test_stop_scores_the_batch_being_collected():
+    async def scenario():
+        # The flush deadline is far away, so the rows sit in the batch being collected when stop() runs
+        batcher = PredictionMicroBatcher(classifier=_DoublingClassifier(), max_batch_size=64, max_wait_ms=60000,
+                                         max_in_flight=1)
+        await batcher.start()
+        requests = [asyncio.create_task(batcher.predict(_Row(value))) for value in range(5)]
+        await asyncio.sleep(0.05)
+        assert batcher.queue_depth == 0
+        await asyncio.wait_for(batcher.stop(), timeout=5)
+        return await asyncio.wait_for(asyncio.gather(*requests), timeout=5)
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6, 8]
+
+
+def test_stop_fails_rows_still_queued():
+    async def scenario():
+        batcher = PredictionMicroBatcher(classifier=_DoublingClassifier(), max_batch_size=2, max_wait_ms=60000,
+                                         max_in_flight=1)
+        await batcher.start()
+        # Keep the only slot busy, so later rows stay on the queue
+        await batcher._slots.acquire()
+        await asyncio.sleep(0.01)
+        requests = [asyncio.create_task(batcher.predict(_Row(value))) for value in range(3)]
+        await asyncio.sleep(0.05)
+        assert batcher.queue_depth == 3
+        await asyncio.wait_for(batcher.stop(), timeout=5)
+        return await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), timeout=5)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.components.data_transformation import DataTransformation
+from src.core.config import settings
+from src.entity.estimator import MyModel
+from src.entity.model_artifact import load_model_artifact
+from src.utils.exception import MyException
+from src.utils.feature_engineering import engineer_raw_features
+from src.utils.main_utils import load_object, save_object
+from tests.synthetic_data import synthetic_documents
+
+
+def _features_and_target(rows: int, seed: int):
+    transformation = DataTransformation(data_ingestion_artifact=None, data_transformation_config=None,
+                                        data_validation_artifact=None)
+    df = pd.DataFrame(synthetic_documents(rows, 0, seed))
+    target = df.pop(settings.TARGET_COLUMN)
+    return engineer_raw_features(df), target, transformation
+
+
+@pytest.fixture(scope="module")
+def model():
+    features, target, transformation = _features_and_target(2000, 1)
+    preprocessor = transformation.get_data_transformer_object().fit(features)
+    forest = RandomForestClassifier(n_estimators=10, max_depth=8, random_state=0)
+    forest.fit(preprocessor.transform(features), target)
+    return MyModel(preprocessing_object=preprocessor, trained_model_object=forest)
+
+
+@pytest.fixture
+def artifact_path(tmp_path, model):
+    path = str(tmp_path / "model.vmodel")
+    save_object(path, model)
+    return path
+
+
+def test_round_trip_predicts_like_the_original(model, artifact_path):
+    holdout, _, _ = _features_and_target(500, 2)
+
+    loaded = load_object(artifact_path)
+
+    assert loaded.trained_model_object is None
+    assert np.array_equal(loaded.predict(holdout), model.predict(holdout))
+    assert np.array_equal(loaded.predict_proba(holdout), model.predict_proba(holdout))
+
+
+def test_truncated_file_is_rejected(artifact_path):
+    with open(artifact_path, "rb") as file_obj:
+        data = file_obj.read()
+    with open(artifact_path, "wb") as file_obj:
+        file_obj.write(data[:-100])
+
+    with pytest.raises(MyException, match="truncated"):
+        load_object(artifact_path)
+
+
+def test_corrupted_array_bytes_are_rejected(artifact_path):
+    with open(artifact_path, "rb") as file_obj:
+        data = bytearray(file_obj.read())
+    data[-1] ^= 0xFF
+
+    with pytest.raises(MyException, match="corrupted"):
+        load_model_artifact(bytes(data))
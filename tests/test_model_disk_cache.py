@@ -0,0 +1,122 @@
+import os
+
+import boto3
+import pytest
+from boto3.s3.transfer import TransferConfig
+from moto import mock_aws
+
+from src.cloud_storage.model_disk_cache import ModelDiskCache
+from src.utils.exception import MyException
+from src.utils.metrics import metrics
+
+BUCKET = "model-bucket"
+KEY = "model-registry/model.pkl"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def get_object_calls(s3_client):
+    # Records the parameters of every GetObject request the client sends
+    calls = []
+    s3_client.meta.events.register("before-call.s3.GetObject", lambda params, **kwargs: calls.append(params))
+    return calls
+
+
+def _cache_results() -> str:
+    return "\n".join(line for line in metrics.render().splitlines()
+                     if line.startswith("vehicle_model_disk_cache_total"))
+
+
+def test_miss_downloads_and_not_modified_reuses_the_file(s3_client, get_object_calls, tmp_path):
+    s3_client.put_object(Bucket=BUCKET, Key=KEY, Body=b"model-v1")
+    cache = ModelDiskCache(cache_dir=str(tmp_path))
+    metrics.reset()
+
+    path, entry = cache.fetch(s3_client, bucket_name=BUCKET, s3_key=KEY)
+    with open(path, "rb") as model_file:
+        assert model_file.read() == b"model-v1"
+    assert 'result="miss"' in _cache_results()
+
+    modified = os.path.getmtime(path)
+    cached_path, cached_entry = cache.fetch(s3_client, bucket_name=BUCKET, s3_key=KEY)
+
+    assert (cached_path, cached_entry) == (path, entry)
+    assert os.path.getmtime(path) == modified
+    assert get_object_calls[-1]["headers"].get("If-None-Match") == f'"{entry.etag}"'
+    assert 'vehicle_model_disk_cache_total{result="hit"} 1' in _cache_results()
+
+
+def test_changed_object_replaces_the_cached_copy(s3_client, tmp_path):
+    cache = ModelDiskCache(cache_dir=str(tmp_path))
+    s3_client.put_object(Bucket=BUCKET, Key=KEY, Body=b"model-v1")
+    old_path, old_entry = cache.fetch(s3_client, bucket_name=BUCKET, s3_key=KEY)
+
+    s3_client.put_object(Bucket=BUCKET, Key=KEY, Body=b"model-v2")
+    new_path, new_entry = cache.fetch(s3_client, bucket_name=BUCKET, s3_key=KEY)
+
+    assert new_entry.etag != old_entry.etag
+    with open(new_path, "rb") as model_file:
+        assert model_file.read() == b"model-v2"
+    assert not os.path.exists(old_path)
+    assert cache.lookup(BUCKET, KEY) == new_entry
+
+
+def test_large_object_is_downloaded_in_ranged_parts(s3_client, get_object_calls, tmp_path):
+    chunk = 1024 * 1024
+    body = os.urandom(3 * chunk + 123)
+    s3_client.put_object(Bucket=BUCKET, Key=KEY, Body=body)
+    transfer_config = TransferConfig(multipart_threshold=chunk, multipart_chunksize=chunk, max_concurrency=4)
+
+    path, entry = ModelDiskCache(cache_dir=str(tmp_path)).fetch(s3_client, bucket_name=BUCKET, s3_key=KEY,
+                                                               transfer_config=transfer_config)
+
+    with open(path, "rb") as model_file:
+        assert model_file.read() == body
+    assert entry.size == len(body)
+    # The first part comes from the revalidation GET, the other three are pinned to its ETag
+    part_requests = [params["headers"] for params in get_object_calls if "Range" in params.get("headers", {})]
+    assert len(get_object_calls) == 4
+    assert sorted(headers["Range"] for headers in part_requests) == [
+        f"bytes={start}-{min(start + chunk, len(body)) - 1}" for start in (chunk, 2 * chunk, 3 * chunk)]
+    assert {headers["If-Match"] for headers in part_requests} == {f'"{entry.etag}"'}
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")]
+
+
+def test_object_overwritten_during_a_ranged_download_is_not_cached(s3_client, tmp_path):
+    chunk = 1024 * 1024
+    s3_client.put_object(Bucket=BUCKET, Key=KEY, Body=os.urandom(2 * chunk))
+    transfer_config = TransferConfig(multipart_threshold=chunk, multipart_chunksize=chunk, max_concurrency=1)
+    writer = boto3.client("s3", region_name="us-east-1")
+
+    def overwrite_before_the_parts(params, **kwargs):
+        if "Range" in params.get("headers", {}):
+            writer.put_object(Bucket=BUCKET, Key=KEY, Body=os.urandom(2 * chunk))
+
+    s3_client.meta.events.register("before-call.s3.GetObject", overwrite_before_the_parts)
+    cache = ModelDiskCache(cache_dir=str(tmp_path))
+
+    with pytest.raises(MyException, match="PreconditionFailed|412"):
+        cache.fetch(s3_client, bucket_name=BUCKET, s3_key=KEY, transfer_config=transfer_config)
+
+    assert cache.lookup(BUCKET, KEY) is None
+    assert not [name for name in os.listdir(cache._entry_dir(BUCKET)) if name.endswith(".tmp")]
+
+
+def test_small_object_is_streamed_in_one_request(s3_client, get_object_calls, tmp_path):
+    s3_client.put_object(Bucket=BUCKET, Key=KEY, Body=b"small model")
+    transfer_config = TransferConfig(multipart_threshold=1024 * 1024)
+
+    ModelDiskCache(cache_dir=str(tmp_path)).fetch(s3_client, bucket_name=BUCKET, s3_key=KEY,
+                                                  transfer_config=transfer_config)
+
+    assert len(get_object_calls) == 1
@@ -0,0 +1,45 @@
+from src.cloud_storage.local_storage import LocalStorageBackend
+from src.core.config import settings
+from src.entity.s3_estimator import Proj1Estimator
+
+BUCKET = "model-bucket"
+
+
+def _write(path, content: bytes) -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_first_push_migrates_the_legacy_model(tmp_path):
+    storage = LocalStorageBackend(root_dir=str(tmp_path / "storage"))
+    storage.put_bytes(BUCKET, settings.MODEL_FILE_NAME, b"legacy model")
+    estimator = Proj1Estimator(bucket_name=BUCKET, model_path=settings.MODEL_PUSHER_S3_KEY, storage=storage)
+
+    # Before the first push, serving falls back to the legacy key
+    assert estimator.is_model_present(settings.MODEL_PUSHER_S3_KEY)
+    assert estimator._resolve() == (settings.MODEL_FILE_NAME, None)
+
+    new_version = estimator.save_model(from_file=_write(tmp_path / "model.pkl", b"new model"))
+
+    pointer = estimator.registry.current()
+    assert pointer.version == new_version
+    assert len(pointer.history) == 1
+    legacy = estimator.registry.get_version(pointer.history[0])
+    assert legacy.metrics["migrated_from"] == settings.MODEL_FILE_NAME
+    assert storage.get(BUCKET, legacy.model_key) == b"legacy model"
+
+    rolled_back = estimator.registry.rollback()
+    assert rolled_back.version == legacy.version
+    assert storage.get(BUCKET, estimator._resolve()[0]) == b"legacy model"
+
+
+def test_migration_only_runs_before_the_first_promotion(tmp_path):
+    storage = LocalStorageBackend(root_dir=str(tmp_path / "storage"))
+    estimator = Proj1Estimator(bucket_name=BUCKET, model_path=settings.MODEL_PUSHER_S3_KEY, storage=storage)
+
+    assert estimator.registry.migrate_legacy_model() is None
+    estimator.save_model(from_file=_write(tmp_path / "model.pkl", b"first model"))
+    storage.put_bytes(BUCKET, settings.MODEL_FILE_NAME, b"stale legacy model")
+
+    assert estimator.registry.migrate_legacy_model() is None
+    assert len(estimator.registry.list_versions()) == 1
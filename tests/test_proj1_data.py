@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_access.proj1_data import Proj1Data
+from tests.synthetic_data import synthetic_documents
+
+COLLECTION = "vehicle-test"
+
+
+@pytest.fixture
+def collection(mongo_client):
+    collection = Proj1Data().mongodb_client.database[COLLECTION]
+    collection.insert_many([{"id": index} for index in range(1000)])
+    return collection
+
+
+def test_partitions_are_balanced_deterministic_and_cover_every_id(collection):
+    data = Proj1Data()
+
+    id_ranges = data.partition_id_ranges(COLLECTION, 4)
+
+    assert id_ranges == data.partition_id_ranges(COLLECTION, 4)
+    assert id_ranges[0][0] is None and id_ranges[-1][1] is None
+    assert [collection.count_documents(data._id_range_query(*id_range)) for id_range in id_ranges] == [250] * 4
+
+
+def test_small_collections_get_fewer_partitions(mongo_client):
+    data = Proj1Data()
+    data.mongodb_client.database[COLLECTION].insert_many([{"id": 0}, {"id": 1}])
+
+    assert data.partition_id_ranges(COLLECTION, 4) == [(None, None)]
+    assert data.partition_id_ranges("empty", 4) == [(None, None)]
+
+
+def test_partitioned_export_keeps_id_order(collection):
+    exported = Proj1Data().export_collection_as_dataframe(COLLECTION, streaming=True, partitions=3)
+
+    assert exported["id"].tolist() == list(range(1000))
+
+
+def _list_export(collection) -> pd.DataFrame:
+    # The export before streaming: every document as a dict, then _id dropped and "na" replaced
+    df = pd.DataFrame(list(collection.find()))
+    df = df.drop(columns=["_id"], axis=1)
+    return df.replace({"na": np.nan})
+
+
+@pytest.mark.filterwarnings("ignore:Downcasting behavior in `replace`:FutureWarning")
+@pytest.mark.parametrize("partitions", [1, 3])
+def test_streamed_export_matches_the_list_export(mongo_client, partitions):
+    data = Proj1Data()
+    collection = data.mongodb_client.database[COLLECTION]
+    collection.insert_many(list(synthetic_documents(3000, 0, 5, na_rate=0.05)))
+    expected = _list_export(collection)
+
+    # Small batches, so columns are concatenated from many chunks
+    streamed = data._concat_column_batches(enumerate(data._iter_column_batches(COLLECTION, batch_size=256)),
+                                           data.schema_columns)
+    exported = data.export_collection_as_dataframe(COLLECTION, streaming=True, partitions=partitions)
+
+    assert expected[["Age", "Region_Code", "Vehicle_Damage"]].isna().any().all()
+    pd.testing.assert_frame_equal(streamed, expected)
+    pd.testing.assert_frame_equal(exported, expected)
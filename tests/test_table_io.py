@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.main_utils import (append_table, copy_table, read_table, read_table_columns, table_file_name,
+                                  table_parts, write_table, write_table_dataset)
+from tests.synthetic_data import synthetic_documents
+
+
+@pytest.fixture
+def frames():
+    base = pd.DataFrame(synthetic_documents(1000, 0, 1))
+    delta = pd.DataFrame(synthetic_documents(50, 1000, 2))
+    delta.loc[3, "Age"] = np.nan  # The int column of the base table is float in this delta
+    return base, delta
+
+
+@pytest.mark.parametrize("table_format", ["parquet", "feather"])
+def test_append_adds_part_files_without_rewriting(tmp_path, frames, table_format):
+    base, delta = frames
+    path = str(tmp_path / table_file_name("store.csv", table_format))
+    write_table(path, base)
+
+    first = append_table(path, delta)
+    first_mtime = os.path.getmtime(os.path.join(path, table_parts(path)[0]))
+    second = append_table(path, delta)
+
+    assert table_parts(path) == [f"part-00000.{table_format}", first, second]
+    assert os.path.getmtime(os.path.join(path, table_parts(path)[0])) == first_mtime
+    expected = pd.concat([base, delta, delta], ignore_index=True)
+    pd.testing.assert_frame_equal(read_table(path), expected)
+    pd.testing.assert_frame_equal(read_table(path, columns=["id", "Age"]), expected[["id", "Age"]])
+    assert read_table_columns(path) == list(base.columns)
+
+
+def test_dataset_copy_and_rebuild(tmp_path, frames):
+    base, delta = frames
+    path = str(tmp_path / "store.parquet")
+    assert write_table_dataset(path, base) == ["part-00000.parquet"]
+    append_table(path, delta)
+
+    copy_path = str(tmp_path / "copy" / "data.parquet")
+    os.makedirs(os.path.dirname(copy_path))
+    copy_table(path, copy_path)
+    write_table_dataset(path, delta)
+
+    pd.testing.assert_frame_equal(read_table(copy_path), pd.concat([base, delta], ignore_index=True))
+    pd.testing.assert_frame_equal(read_table(path), delta)
+
+
+def test_csv_is_appended_in_place(tmp_path, frames):
+    base, delta = frames
+    path = str(tmp_path / "store.csv")
+    write_table(path, base)
+
+    assert append_table(path, delta) == "store.csv"
+    pd.testing.assert_frame_equal(read_table(path), pd.concat([base, delta], ignore_index=True))